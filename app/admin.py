@@ -2,17 +2,29 @@ from flask import Blueprint, render_template, redirect, request, flash, url_for,
 from . import db
 from .modules.models import *
 from .modules.db_queries import *
-from .modules.activity_logger import log_activity, create_notification
+from .modules.activity_logger import log_activity, create_notification, create_notifications_bulk, get_unread_notification_count, get_notification_page
+from .modules import reference_cache, report_cache, pool_metrics, fragment_cache
+from .modules.user_queries import get_user_page, get_pending_users, get_user_counts
+from .modules.event_queries import get_grouped_event_cards, EVENT_STATUSES
+from .modules.pagination import get_page_size
+from .modules.financial_summary import get_nature_total
+from .modules.budget_monitor import check_budget_thresholds
 from .auth import role_required, get_current_user
+from .db_routing import read_only
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy import asc, desc
 from sqlalchemy import func
 from datetime import datetime, date
+from decimal import Decimal
 
 from werkzeug.security import generate_password_hash, check_password_hash
 
 admin_bp = Blueprint('admin', __name__, url_prefix='/admin')
 
+PENDING_USERS_LIMIT = 50  # Authorization cards shown at once
+DASHBOARD_EVENT_CARDS = 3  # Event cards per status on the dashboard
+EVENT_CARDS_PER_PAGE = 12
+
 @admin_bp.before_request
 def check_admin_access():
     """Check if user is logged in and has Admin role before accessing any admin route."""
@@ -25,13 +37,38 @@ def check_admin_access():
         return redirect(url_for('home.index'))
 
 @admin_bp.route('/')
+@read_only
 def admin_dashboard():
-    # Retrieve all users
-    users = filter_data(User)
-    user_data = [get_user_info(user) for user in users]
-
-    # Render the template with the structured user data
-    return render_template('admin/admin_dash.html', data=user_data, users_table = get_user_table_data(), events=get_event_data())
+    # First page of pending authorizations plus per-role counts, instead of every user;
+    # both fragments are cached until an admin write publishes a change
+    user_id = session.get('user_id')
+    events_html = fragment_cache.get_or_render('events', ('Admin', user_id), render_dashboard_events)
+    users_html = fragment_cache.get_or_render('users', ('Admin', user_id), render_dashboard_users)
+    return render_template('admin/admin_dash.html', events_html=events_html, users_html=users_html)
+
+def render_dashboard_events():
+    """Event cards of the dashboard, a few per status ('' when there are no events)"""
+    events = get_grouped_event_cards(page_size=DASHBOARD_EVENT_CARDS)
+    if not any(status_page['total'] for status_page in events.values()):
+        return ''
+    return fragment_cache.render_macro('admin/event_cards.html', 'render_event_cards_admin', events, None, minimum_cards=True)
+
+def render_dashboard_users():
+    """Per-role user counts and the pending authorization cards of the dashboard"""
+    counts = fragment_cache.render_macro('admin/user_fragments.html', 'render_user_counts', get_user_counts())
+    cards = fragment_cache.render_macro('admin/user_fragments.html', 'render_pending_cards',
+                                        get_pending_users(limit=PENDING_USERS_LIMIT), add_button=True)
+    return counts + cards
+
+@admin_bp.route('/report_cache')
+def report_cache_stats():
+    """Report cache hit/miss counters of this worker and the size of the cache as JSON."""
+    return jsonify(report_cache.get_stats())
+
+@admin_bp.route('/db_pool')
+def db_pool_stats():
+    """Database connection pool state and checkout counters of this worker as JSON."""
+    return jsonify(pool_metrics.get_stats(db.engine))
 
 @admin_bp.route('/event_details/<int:event_id>', methods=['GET', 'POST'])
 def event_details(event_id):
@@ -61,10 +98,16 @@ def event_details(event_id):
                                           filters={'Event_ID': event_id}, 
                                           updates={'Amount': budget_amount, 'Notes': budget_notes})
         else:  # Create new budget entry
+            # Start the running total from the expenses already recorded (read from the summary, same commit)
             updated_budget = create_entry(Budget, 
                                           Amount=budget_amount, 
                                           Notes=budget_notes, 
-                                          Event_ID=event_id)
+                                          Event_ID=event_id,
+                                          Spent_Total=Decimal(str(get_nature_total(event_id, 'Expense'))).quantize(Decimal('0.01')))
+
+        if updated_budget:
+            # Re-evaluate usage against the new amount; a threshold no longer reached is cleared
+            check_budget_thresholds(event_id)
 
         # Redirect to the same page after creating or updating the budget
         return redirect(url_for('admin.event_details', event_id=event_id))
@@ -78,15 +121,40 @@ def event_details(event_id):
                            budget=budget)
 
 @admin_bp.route('/view_events')
+@read_only
 def view_events():
-    return render_template('admin/view_events.html', events=get_event_data())
+    # One status bucket (?status=) or all of them, a page at a time, optionally within a date window
+    status = request.args.get('status', '')
+    statuses = (status,) if status in EVENT_STATUSES else EVENT_STATUSES
+    page = request.args.get('page', 1, type=int)
+    date_from = parse_date_arg(request.args.get('date_from'))
+    date_to = parse_date_arg(request.args.get('date_to'))
+
+    events = get_grouped_event_cards(
+        page_size=get_page_size(request.args, default=EVENT_CARDS_PER_PAGE),
+        statuses=statuses,
+        pages={s: page for s in statuses},
+        date_from=date_from,
+        date_to=date_to
+    )
+    url_params = {key: value for key, value in (('date_from', date_from), ('date_to', date_to)) if value}
+    return render_template('admin/view_events.html', events=events, url_params=url_params,
+                           status=status, date_from=date_from, date_to=date_to)
+
+
+def parse_date_arg(value):
+    """Parse a YYYY-MM-DD query argument; returns None when missing or malformed"""
+    try:
+        return date.fromisoformat(value) if value else None
+    except ValueError:
+        return None
 @admin_bp.route('/new_event', methods=['GET'])
 def new_event():
     # Query database for required data
-    departments = Department.query.all()
-    event_types = EventType.query.all()
-    event_managers = User.query.join(Role).filter(Role.Role_Name == 'Event Manager').all()
-    finance_managers = User.query.join(Role).filter(Role.Role_Name == 'Finance Manager').all()
+    departments = reference_cache.get_rows('department')
+    event_types = reference_cache.get_rows('event_type')
+    event_managers = User.query.filter_by(Role=reference_cache.get_id_by_name('role', 'Event Manager')).all()
+    finance_managers = User.query.filter_by(Role=reference_cache.get_id_by_name('role', 'Finance Manager')).all()
     
     print(event_managers)
 
@@ -127,25 +195,27 @@ def create_single_event():
             Finance_Manager=finance_manager_id
         )
         db.session.add(new_event)
+        db.session.flush()  # Assigns Event_ID
+
+        # Notify Event Manager and Finance Manager in the same transaction as the event
+        create_notifications_bulk([
+            {
+                'user_id': event_manager_id,
+                'title': 'New Event Assigned',
+                'message': f'You have been assigned as Event Manager for "{event_name}" scheduled on {event_date.strftime("%B %d, %Y")}',
+                'notification_type': 'success',
+                'event_id': new_event.Event_ID
+            },
+            {
+                'user_id': finance_manager_id,
+                'title': 'New Event Assigned',
+                'message': f'You have been assigned as Finance Manager for "{event_name}" scheduled on {event_date.strftime("%B %d, %Y")}',
+                'notification_type': 'success',
+                'event_id': new_event.Event_ID
+            },
+        ])
         db.session.commit()
-        
-        # Notify Event Manager
-        create_notification(
-            user_id=event_manager_id,
-            title='New Event Assigned',
-            message=f'You have been assigned as Event Manager for "{event_name}" scheduled on {event_date.strftime("%B %d, %Y")}',
-            notification_type='success',
-            event_id=new_event.Event_ID
-        )
-        
-        # Notify Finance Manager
-        create_notification(
-            user_id=finance_manager_id,
-            title='New Event Assigned',
-            message=f'You have been assigned as Finance Manager for "{event_name}" scheduled on {event_date.strftime("%B %d, %Y")}',
-            notification_type='success',
-            event_id=new_event.Event_ID
-        )
+        fragment_cache.publish('events', event_id=new_event.Event_ID)
         
         # Log activity
         log_activity(
@@ -219,41 +289,42 @@ def create_multiple_events():
             Finance_Manager=finance_manager_id
         )
         db.session.add(new_event)
-        db.session.commit()
+        db.session.flush()  # Assigns Event_ID
 
         # Associate sub-events with the main event
         for sub_event in sub_events:
             sub_event.Event_ID = new_event.Event_ID
             db.session.add(sub_event)
+
+        # Notify the main managers and each sub-event manager with one INSERT
+        notifications = [
+            {
+                'user_id': event_manager_id,
+                'title': 'New Multi-Day Event Assigned',
+                'message': f'You have been assigned as Event Manager for "{event_name}" ({event_duration} days) with {len(sub_events)} sub-events',
+                'notification_type': 'success',
+                'event_id': new_event.Event_ID
+            },
+            {
+                'user_id': finance_manager_id,
+                'title': 'New Multi-Day Event Assigned',
+                'message': f'You have been assigned as Finance Manager for "{event_name}" ({event_duration} days) with {len(sub_events)} sub-events',
+                'notification_type': 'success',
+                'event_id': new_event.Event_ID
+            },
+        ]
+        notifications.extend({
+            'user_id': sub_event.Sub_Event_Manager,
+            'title': 'Sub-Event Assignment',
+            'message': f'You have been assigned to manage sub-event "{sub_event.Name}" under "{event_name}"',
+            'notification_type': 'info',
+            'event_id': new_event.Event_ID
+        } for sub_event in sub_events)
+        create_notifications_bulk(notifications)
+
+        # Event, sub-events and notifications are committed together
         db.session.commit()
-        
-        # Notify main Event Manager
-        create_notification(
-            user_id=event_manager_id,
-            title='New Multi-Day Event Assigned',
-            message=f'You have been assigned as Event Manager for "{event_name}" ({event_duration} days) with {len(sub_events)} sub-events',
-            notification_type='success',
-            event_id=new_event.Event_ID
-        )
-        
-        # Notify main Finance Manager
-        create_notification(
-            user_id=finance_manager_id,
-            title='New Multi-Day Event Assigned',
-            message=f'You have been assigned as Finance Manager for "{event_name}" ({event_duration} days) with {len(sub_events)} sub-events',
-            notification_type='success',
-            event_id=new_event.Event_ID
-        )
-        
-        # Notify each sub-event manager
-        for sub_event in sub_events:
-            create_notification(
-                user_id=sub_event.Sub_Event_Manager,
-                title='Sub-Event Assignment',
-                message=f'You have been assigned to manage sub-event "{sub_event.Name}" under "{event_name}"',
-                notification_type='info',
-                event_id=new_event.Event_ID
-            )
+        fragment_cache.publish('events', event_id=new_event.Event_ID)
         
         # Log activity
         log_activity(
@@ -280,10 +351,9 @@ def new_user():
         email = request.form.get('email')
         print("Form data:", username, department_name, role_name, email)
 
-        # Fetch department and role from the database
-        department = Department.query.filter_by(Dept_ID=department_name).first()
-        role = Role.query.filter_by(Role_ID=role_name).first()
-
+        # Resolve department and role through the reference cache
+        department = reference_cache.get_name('department', department_name)
+        role = reference_cache.get_name('role', role_name)
 
         # Check if the department and role exist
         if not department:
@@ -299,8 +369,8 @@ def new_user():
         user_data = {
             'Username': username,
             'Email': email,
-            'Role': role.Role_ID,  
-            'Dept_ID': department.Dept_ID,  
+            'Role': int(role_name),
+            'Dept_ID': int(department_name),
             'Password': default_password
         }
 
@@ -308,6 +378,8 @@ def new_user():
         new_user = create_entry(User, **user_data)
 
         if new_user:
+            fragment_cache.publish('users', user_id=new_user.User_ID)
+
             # Send welcome notification to new user
             from app.modules.activity_logger import create_notification, log_activity
             create_notification(
@@ -323,7 +395,7 @@ def new_user():
                 action='created',
                 entity_type='User',
                 entity_id=new_user.User_ID,
-                description=f'Created new user: {username} ({role.Role_Name})'
+                description=f'Created new user: {username} ({role})'
             )
             
             flash('New user created successfully!', 'success')
@@ -333,11 +405,12 @@ def new_user():
         return redirect(url_for('admin.admin_dashboard'))
     if request.method=='GET':
         # Query all departments and roles
-        departments = Department.query.all()
-        roles = Role.query.all()
+        departments = reference_cache.get_rows('department')
+        roles = reference_cache.get_rows('role')
         return render_template('admin/new_user.html', departments=departments, roles=roles)
 
 @admin_bp.route('/view_user/<int:user_id>', methods=['GET'])
+@read_only
 def view_user(user_id):
     """Route to view detailed information for a single user."""
     user = User.query.get(user_id)
@@ -370,10 +443,8 @@ def edit_user(user_id):
         old_role = None
         if role_id and int(role_id) != user.Role:
             role_changed = True
-            old_role_obj = Role.query.get(user.Role)
-            new_role_obj = Role.query.get(role_id)
-            old_role = old_role_obj.Role_Name if old_role_obj else "Unknown"
-            new_role = new_role_obj.Role_Name if new_role_obj else "Unknown"
+            old_role = reference_cache.get_name('role', user.Role, "Unknown")
+            new_role = reference_cache.get_name('role', role_id, "Unknown")
             user.Role = role_id
             user.Verified = 0  # Require re-authorization when role changes
         
@@ -385,6 +456,7 @@ def edit_user(user_id):
             user.Dept_ID = dept_id
 
         db.session.commit()
+        fragment_cache.publish('users', user_id=user.User_ID)
         
         # Notify user if role changed
         if role_changed:
@@ -419,8 +491,8 @@ def edit_user(user_id):
             
         return redirect(url_for('admin.view_user', user_id=user_id))
 
-    roles = Role.query.all()
-    departments = Department.query.all()
+    roles = reference_cache.get_rows('role')
+    departments = reference_cache.get_rows('department')
     return render_template('admin/new_user.html', user=user, roles=roles, departments=departments)
 
 @admin_bp.route('/delete_user/<int:user_id>', methods=['POST', 'GET'])
@@ -447,6 +519,7 @@ def delete_user(user_id):
     # If no association, proceed with deletion
     filters = {'User_ID': user_id}
     if delete_entry(User, filters):
+        fragment_cache.publish('users', user_id=user_id)
         flash("User deleted successfully.", "success")
         return redirect(url_for('admin.admin_dashboard'))
     else:
@@ -454,35 +527,62 @@ def delete_user(user_id):
         return redirect(url_for('admin.admin_dashboard'))
 
 @admin_bp.route('/users')
+@read_only
 def users_table():
     # Get parameters for sorting and filtering from the request
     sort_key = request.args.get('sort_key', 'username')  # Default sorting by 'username'
     sort_order = request.args.get('sort_order', 'asc')  # Default sorting order is ascending
 
-    # Filter parameters (role, department, username)
+    # Filter parameters (role, department, username / email search)
     filter_role = request.args.get('filter_role', '')
     filter_department = request.args.get('filter_department', '')
     filter_username = request.args.get('filter_username', '')
+    page = request.args.get('page', 1, type=int)
+    page_size = get_page_size(request.args)
+
+    url_params = {
+        'sort_key': sort_key,
+        'sort_order': sort_order,
+        'filter_role': filter_role,
+        'filter_department': filter_department,
+        'filter_username': filter_username
+    }
 
-    # Get the filtered and sorted user data from the database
-    user_table_data = get_user_table_data(
-        sort_key=sort_key,
-        sort_order=sort_order,
-        filter_role=filter_role,
-        filter_department=filter_department,
-        filter_username=filter_username
-    )
-    users = filter_data(User)
-    user_data = [get_user_info(user) for user in users]
+    # One page of users, sorted, filtered and counted by the database; cached per query until users change
+    def render_users_table():
+        user_page = get_user_page(
+            page=page,
+            page_size=page_size,
+            sort_key=sort_key,
+            sort_order=sort_order,
+            filter_role=filter_role,
+            filter_department=filter_department,
+            search=filter_username
+        )
+        return fragment_cache.render_macro('admin/user_fragments.html', 'render_users_table',
+                                           user_page, sort_key, sort_order, url_params)
+
+    def render_pending():
+        return fragment_cache.render_macro('admin/user_fragments.html', 'render_pending_cards',
+                                           get_pending_users(limit=PENDING_USERS_LIMIT))
+
+    user_id = session.get('user_id')
+    table_key = ('Admin', user_id, page, page_size, *url_params.values())
+    table_html = fragment_cache.get_or_render('users', table_key, render_users_table)
+    pending_html = fragment_cache.get_or_render('users', ('Admin', user_id, 'pending'), render_pending)
 
     # Pass the filters as part of the context so they can be included in the URLs for sorting
     return render_template('admin/user_table.html', 
-                           users_table=user_table_data,
+                           table_html=table_html,
+                           pending_html=pending_html,
+                           roles=reference_cache.get_names('role'),
+                           departments=reference_cache.get_names('department'),
                            filter_role=filter_role,
                            filter_department=filter_department,
                            filter_username=filter_username,
                            sort_key=sort_key,
-                           sort_order=sort_order,data=user_data)
+                           sort_order=sort_order,
+                           page_size=page_size)
 
 @admin_bp.route('/authorize/<int:user_id>', methods=['POST'])
 def authorize_user(user_id):
@@ -502,6 +602,7 @@ def authorize_user(user_id):
         # Update the Verified status
         user.Verified = 1
         db.session.commit()
+        fragment_cache.publish('users', user_id=user_id)
         flash("User has been authorized successfully.", "success")
     
     except SQLAlchemyError as e:
@@ -512,130 +613,11 @@ def authorize_user(user_id):
     # Redirect back to the dashboard
     return redirect(url_for('admin.admin_dashboard'))
 
-def get_user_table_data(sort_key='username', sort_order='asc', filter_role='', filter_department='', filter_username=''):
-    query = db.session.query(User.User_ID, User.Username, User.Email, User.Role, User.Dept_ID)
-    
-    # Apply filters if specified
-    if filter_role:
-        query = query.filter(User.Role == filter_role)
-    if filter_department:
-        query = query.filter(User.Dept_ID == filter_department)
-    if filter_username:
-        query = query.filter(User.Username.ilike(f'%{filter_username}%'))
-
-    # Apply sorting (consider descending order if specified)
-    if sort_order == 'desc':
-        sort_func = desc
-    else:
-        sort_func = asc
-
-    # Dynamically apply sorting based on the sort_key
-    if sort_key == 'username':
-        query = query.order_by(sort_func(User.Username))
-    elif sort_key == 'email':
-        query = query.order_by(sort_func(User.Email))
-    elif sort_key == 'role':
-        query = query.order_by(sort_func(User.Role))
-    elif sort_key == 'department':
-        query = query.order_by(sort_func(User.Dept_ID))
-
-    # Execute query and fetch the results
-    users = query.all()
-
-    # Fetch departments and roles for lookup
-    depts = filter_data(Department, None, ['Dept_ID', 'Name'])
-    roles = filter_data(Role, None, ['Role_ID', 'Role_Name'])
-
-    # Create dictionaries for quick lookup
-    dept_dict = {dept.Dept_ID: dept.Name for dept in depts}
-    role_dict = {role.Role_ID: role.Role_Name for role in roles}
-
-    user_table_data = []
-    for user in users:
-        # Lookup department and role names using the dictionaries
-        department_name = dept_dict.get(user.Dept_ID, "N/A")
-        role_name = role_dict.get(user.Role, "N/A")
-
-        # Add user data to table
-        row = {
-            'user_id': user.User_ID,
-            'Full Name': user.Username.title(),
-            'Email': user.Email,
-            'Role': role_name,
-            'Department': department_name
-        }
-        user_table_data.append(row)
-
-    return user_table_data
-
-def get_event_data():
-    """
-    This function returns a dictionary containing events grouped by their status.
-    The dictionary will have the following keys: "Upcoming", "Ongoing", and "Completed",
-    each containing a list of event data (dictionaries).
-    Each event dictionary will have the following keys:
-        "id", "event_name", "status", "type", "department", "event_manager", "finance_manager"
-    """
-
-    # Initialize the dictionary to store events by status
-    grouped_event_data = {'Upcoming': [], 'Ongoing': [], 'Completed': []}
-
-    # Get the current date
-    current_date = date.today()
-
-    # Fetch all the events, sub-events, users, and departments from the database
-    events = Event.query.all()
-    sub_events = SubEvent.query.all()
-    users = User.query.all()
-    depts = Department.query.all()
-    event_types = EventType.query.all()
-
-    # Loop through the events and build the data for each
-    for event in events:
-        # Determine the event status based on the event date
-        if event.Date > current_date:
-            status = "Upcoming"
-        elif event.Date == current_date:
-            status = "Ongoing"
-        else:
-            status = "Completed"
-
-        # Get the event type name using EventType model
-        event_type = next((et.Event_Type_Name for et in event_types if et.Event_Type_ID == event.Event_Type_ID), "Unknown")
-
-        # Get the department name using the Department model
-        department = next((dept.Name for dept in depts if dept.Dept_ID == event.Dept_ID), "Unknown")
-
-        # Get the event manager using the User model
-        event_manager = next((user.Username for user in users if user.User_ID == event.Event_Manager), "Unknown")
-
-        # Build the event card data dictionary
-        event_data = {
-            "id": event.Event_ID,
-            "event_name": event.Name,
-            "status": status,
-            "type": event_type,
-            "department": department,
-            "event_manager": event_manager,
-        }
-
-        # Append the event data to the appropriate status list in the dictionary
-        grouped_event_data[status].append(event_data)
-    return grouped_event_data
-    
 def get_user_info(user):
     """Fetch and structure data for a single user, including related roles, departments."""
     
-    # Fetch related role and department for the specified user
-    roles = filter_data(Role, columns=["Role_ID", "Role_Name"])
-    departments = filter_data(Department, columns=["Dept_ID", "Name"])
-
-    # Convert role and department data into dictionaries for fast lookup
-    roles_dict = {role.Role_ID: role.Role_Name for role in roles}
-    departments_dict = {dept.Dept_ID: dept.Name for dept in departments}
-
     # Determine the user's role
-    user_role = roles_dict.get(user.Role, "No Role Assigned")
+    user_role = reference_cache.get_name('role', user.Role, "No Role Assigned")
 
     # Construct user info dictionary without events and sub-events
     user_info = {
@@ -643,7 +625,7 @@ def get_user_info(user):
         "name": user.Username or "User Name",
         "email": user.Email,
         "role": user_role,
-        "department": departments_dict.get(user.Dept_ID, "No Department Assigned"),
+        "department": reference_cache.get_name('department', user.Dept_ID, "No Department Assigned"),
         "verified": user.Verified  # Ensure Verified data is passed
     }
     #User Info Display....
@@ -651,6 +633,7 @@ def get_user_info(user):
     return user_info
 
 @admin_bp.route('/view_sub_event/<int:sub_event_id>')
+@read_only
 def view_sub_event(sub_event_id):
     sub_event = SubEvent.query.get(sub_event_id)
     if not sub_event:
@@ -678,6 +661,7 @@ def create_sub_event(event_id):
             )
             db.session.add(new_sub_event)
             db.session.commit()
+            fragment_cache.publish('events', event_id=event_id)
             
             flash("Sub-event created successfully!", "success")
             return redirect(url_for('admin.event_details', event_id=event_id))
@@ -703,6 +687,7 @@ def edit_sub_event(sub_event_id):
             sub_event.Date = datetime.strptime(date, '%Y-%m-%d').date()
             sub_event.Time = datetime.strptime(time, '%H:%M').time()
             db.session.commit()
+            fragment_cache.publish('events', event_id=sub_event.Event_ID)
             
             flash("Sub-event updated successfully!", "success")
             return redirect(url_for('admin.event_details', event_id=sub_event.Event_ID))
@@ -753,6 +738,7 @@ def edit_event(event_id):
 
         event.modified_date = datetime.now()
         db.session.commit()
+        fragment_cache.publish('events', event_id=event.Event_ID)
 
         # Send notifications if managers changed
         if manager_changed:
@@ -809,10 +795,10 @@ def edit_event(event_id):
         return redirect(url_for('admin.event_details', event_id=event_id))
 
     # Fetch all required data for dropdowns
-    departments = Department.query.all()
-    event_types = EventType.query.all()
-    event_managers = User.query.join(Role).filter(Role.Role_Name == 'Event Manager').all()
-    finance_managers = User.query.join(Role).filter(Role.Role_Name == 'Finance Manager').all()
+    departments = reference_cache.get_rows('department')
+    event_types = reference_cache.get_rows('event_type')
+    event_managers = User.query.filter_by(Role=reference_cache.get_id_by_name('role', 'Event Manager')).all()
+    finance_managers = User.query.filter_by(Role=reference_cache.get_id_by_name('role', 'Finance Manager')).all()
 
     return render_template('admin/new_event_creation.html', 
                            event=event,
@@ -884,6 +870,7 @@ def edit_admin_profile():
             
             # Save changes
             db.session.commit()
+            fragment_cache.publish('users', user_id=admin_user_id)
             
             # Log the activity
             changes = []
@@ -913,17 +900,27 @@ def edit_admin_profile():
 
 
 @admin_bp.route('/notifications')
+@read_only
 def notifications():
     """Display notifications for admin"""
     try:
         admin_user_id = 1  # TODO: Get from session
         
-        # Get all notifications for this user, ordered by most recent
-        notifications_list = Notification.query.filter_by(User_ID=admin_user_id).order_by(Notification.Created_At.desc()).all()
-        unread_count = Notification.query.filter_by(User_ID=admin_user_id, Is_Read=False).count()
+        # One page of this user's notifications, most recent first, filtered in SQL
+        page_size = get_page_size(request.args)
+        filters = {'type': request.args.get('type'), 'status': request.args.get('status')}
+        page = get_notification_page(
+            admin_user_id, page_size, after=request.args.get('after'), before=request.args.get('before'),
+            notification_type=filters['type'], status=filters['status']
+        )
+        unread_count = get_unread_notification_count(admin_user_id)
         
         return render_template('admin/notifications.html', 
-                             notifications=notifications_list,
+                             notifications=page['rows'],
+                             older_cursor=page['older_cursor'],
+                             newer_cursor=page['newer_cursor'],
+                             page_size=page_size,
+                             filters={k: v for k, v in filters.items() if v},
                              unread_count=unread_count)
     except Exception as e:
         flash(f"Error loading notifications: {str(e)}", "danger")
@@ -956,6 +953,7 @@ def mark_all_notifications_read():
 
 
 @admin_bp.route('/activity-log')
+@read_only
 def activity_log():
     """Display activity log"""
     try:
@@ -0,0 +1,262 @@
+# app/cli.py
+
+import click
+from flask.cli import AppGroup
+
+summary_cli = AppGroup('summary', help='Maintain the Event_Financial_Summary running totals.')
+reports_cli = AppGroup('reports', help='Manage the generated report cache.')
+db_cli = AppGroup('db', help='Create the database schema and apply migrations.')
+budget_cli = AppGroup('budget', help='Maintain the budgets\' running expense totals.')
+notifications_cli = AppGroup('notifications', help='Maintain notifications and the unread counters.')
+audit_cli = AppGroup('audit', help='Inspect the activity log writer and replay its fallback file.')
+fragments_cli = AppGroup('fragments', help='Inspect and clear the dashboard fragment cache.')
+transactions_cli = AppGroup('transactions', help='Bulk import transactions from CSV/XLSX files.')
+
+
+@summary_cli.command('rebuild')
+@click.option('--event-id', type=int, default=None, help='Rebuild a single event only.')
+def rebuild_summary(event_id):
+    """Recompute Event_Financial_Summary from transaction items."""
+    from .modules.financial_summary import rebuild_financial_summary
+
+    try:
+        written = rebuild_financial_summary(event_id)
+    except RuntimeError as e:
+        click.echo(f"✗ {e}")
+        raise SystemExit(1)
+    scope = f"event {event_id}" if event_id is not None else "all events"
+    click.echo(f"✓ Rebuilt financial summary for {scope} ({written} rows)")
+
+
+@summary_cli.command('verify')
+@click.option('--event-id', type=int, default=None, help='Verify a single event only.')
+def verify_summary(event_id):
+    """Report drift between Event_Financial_Summary and transaction items."""
+    from .modules.financial_summary import verify_financial_summary
+
+    drift = verify_financial_summary(event_id)
+    if not drift:
+        click.echo("✓ Financial summary matches transaction items")
+        return
+
+    for row in drift:
+        expected_total, expected_count = row['expected']
+        stored_total, stored_count = row['stored']
+        click.echo(
+            f"✗ {row['key']}: expected ₹{expected_total:,.2f} ({expected_count} items), "
+            f"stored ₹{stored_total:,.2f} ({stored_count} items)"
+        )
+    click.echo(f"\n{len(drift)} drifting summary rows. Run 'flask summary rebuild' to fix them.")
+    raise SystemExit(1)
+
+
+@reports_cli.command('cache-stats')
+def report_cache_stats():
+    """Show how many reports are cached and how much disk they use."""
+    from .modules.report_cache import get_stats
+
+    stats = get_stats()
+    click.echo(
+        f"{stats['entries']} cached reports, {stats['bytes'] / 1024 / 1024:.1f} MB "
+        f"of {stats['max_bytes'] / 1024 / 1024:.0f} MB"
+    )
+
+
+@reports_cli.command('clear-cache')
+def clear_report_cache():
+    """Delete every cached report."""
+    from .modules.report_cache import clear
+
+    click.echo(f"✓ Removed {clear()} cached reports")
+
+
+@db_cli.command('init')
+def db_init():
+    """Create the database (or version an existing one) for migrations."""
+    from .modules.migrations import init_database, get_current_version, get_pending_migrations
+
+    if init_database() == 'created':
+        click.echo(f"✓ Created the schema at version {get_current_version():04d}")
+        click.echo("📝 Next step: Run 'python scripts/populate_db.py' to add sample data")
+        return
+
+    pending = get_pending_migrations()
+    click.echo(f"✓ Existing database is at version {get_current_version():04d}, {len(pending)} pending migrations")
+    if pending:
+        click.echo("Run 'flask db upgrade' to apply them, or 'flask db stamp --to N' if the schema already has them.")
+
+
+@db_cli.command('upgrade')
+@click.option('--to', 'target', type=int, default=None, help='Stop after this migration version.')
+def db_upgrade(target):
+    """Apply pending migrations in order."""
+    from sqlalchemy.exc import SQLAlchemyError
+    from .modules.migrations import upgrade, get_current_version, get_pending_migrations
+
+    pending = [migration for migration in get_pending_migrations() if target is None or migration.version <= target]
+    if not pending:
+        click.echo(f"✓ Database is up to date (version {get_current_version():04d})")
+        return
+
+    try:
+        for migration in upgrade(target):
+            click.echo(f"✓ Applied {migration.version:04d}_{migration.name}")
+    except SQLAlchemyError as e:
+        click.echo(f"✗ Migration failed at version {get_current_version():04d}: {e}")
+        raise SystemExit(1)
+    click.echo(f"\nDatabase is at version {get_current_version():04d}")
+
+
+@db_cli.command('status')
+def db_status():
+    """Show the current schema version and pending migrations."""
+    from .modules.migrations import is_versioned, get_current_version, get_pending_migrations
+
+    if not is_versioned():
+        click.echo("⚠ Database is not versioned. Run 'flask db init'.")
+        raise SystemExit(1)
+
+    pending = get_pending_migrations()
+    click.echo(f"Current version: {get_current_version():04d}")
+    for migration in pending:
+        click.echo(f"  pending {migration.version:04d}_{migration.name}")
+    if pending:
+        raise SystemExit(1)
+    click.echo("✓ No pending migrations")
+
+
+@db_cli.command('stamp')
+@click.option('--to', 'target', type=int, default=None, help='Mark versions up to this one (default: all).')
+def db_stamp(target):
+    """Mark migrations as applied without running them."""
+    from .modules.migrations import stamp
+
+    for migration in stamp(target):
+        click.echo(f"✓ Marked {migration.version:04d}_{migration.name} as applied")
+
+
+@audit_cli.command('replay')
+@click.option('--file', 'path', default=None, help='Fallback file to replay (default: AUDIT_FALLBACK_FILE).')
+def audit_replay(path):
+    """Insert activity log entries saved to the fallback file."""
+    from sqlalchemy.exc import SQLAlchemyError
+    from . import db
+    from .modules.audit_writer import replay_fallback
+
+    try:
+        replayed = replay_fallback(db.engine, path)
+    except SQLAlchemyError as e:
+        click.echo(f"✗ Replay failed, the file was kept: {e}")
+        raise SystemExit(1)
+    click.echo(f"✓ Replayed {replayed} activity log entries")
+
+
+@audit_cli.command('stats')
+def audit_stats():
+    """Show the writer settings and the size of the fallback file."""
+    from flask import current_app
+    from .modules.audit_writer import get_stats
+
+    stats = get_stats()
+    mode = f"queue of {current_app.config['AUDIT_QUEUE_SIZE']}" if stats['enabled'] else "synchronous"
+    click.echo(f"Activity log writer: {mode}")
+    click.echo(f"Fallback file: {current_app.config['AUDIT_FALLBACK_FILE']} ({stats['fallback_bytes']} bytes)")
+    if stats['fallback_bytes']:
+        click.echo("Run 'flask audit replay' to insert the saved entries.")
+
+
+@budget_cli.command('reconcile')
+@click.option('--event-id', type=int, default=None, help='Reconcile a single event only.')
+@click.option('--no-notify', is_flag=True, help='Do not send threshold notifications for corrected budgets.')
+def reconcile_budget_totals(event_id, no_notify):
+    """Recompute Budget.Spent_Total from transaction items and fix any drift (run nightly)."""
+    from .modules.budget_monitor import reconcile_budgets
+
+    corrected = reconcile_budgets(event_id, notify=not no_notify)
+    for row in corrected:
+        scope = f"event {row['event_id']}" if row['event_id'] is not None else f"sub-event {row['sub_event_id']}"
+        click.echo(f"⚠ Budget {row['budget_id']} ({scope}): stored ₹{row['stored']:,.2f}, actual ₹{row['expected']:,.2f}")
+    click.echo(f"✓ Reconciled budgets, {len(corrected)} corrected")
+
+
+@notifications_cli.command('recount')
+def recount_notifications():
+    """Recompute every user's unread notification counter."""
+    from .modules.activity_logger import recount_unread_notifications
+
+    click.echo(f"✓ Recounted unread notifications, {recount_unread_notifications()} counters corrected")
+
+
+@notifications_cli.command('archive')
+@click.option('--days', type=int, default=None, help='Archive read notifications older than this (default: NOTIFICATION_RETENTION_DAYS).')
+@click.option('--batch-size', type=int, default=None, help='Notifications moved per transaction (default: NOTIFICATION_ARCHIVE_BATCH_SIZE).')
+def archive_notifications(days, batch_size):
+    """Move old read notifications to Notification_Archive."""
+    from flask import current_app
+    from .modules.activity_logger import archive_read_notifications
+
+    days = days if days is not None else current_app.config['NOTIFICATION_RETENTION_DAYS']
+    batch_size = batch_size or current_app.config['NOTIFICATION_ARCHIVE_BATCH_SIZE']
+    archived = archive_read_notifications(days, batch_size)
+    click.echo(f"✓ Archived {archived} read notifications older than {days} days")
+
+
+@fragments_cli.command('stats')
+def fragment_cache_stats():
+    """Show the fragment cache backend and this process's counters."""
+    from .modules import fragment_cache
+
+    for key, value in fragment_cache.get_stats().items():
+        click.echo(f"{key}: {value}")
+
+
+@fragments_cli.command('clear')
+def clear_fragment_cache():
+    """Drop every cached fragment (shared stores are cleared for all workers)."""
+    from .modules import fragment_cache
+
+    removed = fragment_cache.clear()
+    click.echo(f"✓ Removed {removed} cached fragments")
+
+
+@transactions_cli.command('import')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--event-id', type=int, required=True, help='Event (or sub-event) the transactions belong to.')
+@click.option('--user-id', type=int, required=True, help='User recorded as the creator of the transactions.')
+@click.option('--dry-run', is_flag=True, help='Validate the file without importing anything.')
+@click.option('--chunk-size', type=int, default=None, help='Transactions per insert (default: IMPORT_CHUNK_SIZE).')
+def import_transactions_file(path, event_id, user_id, dry_run, chunk_size):
+    """Import transactions (one row per item) from a CSV or XLSX file."""
+    from .modules.transaction_import import iter_rows, import_transactions, ImportFileError
+
+    with open(path, 'rb') as file:
+        try:
+            rows = iter_rows(file, path)
+        except ImportFileError as e:
+            click.echo(f"✗ {e}")
+            raise SystemExit(1)
+        report = import_transactions(user_id, event_id, rows, dry_run=dry_run, chunk_size=chunk_size)
+
+    for error in report['errors']:
+        location = f"Row {error['row']}" if error['row'] else "File"
+        click.echo(f"✗ {location}: {'; '.join(error['errors'])}")
+    summary = f"{report['transactions']} transactions ({report['items']} items, ₹{report['total']:,.2f}) from {report['rows']} rows"
+    if report['committed']:
+        click.echo(f"✓ Imported {summary}")
+    elif report['ok']:
+        click.echo(f"✓ File is valid: {summary} would be imported")
+    else:
+        click.echo("\nNothing was imported. Fix the errors above and run the import again.")
+        raise SystemExit(1)
+
+
+def register_commands(app):
+    """Registers all CLI command groups with the provided app instance."""
+    app.cli.add_command(summary_cli)
+    app.cli.add_command(reports_cli)
+    app.cli.add_command(db_cli)
+    app.cli.add_command(budget_cli)
+    app.cli.add_command(notifications_cli)
+    app.cli.add_command(audit_cli)
+    app.cli.add_command(fragments_cli)
+    app.cli.add_command(transactions_cli)
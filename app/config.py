@@ -5,6 +5,20 @@ from dotenv import load_dotenv
 # Load environment variables from .env file
 load_dotenv()
 
+
+def engine_options(database_uri, pool_size, max_overflow, pool_recycle=280, pool_timeout=30):
+    """SQLAlchemy engine options for a server database; DB_POOL_* environment variables override the defaults"""
+    if database_uri.startswith('sqlite'):
+        return {}
+    return {
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', pool_size)),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', max_overflow)),
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', pool_recycle)),  # below MySQL's wait_timeout
+        'pool_timeout': int(os.environ.get('DB_POOL_TIMEOUT', pool_timeout)),
+        'pool_pre_ping': os.environ.get('DB_POOL_PRE_PING', 'true').lower() in ('1', 'true', 'yes'),
+    }
+
+
 class Config:
     """Base configuration with default settings."""
     SECRET_KEY = os.environ.get('SECRET_KEY', 'your_secret_key_here')
@@ -32,20 +46,97 @@ class Config:
         f'mysql+pymysql://{DB_USERNAME}:{db_password_encoded}@{DB_HOST}:{DB_PORT}/{DB_NAME}'
     )
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # Connection pool: pre-ping and recycle avoid "MySQL server has gone away" on idle connections
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI, pool_size=10, max_overflow=20)
+    DB_POOL_SLOW_CHECKOUT_MS = int(os.environ.get('DB_POOL_SLOW_CHECKOUT_MS', 100))  # log checkouts waiting longer
+
+    # Optional read replica for dashboards and reports; without it every query goes to the primary
+    REPLICA_DATABASE_URL = os.environ.get('REPLICA_DATABASE_URL', '')
+    SQLALCHEMY_BINDS = {'replica': REPLICA_DATABASE_URL} if REPLICA_DATABASE_URL else {}
+    # After a user writes, their reads stay on the primary this long (replication lag)
+    REPLICA_READ_YOUR_WRITES_SECONDS = int(os.environ.get('REPLICA_READ_YOUR_WRITES_SECONDS', 5))
+
+    # Seconds before cached lookup tables (categories, modes, roles, ...) are reloaded
+    REFERENCE_CACHE_TTL = int(os.environ.get('REFERENCE_CACHE_TTL', 300))
+
+    # Background report jobs (Excel/PDF exports); 0 workers runs jobs inside the request
+    REPORT_WORKERS = int(os.environ.get('REPORT_WORKERS', 2))
+    REPORT_OUTPUT_DIR = os.environ.get(
+        'REPORT_OUTPUT_DIR',
+        os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'instance', 'reports')
+    )
+
+    # Each finished job keeps its own link to the report for this long (downloads after that fail)
+    REPORT_JOB_FILE_MAX_AGE_HOURS = int(os.environ.get('REPORT_JOB_FILE_MAX_AGE_HOURS', 168))
+
+    # Generated reports are reused until the event's data changes; least recently used are evicted beyond this size
+    REPORT_CACHE_DIR = os.environ.get('REPORT_CACHE_DIR', os.path.join(REPORT_OUTPUT_DIR, 'cache'))
+    REPORT_CACHE_MAX_BYTES = int(os.environ.get('REPORT_CACHE_MAX_MB', 512)) * 1024 * 1024
+
+    # PDF reports: ledger rows per separately rendered part, and processes rendering parts in parallel (0 = in turn)
+    PDF_ROWS_PER_PART = int(os.environ.get('PDF_ROWS_PER_PART', 2000))
+    PDF_RENDER_WORKERS = int(os.environ.get('PDF_RENDER_WORKERS', 2))
+
+    # Compiled Jinja templates are kept here between restarts; empty disables the bytecode cache
+    JINJA_BYTECODE_CACHE_DIR = os.environ.get(
+        'JINJA_BYTECODE_CACHE_DIR',
+        os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'instance', 'jinja_cache')
+    )
+
+    # Activity log entries are inserted in batches by a background thread (queue size 0 = write in the request);
+    # entries that cannot be queued within AUDIT_ENQUEUE_TIMEOUT_MS go to AUDIT_FALLBACK_FILE ('flask audit replay')
+    AUDIT_QUEUE_SIZE = int(os.environ.get('AUDIT_QUEUE_SIZE', 10000))
+    AUDIT_BATCH_SIZE = int(os.environ.get('AUDIT_BATCH_SIZE', 200))
+    AUDIT_FLUSH_INTERVAL_MS = int(os.environ.get('AUDIT_FLUSH_INTERVAL_MS', 500))
+    AUDIT_ENQUEUE_TIMEOUT_MS = int(os.environ.get('AUDIT_ENQUEUE_TIMEOUT_MS', 50))
+    AUDIT_FALLBACK_FILE = os.environ.get(
+        'AUDIT_FALLBACK_FILE',
+        os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'instance', 'audit_fallback.jsonl')
+    )
+
+    # 'flask notifications archive' moves read notifications older than this to Notification_Archive
+    NOTIFICATION_RETENTION_DAYS = int(os.environ.get('NOTIFICATION_RETENTION_DAYS', 90))
+    NOTIFICATION_ARCHIVE_BATCH_SIZE = int(os.environ.get('NOTIFICATION_ARCHIVE_BATCH_SIZE', 1000))
+
+    # Rendered dashboard fragments (event cards, user tables) are cached until an admin write invalidates them;
+    # 'memory' is a per-worker LRU, 'filesystem' shares FRAGMENT_CACHE_DIR between workers, 'none' disables it
+    FRAGMENT_CACHE_BACKEND = os.environ.get('FRAGMENT_CACHE_BACKEND', 'memory')
+    FRAGMENT_CACHE_TTL = int(os.environ.get('FRAGMENT_CACHE_TTL', 300))
+    FRAGMENT_CACHE_MAX_ENTRIES = int(os.environ.get('FRAGMENT_CACHE_MAX_ENTRIES', 1000))
+    FRAGMENT_CACHE_DIR = os.environ.get(
+        'FRAGMENT_CACHE_DIR',
+        os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'instance', 'fragment_cache')
+    )
+
+    # Bulk transaction imports insert this many transactions (and their items) per statement
+    IMPORT_CHUNK_SIZE = int(os.environ.get('IMPORT_CHUNK_SIZE', 500))
+
+    # Ordered schema migrations applied by 'flask db upgrade'
+    MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'database', 'migrations')
     DEBUG = False
 
 class DevelopmentConfig(Config):
     """Configuration for development."""
     DEBUG = True
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(Config.SQLALCHEMY_DATABASE_URI, pool_size=5, max_overflow=5)
 
 class TestingConfig(Config):
     """Configuration for testing."""
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    SQLALCHEMY_ENGINE_OPTIONS = {}
+    SQLALCHEMY_BINDS = {}
+    REPORT_WORKERS = 0  # An in-memory database cannot be shared with worker processes
+    PDF_RENDER_WORKERS = 0
+    JINJA_BYTECODE_CACHE_DIR = ''
+    AUDIT_QUEUE_SIZE = 0  # The writer thread cannot share the in-memory database
+    FRAGMENT_CACHE_BACKEND = 'none'  # Query-count checks measure the uncached views
 
 class ProductionConfig(Config):
     """Configuration for production."""
     DEBUG = False
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(Config.SQLALCHEMY_DATABASE_URI, pool_size=20, max_overflow=30)
     # Set any additional production-specific settings here.
 
 # Dictionary to help select the configuration based on environment
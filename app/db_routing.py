@@ -0,0 +1,80 @@
+# app/db_routing.py
+
+import time
+from contextlib import contextmanager
+from functools import wraps
+from flask import g, session, has_app_context, has_request_context, current_app
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+
+REPLICA_BIND = 'replica'
+LAST_WRITE_KEY = 'last_write_at'
+
+
+class RoutingSession(Session):
+    """Session that sends reads to the 'replica' bind while replica reads are enabled.
+
+    Flushes and INSERT/UPDATE/DELETE statements always go to the primary.
+    Without a configured replica every statement goes to the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and replica_enabled() and not getattr(clause, 'is_dml', False):
+            engine = self._db.engines.get(REPLICA_BIND)
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def replica_enabled():
+    """True while the current request or job reads from the replica."""
+    return has_app_context() and g.get('use_replica', False)
+
+
+def recently_wrote():
+    """True if the logged-in user wrote within the read-your-writes window."""
+    if not has_request_context():
+        return False
+    window = current_app.config.get('REPLICA_READ_YOUR_WRITES_SECONDS', 5)
+    return time.time() - session.get(LAST_WRITE_KEY, 0) < window
+
+
+def _record_write():
+    # Later reads in this request (and the user's next few requests) must see the write
+    if has_app_context():
+        g.use_replica = False
+    if has_request_context():
+        session[LAST_WRITE_KEY] = time.time()
+
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _after_flush(db_session, flush_context):
+    if db_session.new or db_session.dirty or db_session.deleted:
+        _record_write()
+
+
+@event.listens_for(RoutingSession, 'do_orm_execute')
+def _on_orm_execute(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        _record_write()
+
+
+def read_only(f):
+    """Decorator for read-only views: serve the request from the replica,
+    unless the user wrote within REPLICA_READ_YOUR_WRITES_SECONDS."""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        g.use_replica = not recently_wrote()
+        return f(*args, **kwargs)
+    return decorated_function
+
+
+@contextmanager
+def use_replica(enabled=True):
+    """Read from the replica inside the block (for report jobs outside a request)."""
+    previous = g.get('use_replica', False)
+    g.use_replica = enabled
+    try:
+        yield
+    finally:
+        g.use_replica = previous
@@ -1,19 +1,30 @@
-from flask import Blueprint, render_template, redirect, request, flash, url_for, get_flashed_messages, session  
+from flask import Blueprint, render_template, redirect, request, flash, url_for, get_flashed_messages, session, jsonify  
 from app import db
 import json
 from .modules.models import *
 from .modules.db_queries import *
-from .modules.activity_logger import log_activity, create_notification
+from .modules.activity_logger import log_activity, create_notification, get_unread_notification_count, get_notification_page
+from .modules.financial_snapshot import get_event_snapshot
+from .modules import reference_cache, fragment_cache, transaction_import
+from .modules.event_status import STATUSES, fetch_by_status, determine_status
+from .modules.transaction_queries import transactions_with_totals, event_scope
+from .modules.pagination import get_page_size, keyset_page, format_cursor
+from .modules.financial_summary import get_summary_key, get_transaction_contribution, apply_summary_delta, apply_contribution
+from .modules.budget_monitor import check_budget_thresholds, notify_large_transaction
 from .auth import login_required
+from .db_routing import read_only
 from sqlalchemy.orm import joinedload, validates
 from sqlalchemy.exc import SQLAlchemyError
 from collections import defaultdict
 from sqlalchemy import func
 from datetime import datetime, date
+from decimal import Decimal
 from werkzeug.security import generate_password_hash, check_password_hash
 
 event_manager_bp = Blueprint('event_manager', __name__, url_prefix='/evemng/<int:user_id>')
 
+DASHBOARD_EVENT_CARDS = 3  # Event cards per status on the dashboard
+
 @event_manager_bp.before_request
 def check_event_manager_access():
     """Check if user is logged in before accessing any event manager route."""
@@ -28,17 +39,29 @@ def check_event_manager_access():
 
 # Dashboard for event manager with the list of events
 @event_manager_bp.route('/')
+@read_only
 def event_manager(user_id):
-    events = get_events(user_id)
-    return render_template('event_manager/eventmanager_dash.html', events=events, user_id=user_id)
+    # Event cards are cached per user until an admin changes events or users
+    events_html = fragment_cache.get_or_render('events', ('Event Manager', user_id), lambda: render_event_cards(user_id))
+    return render_template('event_manager/eventmanager_dash.html', events_html=events_html, user_id=user_id)
+
+def render_event_cards(user_id):
+    """Dashboard event cards of an event manager ('' when no events are assigned)"""
+    events = get_events(user_id, limit=DASHBOARD_EVENT_CARDS + 1)  # One extra shows the "View All" card
+    if not events:
+        return ''
+    return fragment_cache.render_macro('event_manager/event_cards.html', 'render_event_cards_event_manager',
+                                       events, None, minimum_cards=True, user_id=user_id)
 
 # View all events for a specific user
 @event_manager_bp.route('/view_events')
+@read_only
 def view_events(user_id):
     events = get_events(user_id)
     return render_template('event_manager/view_events.html', events=events, user_id=user_id)
 
 @event_manager_bp.route('/event_details/<int:event_id>', methods=['GET'])
+@read_only
 def event_details(user_id, event_id):
     try:
         # Check if the event_id corresponds to an Event or a SubEvent
@@ -54,44 +77,55 @@ def event_details(user_id, event_id):
             event_data = {
                 "id": sub_event.Sub_Event_ID,
                 "event_name": sub_event.Name,
-                "status": "Ongoing" if sub_event.Date == date.today() else "Completed" if sub_event.Date < date.today() else "Upcoming",
-                "type": sub_event.event_type.Event_Type_Name,
-                "department": sub_event.department.Name,
+                "status": determine_status(sub_event.Date),
+                "type": reference_cache.get_name('event_type', sub_event.Event_Type_ID),
+                "department": reference_cache.get_name('department', sub_event.Dept_ID),
                 "date": sub_event.Date,
                 "time": sub_event.Time,
                 "main_event_name": sub_event.event.Name  # Add the main event name for SubEvent
             }
             
             # Fetch transactions related to the sub-event
-            transactions = db.session.query(Transaction).filter_by(Sub_Event_ID=sub_event.Sub_Event_ID).order_by(Transaction.Date.desc()).limit(5).all()
+            transactions = (
+                transactions_with_totals()
+                .filter(event_scope(sub_event.Sub_Event_ID, is_sub_event=True))
+                .order_by(Transaction.Date.desc())
+                .limit(5)
+                .all()
+            )
         
         else:
             # If Event is found, prepare its data
             event_data = {
                 "id": event.Event_ID,
                 "event_name": event.Name,
-                "status": "Ongoing" if event.Date == date.today() else "Completed" if event.Date < date.today() else "Upcoming",
-                "type": event.event_type.Event_Type_Name,
-                "department": event.department.Name,
+                "status": determine_status(event.Date, event.Days),
+                "type": reference_cache.get_name('event_type', event.Event_Type_ID),
+                "department": reference_cache.get_name('department', event.Dept_ID),
                 "date": event.Date,
                 "main_event_name": None  # No main event for regular Event
             }
             
             # Fetch transactions related to the event
-            transactions = db.session.query(Transaction).filter_by(Event_ID=event.Event_ID).order_by(Transaction.Date.desc()).limit(5).all()
+            transactions = (
+                transactions_with_totals()
+                .filter(event_scope(event.Event_ID))
+                .order_by(Transaction.Date.desc())
+                .limit(5)
+                .all()
+            )
 
         # Prepare the transaction data for display
         transaction_data = []
         total_revenue = 0
         total_expenses = 0
         
-        for transaction in transactions:
-            # Get the transaction items and calculate the total amount
-            transaction_items = db.session.query(TransactionItem).filter_by(Transaction_ID=transaction.Transaction_ID).all()
-            total_amount = sum(item.Amount for item in transaction_items)
-            
+        for transaction, total_amount in transactions:
+            total_amount = float(total_amount or 0)
+
             # Track revenue and expenses
-            if transaction.transaction_nature and transaction.transaction_nature.Nature_Name == 'Credit':
+            nature_name = reference_cache.get_name('nature', transaction.Nature_ID)
+            if nature_name == 'Credit':
                 total_revenue += total_amount
             else:
                 total_expenses += total_amount
@@ -103,13 +137,13 @@ def event_details(user_id, event_id):
                 "party_name": transaction.Party_Name,
                 "amount": total_amount,
                 "date": transaction.Date,
-                "nature": transaction.transaction_nature.Nature_Name if transaction.transaction_nature else 'N/A',
-                "payment_mode": transaction.payment_mode.Mode_Name if transaction.payment_mode else 'N/A',
-                "category": transaction.transaction_category.Category_Name if transaction.transaction_category else 'N/A'
+                "nature": nature_name or 'N/A',
+                "payment_mode": reference_cache.get_name('mode', transaction.Mode_ID, 'N/A'),
+                "category": reference_cache.get_name('category', transaction.Transaction_Category_ID, 'N/A')
             })
 
         # Fetch event types for dropdowns in the form
-        event_types = db.session.query(EventType).all()
+        event_types = reference_cache.get_rows('event_type')
 
         return render_template(
             'event_manager/event_details.html',
@@ -141,12 +175,20 @@ def update_event(user_id, event_id):
             flash("Required fields are missing.", "danger")
             return redirect(url_for('event_manager.event_details', user_id=user_id, event_id=event_id))
 
-        # Process Event
+        try:
+            event_date = datetime.strptime(date_str, "%Y-%m-%d").date()
+            event_time = datetime.strptime(time_str, "%H:%M").time() if time_str else None
+        except ValueError:
+            flash("Invalid date or time format.", "danger")
+            return redirect(url_for('event_manager.event_details', user_id=user_id, event_id=event_id))
+
+        # Process Event (event_type tells events from sub-events; it is not an Event_Type_ID)
         if event_type == 'event':
             filters = {'Event_ID': event_id, 'Event_Manager': user_id}
-            updates = {'Date': date_str, 'Event_Type_ID': event_type}  # Using event_type directly in updates
+            updates = {'Date': event_date}
             event = update_entry(Event, filters, updates)
             if event:
+                fragment_cache.publish('events', event_id=event.Event_ID)
                 flash("Event updated successfully!", "success")
             else:
                 flash("Event not found or you don't have permission to edit it.", "danger")
@@ -155,9 +197,12 @@ def update_event(user_id, event_id):
         # Process SubEvent
         elif event_type == 'sub_event':
             filters = {'Sub_Event_ID': event_id, 'Sub_Event_Manager': user_id}
-            updates = {'Date': date_str, 'Time': time_str, 'Event_Type_ID': event_type}  # Updating SubEvent
+            updates = {'Date': event_date}  # Updating SubEvent
+            if event_time:
+                updates['Time'] = event_time
             sub_event = update_entry(SubEvent, filters, updates)
             if sub_event:
+                fragment_cache.publish('events', event_id=sub_event.Event_ID)
                 flash("Sub-event updated successfully!", "success")
             else:
                 flash("Sub-event not found or you don't have permission to edit it.", "danger")
@@ -176,6 +221,7 @@ def update_event(user_id, event_id):
 
 
 @event_manager_bp.route('/event_visualization/<int:event_id>')
+@read_only
 def event_visualization(user_id, event_id):
     try:
         # Determine if it's an event or sub-event
@@ -192,55 +238,14 @@ def event_visualization(user_id, event_id):
         else:
             event_name = event.Name
         
-        # Fetch all transactions
-        if is_sub_event:
-            transactions = Transaction.query.filter_by(Sub_Event_ID=event_id).all()
-        else:
-            transactions = Transaction.query.filter_by(Event_ID=event_id).all()
-        
-        # Calculate totals
-        revenue = 0
-        expense = 0
-        
-        for txn in transactions:
-            amount = sum(item.Amount for item in txn.items) if txn.items else 0
-            if txn.transaction_nature and txn.transaction_nature.Nature_Name == 'Credit':
-                revenue += amount
-            else:
-                expense += amount
-        
-        profit_loss = revenue - expense
-        
-        # Category breakdown
-        category_breakdown = {}
-        for txn in transactions:
-            cat_name = txn.transaction_category.Category_Name if txn.transaction_category else 'Uncategorized'
-            amount = sum(item.Amount for item in txn.items) if txn.items else 0
-            category_breakdown[cat_name] = category_breakdown.get(cat_name, 0) + amount
-        
-        category_data = [{'name': k, 'total': v} for k, v in category_breakdown.items() if v > 0]
+        # Totals and breakdowns from the event snapshot
+        snapshot = get_event_snapshot(event_id, is_sub_event)
+        revenue = snapshot.revenue
+        expense = snapshot.expense
+        profit_loss = snapshot.profit_loss
         
-        # Payment mode breakdown
-        mode_breakdown = {}
-        for txn in transactions:
-            mode_name = txn.payment_mode.Mode_Name if txn.payment_mode else 'Unknown'
-            amount = sum(item.Amount for item in txn.items) if txn.items else 0
-            mode_breakdown[mode_name] = mode_breakdown.get(mode_name, 0) + amount
-        
-        mode_data = [{'name': k, 'total': v} for k, v in mode_breakdown.items() if v > 0]
-        
-        # Revenue vs Expense by category
-        revenue_by_category = {}
-        expense_by_category = {}
-        
-        for txn in transactions:
-            cat_name = txn.transaction_category.Category_Name if txn.transaction_category else 'Uncategorized'
-            amount = sum(item.Amount for item in txn.items) if txn.items else 0
-            
-            if txn.transaction_nature and txn.transaction_nature.Nature_Name == 'Credit':
-                revenue_by_category[cat_name] = revenue_by_category.get(cat_name, 0) + amount
-            else:
-                expense_by_category[cat_name] = expense_by_category.get(cat_name, 0) + amount
+        category_data = snapshot.category_breakdown
+        mode_data = snapshot.mode_breakdown
         
         # Create charts using Plotly
         import plotly.graph_objects as go
@@ -345,72 +350,42 @@ def event_visualization(user_id, event_id):
         return redirect(url_for('event_manager.event_details', user_id=user_id, event_id=event_id))
 
 
-def get_events(user_id):
+def get_events(user_id, limit=None):
+    """Events and sub-events managed by the user, grouped by status (computed in SQL); limit caps each status"""
     try:
-        # Fetch events where the event_manager matches the user_id, with necessary joins
-        events = (
-            db.session.query(Event)
-            .filter(Event.Event_Manager == user_id)
-            .options(
-                joinedload(Event.department),
-                joinedload(Event.event_type),
-                joinedload(Event.event_manager)
-            )
-            .all()
-        )
-
-        # Fetch sub-events where the sub_event_manager matches the user_id, with necessary joins
-        sub_events = (
-            db.session.query(SubEvent)
-            .join(Event)
-            .filter(SubEvent.Sub_Event_Manager == user_id)
-            .options(
-                joinedload(SubEvent.department),
-                joinedload(SubEvent.event_type),
-                joinedload(SubEvent.sub_event_manager)
-            )
-            .all()
-        )
-
-        # Helper function to determine the event status
-        def determine_status(event_date):
-            today = date.today()
-            if event_date > today:
-                return "Upcoming"
-            elif event_date == today:
-                return "Ongoing"
-            else:
-                return "Completed"
-
-        # Group events by status using defaultdict
-        grouped_events = defaultdict(list)
-
-        # Process events into the required dictionary structure
-        for event in events:
-            status = determine_status(event.Date)
-            grouped_events[status].append({
+        # Events where the event_manager matches the user_id, and sub-events where the sub_event_manager does
+        event_query = db.session.query(Event).filter(Event.Event_Manager == user_id)
+        sub_event_query = db.session.query(SubEvent).join(Event).filter(SubEvent.Sub_Event_Manager == user_id)
+        events_by_status = fetch_by_status(event_query, Event, limit=limit)
+        sub_events_by_status = fetch_by_status(sub_event_query, SubEvent, limit=limit)
+
+        grouped_events = {}
+        for status in STATUSES:
+            items = [{
                 "id": event.Event_ID,
                 "event_name": event.Name,
-                "status": status,  # Status based on event date
-                "type": event.event_type.Event_Type_Name,  # Name from EventType model
-                "department": event.department.Name,  # Name from Department model
+                "status": status,
+                "type": reference_cache.get_name('event_type', event.Event_Type_ID),  # Name from EventType lookup
+                "department": reference_cache.get_name('department', event.Dept_ID),  # Name from Department lookup
                 "date": event.Date
-            })
-
-        # Process sub-events similarly
-        for sub_event in sub_events:
-            status = determine_status(sub_event.Date)
-            grouped_events[status].append({
+            } for event in events_by_status[status]]
+            items += [{
                 "id": sub_event.Sub_Event_ID,
                 "event_name": sub_event.Name,
-                "status": status,  # Status based on sub-event date
-                "type": sub_event.event_type.Event_Type_Name,  # Name from EventType model
-                "department": sub_event.department.Name,  # Name from Department model
+                "status": status,
+                "type": reference_cache.get_name('event_type', sub_event.Event_Type_ID),
+                "department": reference_cache.get_name('department', sub_event.Dept_ID),
                 "date": sub_event.Date
-            })
+            } for sub_event in sub_events_by_status[status]]
+
+            if limit is not None:
+                # Both lists are capped separately; keep the first `limit` of the merged bucket
+                items.sort(key=lambda item: item["date"], reverse=(status == 'Completed'))
+                items = items[:limit]
+            if items:
+                grouped_events[status] = items
 
-        # Convert defaultdict to regular dict for clean return
-        return dict(grouped_events)
+        return grouped_events
 
     except SQLAlchemyError as e:
         print("Error fetching events:", e)
@@ -490,67 +465,71 @@ def create_transaction(user_id, event_id):
                     'Date': transaction_date,  # Use the date from the form
                 }
 
-            # Create the transaction entry in the database
-            transaction_entry = create_entry(Transaction, **transaction_data)
+            # Create the transaction, its items, the event summary update and its notifications in one DB transaction
+            try:
+                transaction_entry = Transaction(**transaction_data)
+                db.session.add(transaction_entry)
+                db.session.flush()  # Assigns Transaction_ID for the items
+
+                # Add the items to the TransactionItem table
+                for item in items:
+                    item_data = {
+                        'Transaction_ID': transaction_entry.Transaction_ID,  # Reference the created transaction
+                        'Description': item['description'],
+                        'Amount': item['amount']
+                    }
+                    db.session.add(TransactionItem(**item_data))
+
+                # Add the new items to the event's running totals
+                apply_summary_delta(
+                    get_summary_key(transaction_entry),
+                    sum(float(item['amount']) for item in items),
+                    len(items)
+                )
 
-            if transaction_entry:
-                try:
-                    # Add the items to the TransactionItem table
-                    for item in items:
-                        item_data = {
-                            'Transaction_ID': transaction_entry.Transaction_ID,  # Reference the created transaction
-                            'Description': item['description'],
-                            'Amount': item['amount']
-                        }
-                        create_entry(TransactionItem, **item_data)  # Add each item to the TransactionItem table
-                    
-                    # Commit both transaction and items to the database
-                    db.session.commit()
-                    flash('Transaction and items created successfully.', 'success')
-                    
-                    # Create notification for finance manager
-                    event = Event.query.get(event_id)
-                    if event and event.Finance_Manager:
-                        total_amount = sum(item['amount'] for item in items)
-                        nature = TransactionNature.query.get(transaction_nature)
-                        nature_name = nature.Nature_Name if nature else 'Unknown'
-                        create_notification(
-                            user_id=event.Finance_Manager,
-                            title='New Transaction Created',
-                            message=f'Event Manager created a new {nature_name} transaction for ₹{total_amount:,.2f} in event "{event.Name}"',
-                            notification_type='info',
-                            event_id=event_id,
-                            transaction_id=transaction_entry.Transaction_ID
-                        )
-                        
-                        # Check for large transactions
-                        from app.modules.budget_monitor import notify_large_transaction
-                        notify_large_transaction(
-                            user_id=user_id,
-                            transaction_id=transaction_entry.Transaction_ID,
-                            amount=total_amount,
-                            event_id=event_id
-                        )
-                    
-                    # Check budget thresholds
-                    from app.modules.budget_monitor import check_budget_thresholds
-                    check_budget_thresholds(event_id)
-                    
-                    # Log activity
-                    log_activity(
+                # Create notification for finance manager
+                total_amount = sum(item['amount'] for item in items)
+                event = Event.query.get(transaction_entry.Event_ID)
+                if event and event.Finance_Manager:
+                    nature_name = reference_cache.get_name('nature', transaction_nature, 'Unknown')
+                    create_notification(
+                        user_id=event.Finance_Manager,
+                        title='New Transaction Created',
+                        message=f'Event Manager created a new {nature_name} transaction for ₹{total_amount:,.2f} in event "{event.Name}"',
+                        notification_type='info',
+                        event_id=event.Event_ID,
+                        transaction_id=transaction_entry.Transaction_ID
+                    )
+
+                    # Check for large transactions
+                    notify_large_transaction(
                         user_id=user_id,
-                        action='created',
-                        entity_type='Transaction',
-                        entity_id=transaction_entry.Transaction_ID,
-                        description=f'Created transaction {bill_no} for ₹{sum(item["amount"] for item in items):,.2f}'
+                        transaction_id=transaction_entry.Transaction_ID,
+                        amount=total_amount,
+                        event_id=event.Event_ID
                     )
 
-                except SQLAlchemyError as e:
-                    # If an error happens while adding items, rollback changes
-                    db.session.rollback()
-                    flash("An error occurred while adding transaction items.", "danger")
-                    print(f"Error adding items: {e}")
+                # Check budget thresholds
+                check_budget_thresholds(transaction_entry.Event_ID, commit=False)
+
+                # Commit transaction, items, summary and notifications together
+                db.session.commit()
+            except SQLAlchemyError as e:
+                db.session.rollback()
+                transaction_entry = None
+                print(f"Error creating transaction: {e}")
+
+            if transaction_entry:
+                flash('Transaction and items created successfully.', 'success')
 
+                # Log activity
+                log_activity(
+                    user_id=user_id,
+                    action='created',
+                    entity_type='Transaction',
+                    entity_id=transaction_entry.Transaction_ID,
+                    description=f'Created transaction {bill_no} for ₹{total_amount:,.2f}'
+                )
             else:
                 flash('Failed to create transaction.', "danger")
 
@@ -558,9 +537,9 @@ def create_transaction(user_id, event_id):
             return redirect(url_for('event_manager.event_details', event_id=event_id, user_id=user_id))
 
         # Fetch data for the form
-        transaction_natures = db.session.query(TransactionNature).all()
-        payment_modes = db.session.query(PaymentMode).all()
-        transaction_categories = db.session.query(TransactionCategory).all()
+        transaction_natures = reference_cache.get_rows('nature')
+        payment_modes = reference_cache.get_rows('mode')
+        transaction_categories = reference_cache.get_rows('category')
 
         return render_template(
             'event_manager/transaction_form.html',
@@ -579,48 +558,78 @@ def create_transaction(user_id, event_id):
         return redirect(url_for('event_manager.event_details', event_id=event_id, user_id=user_id))
 
 
+# Bulk import of transactions from a CSV/XLSX file (one row per item)
+@event_manager_bp.route('/import_transactions/<int:event_id>', methods=['GET', 'POST'])
+def import_transactions(user_id, event_id):
+    report = None
+    if request.method == 'POST':
+        upload = request.files.get('file')
+        if not upload or not upload.filename:
+            flash("Choose a CSV or XLSX file to import.", "danger")
+            return redirect(url_for('event_manager.import_transactions', user_id=user_id, event_id=event_id))
+
+        try:
+            rows = transaction_import.iter_rows(upload.stream, upload.filename)
+        except transaction_import.ImportFileError as e:
+            flash(str(e), "danger")
+            return redirect(url_for('event_manager.import_transactions', user_id=user_id, event_id=event_id))
+
+        report = transaction_import.import_transactions(
+            user_id, event_id, rows, dry_run=request.form.get('dry_run') == '1'
+        )
+        if request.accept_mimetypes.best == 'application/json':
+            return jsonify(report), (200 if report['ok'] else 400)
+
+        if report['committed']:
+            flash(f"Imported {report['transactions']} transactions ({report['items']} items) for ₹{report['total']:,.2f}.", "success")
+        elif report['ok']:
+            flash(f"File is valid: {report['transactions']} transactions ({report['items']} items) would be imported.", "success")
+        else:
+            flash("Nothing was imported. Fix the rows below and upload the file again.", "danger")
+
+    return render_template('event_manager/import_transactions.html', user_id=user_id, event_id=event_id,
+                           report=report, columns=transaction_import.REQUIRED_COLUMNS)
+
+
 @event_manager_bp.route('/event_transactions/<int:event_id>', methods=['GET'])
+@read_only
 def view_all_transactions(user_id, event_id):
+    transaction_data = []
+    older_cursor = newer_cursor = None
+    page_size = get_page_size(request.args)
     try:
         # Fetch the Event or SubEvent based on the user ID
         event = db.session.query(Event).filter_by(Event_ID=event_id, Event_Manager=user_id).first()
-        transactions = []
 
         if event:
-            transactions = (
-                db.session.query(Transaction)
-                .filter_by(Event_ID=event_id)
-                .order_by(Transaction.Date.desc())
-                .all()
-            )
+            query = transactions_with_totals(with_items=True).filter(Transaction.Event_ID == event_id)
         else:
             sub_event = db.session.query(SubEvent).filter_by(Sub_Event_ID=event_id, Sub_Event_Manager=user_id).first()
 
             if sub_event:
                 parent_event_id = sub_event.Event_ID
-                transactions = (
-                    db.session.query(Transaction)
-                    .filter(
-                        (Transaction.Event_ID == parent_event_id) |
-                        (Transaction.Sub_Event_ID == event_id)
-                    )
-                    .order_by(Transaction.Date.desc())
-                    .all()
+                query = transactions_with_totals(with_items=True).filter(
+                    (Transaction.Event_ID == parent_event_id) |
+                    (Transaction.Sub_Event_ID == event_id)
                 )
             else:
                 flash("Event or Sub-Event not found or you don't have permission to access it.", "danger")
                 return redirect(url_for('event_manager.view_events', user_id=user_id))
 
-        transaction_data = []
-        for transaction in transactions:
-            # Fetch related transaction items using the relationship defined in the model
-            transaction_items = transaction.items  # Use the backref 'items' from the relationship
-
-            # If no items are found, set the transaction_items to an empty list
-            if not transaction_items:
-                transaction_items = []
+        # Fetch one page, newest first
+        transactions, has_older, has_newer = keyset_page(
+            query, Transaction.Date, Transaction.Transaction_ID, page_size,
+            after=request.args.get('after'), before=request.args.get('before')
+        )
+        if transactions:
+            first, last = transactions[0][0], transactions[-1][0]
+            older_cursor = format_cursor(last.Date, last.Transaction_ID) if has_older else None
+            newer_cursor = format_cursor(first.Date, first.Transaction_ID) if has_newer else None
 
-            total_amount = sum(item.Amount for item in transaction_items)
+        for transaction, total_amount in transactions:
+            # Items were eager-loaded with the transactions
+            transaction_items = transaction.items or []
+            total_amount = float(total_amount or 0)
 
             # Create a dictionary for each transaction with its associated items
             transaction_data.append({
@@ -629,9 +638,9 @@ def view_all_transactions(user_id, event_id):
                 "party_name": transaction.Party_Name,
                 "amount": total_amount,
                 "date": transaction.Date,
-                "nature": transaction.transaction_nature.Nature_Name,
-                "payment_mode": transaction.payment_mode.Mode_Name,
-                "category": transaction.transaction_category.Category_Name,
+                "nature": reference_cache.get_name('nature', transaction.Nature_ID),
+                "payment_mode": reference_cache.get_name('mode', transaction.Mode_ID),
+                "category": reference_cache.get_name('category', transaction.Transaction_Category_ID),
                 "transaction_items": transaction_items  # Pass transaction items to template
             })
 
@@ -641,16 +650,19 @@ def view_all_transactions(user_id, event_id):
     finally:
         # Ensure that the session is closed even if an error occurs
         db.session.close()
-    print(transaction_data)
     return render_template(
         'event_manager/all_transactions.html',
         transactions=transaction_data,  # Pass processed transaction data
+        older_cursor=older_cursor,
+        newer_cursor=newer_cursor,
+        page_size=page_size,
         event_id=event_id,
         user_id=user_id
     )
 
 
 @event_manager_bp.route('/view_transaction/<int:transaction_id>', methods=['GET'])
+@read_only
 def view_individual_transaction(user_id,transaction_id):
     try:
         # Fetch the transaction details
@@ -668,9 +680,9 @@ def view_individual_transaction(user_id,transaction_id):
             'party_name': transaction.Party_Name,
             'amount': total_amount,
             'date': transaction.Date,
-            'nature': transaction.transaction_nature.Nature_Name,
-            'payment_mode': transaction.payment_mode.Mode_Name,
-            'category': transaction.transaction_category.Category_Name
+            'nature': reference_cache.get_name('nature', transaction.Nature_ID),
+            'payment_mode': reference_cache.get_name('mode', transaction.Mode_ID),
+            'category': reference_cache.get_name('category', transaction.Transaction_Category_ID)
         }
         item_data = [{'description': item.Description, 'amount': item.Amount} for item in items]
 
@@ -687,6 +699,9 @@ def edit_transaction(user_id, transaction_id):
         transaction = Transaction.query.get_or_404(transaction_id)
         
         if request.method == 'POST':
+            # Capture what the transaction contributes to the event summary before changing it
+            old_contribution = get_transaction_contribution(transaction)
+
             # Update transaction data
             transaction.Bill_No = request.form.get('bill_no')
             transaction.Party_Name = request.form.get('party_name')
@@ -719,11 +734,16 @@ def edit_transaction(user_id, transaction_id):
                             'Description': item['description'],
                             'Amount': item['amount']
                         }
-                        create_entry(TransactionItem, **item_data)
+                        db.session.add(TransactionItem(**item_data))
+                    transaction.modified_date = func.current_timestamp()  # Even when only the items changed
                     
-                    # Commit changes
-                    db.session.commit()
-                    flash('Transaction updated successfully.', 'success')
+                    # Move the transaction's contribution in the event summary to its new key and total
+                    apply_contribution(old_contribution, sign=-1)
+                    apply_summary_delta(
+                        get_summary_key(transaction),
+                        sum(float(item['amount']) for item in items),
+                        len(items)
+                    )
                     
                     # Create notification for finance manager
                     event = Event.query.get(transaction.Event_ID)
@@ -739,8 +759,11 @@ def edit_transaction(user_id, transaction_id):
                         )
                     
                     # Check budget thresholds after update
-                    from app.modules.budget_monitor import check_budget_thresholds
-                    check_budget_thresholds(transaction.Event_ID)
+                    check_budget_thresholds(transaction.Event_ID, commit=False)
+                    
+                    # Commit transaction, items, summary and notifications together
+                    db.session.commit()
+                    flash('Transaction updated successfully.', 'success')
                     
                     # Log activity
                     log_activity(
@@ -755,7 +778,7 @@ def edit_transaction(user_id, transaction_id):
                     event_id = transaction.Event_ID if transaction.Event_ID else transaction.Sub_Event_ID
                     return redirect(url_for('event_manager.event_details', event_id=event_id, user_id=user_id))
                     
-                except (json.JSONDecodeError, SQLAlchemyError) as e:
+                except (json.JSONDecodeError, SQLAlchemyError, KeyError, ValueError) as e:
                     db.session.rollback()
                     flash("Error updating transaction.", "danger")
                     print(f"Error: {e}")
@@ -763,9 +786,9 @@ def edit_transaction(user_id, transaction_id):
                 flash("No items added to the transaction.", "danger")
         
         # GET request - show form with existing data
-        transaction_natures = db.session.query(TransactionNature).all()
-        payment_modes = db.session.query(PaymentMode).all()
-        transaction_categories = db.session.query(TransactionCategory).all()
+        transaction_natures = reference_cache.get_rows('nature')
+        payment_modes = reference_cache.get_rows('mode')
+        transaction_categories = reference_cache.get_rows('category')
         
         return render_template(
             'event_manager/transaction_form.html',
@@ -787,7 +810,13 @@ def edit_transaction(user_id, transaction_id):
 def delete_transaction_item(user_id, item_id):
     item = TransactionItem.query.get_or_404(item_id)
     try:
+        # Remove the item from the event summary in the same DB transaction
+        apply_summary_delta(get_summary_key(item.transaction), -(item.Amount or 0), -1)
+        # Items have no modified_date: touch the transaction so cached reports see the change
+        item.transaction.modified_date = func.current_timestamp()
+        event_id = item.transaction.Event_ID
         db.session.delete(item)
+        check_budget_thresholds(event_id, commit=False)
         db.session.commit()
         flash('Transaction item deleted successfully', 'success')
     except Exception as e:
@@ -800,11 +829,16 @@ def delete_transaction_item(user_id, item_id):
 def edit_transaction_item(user_id, item_id):
     item = TransactionItem.query.get_or_404(item_id)
     description = request.form['description']
-    amount = request.form['amount']
     
     try:
+        amount = Decimal(request.form['amount'])
+        # Apply the amount change to the event summary in the same DB transaction
+        apply_summary_delta(get_summary_key(item.transaction), amount - (item.Amount or 0))
         item.Description = description
         item.Amount = amount
+        # Touch the transaction as well: a description-only edit changes no other fingerprinted column
+        item.transaction.modified_date = func.current_timestamp()
+        check_budget_thresholds(item.transaction.Event_ID, commit=False)
         db.session.commit()
         flash('Transaction item updated successfully', 'success')
     except Exception as e:
@@ -872,6 +906,7 @@ def edit_event_manager_profile(user_id):
                 )
             
             db.session.commit()
+            fragment_cache.publish('users', user_id=user_id)
             
             changes = []
             if old_username != username:
@@ -900,15 +935,25 @@ def edit_event_manager_profile(user_id):
 
 
 @event_manager_bp.route('/notifications')
+@read_only
 def notifications(user_id):
     """Display notifications for event manager"""
     try:
-        # Get all notifications for this user, ordered by most recent
-        notifications_list = Notification.query.filter_by(User_ID=user_id).order_by(Notification.Created_At.desc()).all()
-        unread_count = Notification.query.filter_by(User_ID=user_id, Is_Read=False).count()
+        # One page of this user's notifications, most recent first, filtered in SQL
+        page_size = get_page_size(request.args)
+        filters = {'type': request.args.get('type'), 'status': request.args.get('status')}
+        page = get_notification_page(
+            user_id, page_size, after=request.args.get('after'), before=request.args.get('before'),
+            notification_type=filters['type'], status=filters['status']
+        )
+        unread_count = get_unread_notification_count(user_id)
         
         return render_template('event_manager/notifications.html', 
-                             notifications=notifications_list,
+                             notifications=page['rows'],
+                             older_cursor=page['older_cursor'],
+                             newer_cursor=page['newer_cursor'],
+                             page_size=page_size,
+                             filters={k: v for k, v in filters.items() if v},
                              unread_count=unread_count,
                              user_id=user_id)
     except Exception as e:
@@ -1,32 +1,29 @@
-from flask import Blueprint, render_template, redirect, request, flash, url_for, get_flashed_messages, session, send_file, make_response
+from flask import Blueprint, render_template, redirect, request, flash, url_for, get_flashed_messages, session, send_file, make_response, jsonify
 from .modules.models import Transaction, TransactionNature, PaymentMode, TransactionCategory, AccountCategory
 from app import db
 from .modules.models import *
 from .modules.db_queries import *
-from .modules.activity_logger import log_activity, create_notification
+from .modules.activity_logger import log_activity, create_notification, get_unread_notification_count, get_notification_page
 from .auth import login_required
+from .db_routing import read_only
 from sqlalchemy.orm import joinedload, validates
 from sqlalchemy.exc import SQLAlchemyError
 from collections import defaultdict
 from sqlalchemy import func
-import matplotlib.pyplot as plt
-from io import BytesIO
-import base64
-import plotly.graph_objects as go
-import plotly.express as px
 from datetime import datetime, date
 from werkzeug.security import generate_password_hash, check_password_hash
 from .modules.transaction_utils import *
-import openpyxl
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from openpyxl.utils import get_column_letter
-from xhtml2pdf import pisa
-from jinja2 import Template
-import tempfile
+from .modules.financial_snapshot import get_event_snapshot
+from .modules import reference_cache, fragment_cache
+from .modules.event_status import fetch_by_status
+from .modules.pagination import get_page_size
+from .modules.report_jobs import REPORT_FORMATS, enqueue_report, get_report_job
 import os
 
 finance_manager_bp = Blueprint('finance_manager', __name__, url_prefix='/finmng/<int:user_id>')
 
+DASHBOARD_EVENT_CARDS = 3  # Event cards per status on the dashboard
+
 @finance_manager_bp.before_request
 def check_finance_manager_access():
     """Check if user is logged in before accessing any finance manager route."""
@@ -40,41 +37,37 @@ def check_finance_manager_access():
         return redirect(url_for('home.index'))
 
 @finance_manager_bp.route('/')
+@read_only
 def finance_manager(user_id):
-    events = get_events(user_id)
+    # Event cards are cached per user until an admin changes events or users
+    events_html = fragment_cache.get_or_render('events', ('Finance Manager', user_id), lambda: render_event_cards(user_id))
     user = User.query.get(user_id)
-    return render_template('finance_manager/financemanager_dashboard.html', events=events, user=user, user_id=user_id)
+    return render_template('finance_manager/financemanager_dashboard.html', events_html=events_html, user=user, user_id=user_id)
+
+def render_event_cards(user_id):
+    """Dashboard event cards of a finance manager ('' when no events are assigned)"""
+    events = get_events(user_id, limit=DASHBOARD_EVENT_CARDS + 1)  # One extra shows the "View All" card
+    if not events:
+        return ''
+    return fragment_cache.render_macro('finance_manager/event_cards.html', 'render_event_cards_finance_manager',
+                                       events, None, minimum_cards=True, user_id=user_id)
 
 @finance_manager_bp.route('/view_events')
+@read_only
 def view_events(user_id):
     events = get_events(user_id)
     return render_template('finance_manager/view_events.html', events=events, user_id=user_id)    
 
 @finance_manager_bp.route('/event_details/<int:event_id>')
+@read_only
 def event_details(user_id, event_id):
     try:
-        # Fetch transaction IDs for the given event
-        transaction_ids = get_transaction_ids(event_id)
-        print(transaction_ids)
-
-        # Ensure transaction_ids is a list
-        if not transaction_ids:
-            transaction_ids = []
-
-        # Calculate revenue and expenses
-        revenue = get_revenue_total(event_id)
-        expenses = get_expense_total(event_id)
-
-        # Fetch category and mode totals with names
-        category_totals = {}
-        for category_id in get_all_transaction_category_ids():
-            category_name = get_category_name(category_id)  # Fetch the name for the category ID
-            category_totals[category_name] = get_category_total(event_id, category_id)
-
-        mode_totals = {}
-        for mode_id in get_all_payment_mode_ids():
-            mode_name = get_mode_name(mode_id)  # Fetch the name for the mode ID
-            mode_totals[mode_name] = get_mode_total(event_id, mode_id)
+        # Revenue, expenses, category and mode totals from the event snapshot
+        snapshot = get_event_snapshot(event_id)
+        revenue = snapshot.revenue
+        expenses = snapshot.expense
+        category_totals = snapshot.category_totals
+        mode_totals = snapshot.mode_totals
 
         # Fetch event details for the selected event (name, date, etc.)
         event_details = get_event_details(event_id)
@@ -98,56 +91,35 @@ def event_details(user_id, event_id):
 
 
 # Fetch Events Helper Function
-def get_events(user_id):
+def get_events(user_id, limit=None):
+    """Events of a finance manager grouped by status (computed in SQL); limit caps each status"""
     try:
-        # Fetch events for the finance manager
-        events = (
-            db.session.query(Event)
-            .filter(Event.Finance_Manager == user_id)
-            .options(
-                joinedload(Event.department),
-                joinedload(Event.event_type),
-                joinedload(Event.finance_manager)
-            )
-            .all()
-        )
-
-        # Group events by their status
-        grouped_events = defaultdict(list)
-        for event in events:
-            status = determine_status(event.Date)
-            grouped_events[status].append({
-                "id": event.Event_ID,
-                "event_name": event.Name,
-                "status": status,
-                "type": event.event_type.Event_Type_Name,
-                "department": event.department.Name,
-                "date": event.Date
-            })
-
-        return dict(grouped_events)
+        query = db.session.query(Event).filter(Event.Finance_Manager == user_id)
+        grouped_events = {}
+        for status, events in fetch_by_status(query, Event, limit=limit).items():
+            if events:
+                grouped_events[status] = [{
+                    "id": event.Event_ID,
+                    "event_name": event.Name,
+                    "status": status,
+                    "type": reference_cache.get_name('event_type', event.Event_Type_ID),
+                    "department": reference_cache.get_name('department', event.Dept_ID),
+                    "date": event.Date
+                } for event in events]
+
+        return grouped_events
 
     except SQLAlchemyError as e:
         print("Error fetching events:", e)
         return {}
 
-# Helper Function: Determine Event Status
-def determine_status(event_date):
-    today = date.today()
-    if event_date > today:
-        return "Upcoming"
-    elif event_date == today:
-        return "Ongoing"
-    else:
-        return "Completed"
-
 def get_event_details(event_id):
     """Fetch details of an event based on Event ID."""
     event = Event.query.filter_by(Event_ID=event_id).first()
     if event:
         # Fetch related department and event type names from their respective models
-        department_name = event.department.Name if event.department else "Unknown Department"
-        event_type_name = event.event_type.Event_Type_Name if event.event_type else "Unknown Event Type"
+        department_name = reference_cache.get_name('department', event.Dept_ID, "Unknown Department")
+        event_type_name = reference_cache.get_name('event_type', event.Event_Type_ID, "Unknown Event Type")
         
         # Fetch finance and event managers' names
         finance_manager_name = event.finance_manager.Username if event.finance_manager else "No Finance Manager"
@@ -167,6 +139,7 @@ def get_event_details(event_id):
 
 
 @finance_manager_bp.route('/event_visualization/<int:event_id>')
+@read_only
 def event_visualization(user_id, event_id):
     try:
         event = Event.query.get(event_id)
@@ -176,55 +149,25 @@ def event_visualization(user_id, event_id):
         
         event_name = event.Name
         
-        # Fetch revenue and expense data
-        revenue = get_revenue_total(event_id)
-        expense = get_expense_total(event_id)
-        profit_loss = revenue - expense
-
-        # Fetch budget information
-        budget = Budget.query.filter_by(Event_ID=event_id).first()
-        budget_amount = float(budget.Amount) if budget else 0
-        budget_remaining = budget_amount - expense
-        budget_utilization = (expense / budget_amount * 100) if budget_amount > 0 else 0
+        # Revenue, expense, budget and breakdowns from the event snapshot
+        snapshot = get_event_snapshot(event_id)
+        revenue = snapshot.revenue
+        expense = snapshot.expense
+        profit_loss = snapshot.profit_loss
 
-        # Fetch category totals
-        categories = get_all_transaction_category_ids()
-        category_totals = []
-        for category_id in categories:
-            category_total = get_category_total(event_id, category_id)
-            if category_total > 0:
-                category_name = get_category_name(category_id)
-                category_totals.append({'name': category_name, 'total': category_total})
+        budget_amount = snapshot.budget_amount
+        budget_remaining = snapshot.budget_remaining
+        budget_utilization = snapshot.budget_utilization
 
-        # Fetch mode totals
-        modes = get_all_payment_mode_ids()
-        mode_totals = []
-        for mode_id in modes:
-            mode_total = get_mode_total(event_id, mode_id)
-            if mode_total > 0:
-                mode_name = get_mode_name(mode_id)
-                mode_totals.append({'name': mode_name, 'total': mode_total})
+        category_totals = snapshot.category_breakdown
+        mode_totals = snapshot.mode_breakdown
 
-        # Fetch revenue and expense breakdown by nature
-        revenue_transactions = Transaction.query.filter_by(Event_ID=event_id).join(TransactionNature).filter(
-            TransactionNature.Nature_Name == 'Credit'
-        ).all()
-        
-        expense_transactions = Transaction.query.filter_by(Event_ID=event_id).join(TransactionNature).filter(
-            TransactionNature.Nature_Name == 'Debit'
-        ).all()
+        revenue_by_category = snapshot.revenue_by_category
+        expense_by_category = snapshot.expense_by_category
 
-        # Revenue breakdown by category
-        revenue_by_category = {}
-        for txn in revenue_transactions:
-            cat_name = txn.transaction_category.Category_Name if txn.transaction_category else 'Uncategorized'
-            revenue_by_category[cat_name] = revenue_by_category.get(cat_name, 0) + float(txn.Amount)
-
-        # Expense breakdown by category
-        expense_by_category = {}
-        for txn in expense_transactions:
-            cat_name = txn.transaction_category.Category_Name if txn.transaction_category else 'Uncategorized'
-            expense_by_category[cat_name] = expense_by_category.get(cat_name, 0) + float(txn.Amount)
+        # Plotly is only needed here; importing it at module level slows down every worker start
+        import plotly.graph_objects as go
+        import plotly.express as px
 
         # ===== CHART 1: Revenue vs Expense Bar Chart =====
         revenue_expense_fig = go.Figure()
@@ -580,394 +523,97 @@ def get_event_name(event_id):
 
 @finance_manager_bp.route('/download_excel/<int:event_id>')
 def download_excel(user_id, event_id):
-    try:
-        event = Event.query.get(event_id)
-        if not event:
-            flash("Event not found.", "error")
-            return redirect(url_for('finance_manager.event_details', user_id=user_id, event_id=event_id))
-        
-        # Create workbook
-        wb = openpyxl.Workbook()
-        
-        # Summary Sheet
-        ws_summary = wb.active
-        ws_summary.title = "Financial Summary"
-        
-        # Header styling
-        header_fill = PatternFill(start_color="667eea", end_color="667eea", fill_type="solid")
-        header_font = Font(bold=True, color="FFFFFF", size=14)
-        border = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
-        )
-        
-        # Event details
-        ws_summary['A1'] = "Event Financial Report"
-        ws_summary['A1'].font = Font(bold=True, size=16)
-        ws_summary['A2'] = f"Event: {event.Name}"
-        ws_summary['A3'] = f"Date: {event.Date.strftime('%B %d, %Y') if event.Date else 'N/A'}"
-        ws_summary['A4'] = f"Department: {event.department.Name if event.department else 'N/A'}"
-        ws_summary['A5'] = f"Generated: {datetime.now().strftime('%B %d, %Y %I:%M %p')}"
-        
-        # Financial summary
-        revenue = get_revenue_total(event_id)
-        expense = get_expense_total(event_id)
-        profit_loss = revenue - expense
-        
-        budget = Budget.query.filter_by(Event_ID=event_id).first()
-        budget_amount = float(budget.Amount) if budget else 0
-        
-        ws_summary['A7'] = "Financial Metrics"
-        ws_summary['A7'].font = header_font
-        ws_summary['A7'].fill = header_fill
-        ws_summary['B7'].fill = header_fill
-        
-        ws_summary['A8'] = "Total Revenue"
-        ws_summary['B8'] = revenue
-        ws_summary['B8'].number_format = '₹#,##0.00'
-        
-        ws_summary['A9'] = "Total Expenses"
-        ws_summary['B9'] = expense
-        ws_summary['B9'].number_format = '₹#,##0.00'
-        
-        ws_summary['A10'] = "Net Profit/Loss"
-        ws_summary['B10'] = profit_loss
-        ws_summary['B10'].number_format = '₹#,##0.00'
-        
-        if budget_amount > 0:
-            ws_summary['A11'] = "Allocated Budget"
-            ws_summary['B11'] = budget_amount
-            ws_summary['B11'].number_format = '₹#,##0.00'
-            
-            ws_summary['A12'] = "Budget Remaining"
-            ws_summary['B12'] = budget_amount - expense
-            ws_summary['B12'].number_format = '₹#,##0.00'
-        
-        # Category breakdown
-        categories = get_all_transaction_category_ids()
-        row = 14
-        ws_summary[f'A{row}'] = "Category Breakdown"
-        ws_summary[f'A{row}'].font = header_font
-        ws_summary[f'A{row}'].fill = header_fill
-        ws_summary[f'B{row}'].fill = header_fill
-        
-        row += 1
-        for category_id in categories:
-            total = get_category_total(event_id, category_id)
-            if total > 0:
-                category_name = get_category_name(category_id)
-                ws_summary[f'A{row}'] = category_name
-                ws_summary[f'B{row}'] = total
-                ws_summary[f'B{row}'].number_format = '₹#,##0.00'
-                row += 1
-        
-        # Ledger Sheet
-        ws_ledger = wb.create_sheet("Transaction Ledger")
-        headers = ["Date", "Description", "Category", "Nature", "Payment Mode", "Amount"]
-        
-        for col, header in enumerate(headers, 1):
-            cell = ws_ledger.cell(row=1, column=col, value=header)
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = Alignment(horizontal='center')
-            cell.border = border
-        
-        # Fetch all transactions
-        transactions = Transaction.query.filter_by(Event_ID=event_id).order_by(Transaction.Date).all()
-        
-        for row, txn in enumerate(transactions, 2):
-            # Calculate total amount from transaction items
-            total_amount = sum(item.Amount for item in txn.items) if txn.items else 0
-            # Get first description or use party name
-            description = txn.items[0].Description if txn.items and txn.items[0].Description else (txn.Party_Name or '')
-            
-            ws_ledger.cell(row=row, column=1, value=txn.Date.strftime('%Y-%m-%d') if txn.Date else 'N/A')
-            ws_ledger.cell(row=row, column=2, value=description)
-            ws_ledger.cell(row=row, column=3, value=txn.transaction_category.Category_Name if txn.transaction_category else 'N/A')
-            ws_ledger.cell(row=row, column=4, value=txn.transaction_nature.Nature_Name if txn.transaction_nature else 'N/A')
-            ws_ledger.cell(row=row, column=5, value=txn.payment_mode.Mode_Name if txn.payment_mode else 'N/A')
-            
-            amount_cell = ws_ledger.cell(row=row, column=6, value=float(total_amount))
-            amount_cell.number_format = '₹#,##0.00'
-            
-            # Apply borders
-            for col in range(1, 7):
-                ws_ledger.cell(row=row, column=col).border = border
-        
-        # Auto-adjust column widths
-        for ws in [ws_summary, ws_ledger]:
-            for column in ws.columns:
-                max_length = 0
-                column_letter = get_column_letter(column[0].column)
-                for cell in column:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(cell.value)
-                    except:
-                        pass
-                adjusted_width = min(max_length + 2, 50)
-                ws.column_dimensions[column_letter].width = adjusted_width
-        
-        # Save to BytesIO
-        output = BytesIO()
-        wb.save(output)
-        output.seek(0)
-        
-        filename = f"{event.Name.replace(' ', '_')}_Financial_Report.xlsx"
-        
-        # Log activity
-        log_activity(
-            user_id=user_id,
-            action='generated',
-            entity_type='Report',
-            entity_id=event_id,
-            description=f'Finance Manager generated Excel report for event "{event.Name}"'
-        )
-        
-        # Notify Event Manager
-        if event.Event_Manager:
-            create_notification(
-                user_id=event.Event_Manager,
-                title='Financial Report Generated',
-                message=f'Finance Manager has generated an Excel report for event "{event.Name}"',
-                notification_type='info',
-                event_id=event_id
-            )
-        
-        return send_file(
-            output,
-            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-            as_attachment=True,
-            download_name=filename
-        )
-    
-    except Exception as e:
-        print(f"Error generating Excel: {e}")
-        import traceback
-        traceback.print_exc()
-        flash("Error generating Excel report.", "error")
-        return redirect(url_for('finance_manager.event_details', user_id=user_id, event_id=event_id))
+    return start_report_job(user_id, event_id, 'xlsx')
 
 @finance_manager_bp.route('/download_pdf/<int:event_id>')
 def download_pdf(user_id, event_id):
-    try:
-        event = Event.query.get(event_id)
-        if not event:
-            flash("Event not found.", "error")
-            return redirect(url_for('finance_manager.event_details', user_id=user_id, event_id=event_id))
-        
-        # Get financial data
-        revenue = get_revenue_total(event_id)
-        expense = get_expense_total(event_id)
-        profit_loss = revenue - expense
-        
-        budget = Budget.query.filter_by(Event_ID=event_id).first()
-        budget_amount = float(budget.Amount) if budget else 0
-        
-        # Category breakdown
-        categories = get_all_transaction_category_ids()
-        category_data = []
-        for category_id in categories:
-            total = get_category_total(event_id, category_id)
-            if total > 0:
-                category_data.append({
-                    'name': get_category_name(category_id),
-                    'total': total
-                })
-        
-        # Transactions with calculated amounts
-        transactions = Transaction.query.filter_by(Event_ID=event_id).order_by(Transaction.Date).all()
-        
-        # Prepare transaction data with amounts
-        transaction_data = []
-        for txn in transactions:
-            total_amount = sum(item.Amount for item in txn.items) if txn.items else 0
-            description = txn.items[0].Description if txn.items and txn.items[0].Description else (txn.Party_Name or '-')
-            transaction_data.append({
-                'date': txn.Date,
-                'description': description,
-                'category': txn.transaction_category.Category_Name if txn.transaction_category else 'N/A',
-                'nature': txn.transaction_nature.Nature_Name if txn.transaction_nature else 'N/A',
-                'amount': total_amount
-            })
-        
-        # HTML template for PDF
-        html_template = '''
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <style>
-                @page { size: A4; margin: 1cm; }
-                body { font-family: Arial, sans-serif; color: #333; }
-                .header { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 20px; text-align: center; margin-bottom: 20px; }
-                .header h1 { margin: 0; font-size: 24px; }
-                .header p { margin: 5px 0 0 0; font-size: 12px; }
-                .section { margin-bottom: 20px; }
-                .section h2 { color: #667eea; border-bottom: 2px solid #667eea; padding-bottom: 5px; }
-                table { width: 100%; border-collapse: collapse; margin-top: 10px; }
-                th { background: #667eea; color: white; padding: 10px; text-align: left; }
-                td { padding: 8px; border-bottom: 1px solid #ddd; }
-                tr:nth-child(even) { background: #f8fafc; }
-                .metric { display: inline-block; width: 48%; margin: 5px 0; }
-                .metric-label { font-weight: bold; color: #667eea; }
-                .metric-value { font-size: 18px; color: #2d3748; }
-                .footer { margin-top: 30px; text-align: center; font-size: 10px; color: #999; }
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <h1>Financial Report</h1>
-                <p>{{ event.Name }}</p>
-                <p>Generated on {{ now }}</p>
-            </div>
-            
-            <div class="section">
-                <h2>Event Information</h2>
-                <p><strong>Event Name:</strong> {{ event.Name }}</p>
-                <p><strong>Date:</strong> {{ event.Date.strftime('%B %d, %Y') if event.Date else 'N/A' }}</p>
-                <p><strong>Department:</strong> {{ event.department.Name if event.department else 'N/A' }}</p>
-                <p><strong>Event Type:</strong> {{ event.event_type.Event_Type_Name if event.event_type else 'N/A' }}</p>
-            </div>
-            
-            <div class="section">
-                <h2>Financial Summary</h2>
-                <div class="metric">
-                    <span class="metric-label">Total Revenue:</span>
-                    <span class="metric-value">₹{{ "{:,.2f}".format(revenue) }}</span>
-                </div>
-                <div class="metric">
-                    <span class="metric-label">Total Expenses:</span>
-                    <span class="metric-value">₹{{ "{:,.2f}".format(expense) }}</span>
-                </div>
-                <div class="metric">
-                    <span class="metric-label">Net Profit/Loss:</span>
-                    <span class="metric-value" style="color: {% if profit_loss >= 0 %}#10b981{% else %}#ef4444{% endif %}">₹{{ "{:,.2f}".format(profit_loss) }}</span>
-                </div>
-                {% if budget_amount > 0 %}
-                <div class="metric">
-                    <span class="metric-label">Allocated Budget:</span>
-                    <span class="metric-value">₹{{ "{:,.2f}".format(budget_amount) }}</span>
-                </div>
-                {% endif %}
-            </div>
-            
-            {% if category_data %}
-            <div class="section">
-                <h2>Category Breakdown</h2>
-                <table>
-                    <thead>
-                        <tr>
-                            <th>Category</th>
-                            <th style="text-align: right;">Amount</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-                        {% for cat in category_data %}
-                        <tr>
-                            <td>{{ cat.name }}</td>
-                            <td style="text-align: right;">₹{{ "{:,.2f}".format(cat.total) }}</td>
-                        </tr>
-                        {% endfor %}
-                    </tbody>
-                </table>
-            </div>
-            {% endif %}
-            
-            <div class="section">
-                <h2>Transaction Ledger</h2>
-                <table>
-                    <thead>
-                        <tr>
-                            <th>Date</th>
-                            <th>Description</th>
-                            <th>Category</th>
-                            <th>Nature</th>
-                            <th style="text-align: right;">Amount</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-                        {% for txn in transaction_data %}
-                        <tr>
-                            <td>{{ txn.date.strftime('%Y-%m-%d') if txn.date else 'N/A' }}</td>
-                            <td>{{ txn.description }}</td>
-                            <td>{{ txn.category }}</td>
-                            <td>{{ txn.nature }}</td>
-                            <td style="text-align: right;">₹{{ "{:,.2f}".format(txn.amount) }}</td>
-                        </tr>
-                        {% endfor %}
-                    </tbody>
-                </table>
-            </div>
-            
-            <div class="footer">
-                <p>This is a computer-generated report from FinSight - Event Financial Management System</p>
-            </div>
-        </body>
-        </html>
-        '''
-        
-        template = Template(html_template)
-        html_content = template.render(
-            event=event,
-            revenue=revenue,
-            expense=expense,
-            profit_loss=profit_loss,
-            budget_amount=budget_amount,
-            category_data=category_data,
-            transaction_data=transaction_data,
-            now=datetime.now().strftime('%B %d, %Y %I:%M %p')
-        )
-        
-        # Generate PDF using xhtml2pdf
-        pdf_file = BytesIO()
-        pisa_status = pisa.CreatePDF(
-            html_content,
-            dest=pdf_file
-        )
-        
-        if pisa_status.err:
-            raise Exception("Error generating PDF")
-        
-        pdf_file.seek(0)
-        filename = f"{event.Name.replace(' ', '_')}_Financial_Report.pdf"
-        
-        # Log activity
-        log_activity(
-            user_id=user_id,
-            action='generated',
-            entity_type='Report',
-            entity_id=event_id,
-            description=f'Finance Manager generated PDF report for event "{event.Name}"'
-        )
-        
-        # Notify Event Manager
-        if event.Event_Manager:
-            create_notification(
-                user_id=event.Event_Manager,
-                title='PDF Report Generated',
-                message=f'Finance Manager has generated a PDF report for event "{event.Name}"',
-                notification_type='info',
-                event_id=event_id
-            )
-        
-        return send_file(
-            pdf_file,
-            mimetype='application/pdf',
-            as_attachment=True,
-            download_name=filename
-        )
-    
-    except Exception as e:
-        print(f"Error generating PDF: {e}")
-        import traceback
-        traceback.print_exc()
-        flash("Error generating PDF report.", "error")
+    return start_report_job(user_id, event_id, 'pdf')
+
+def start_report_job(user_id, event_id, report_format):
+    """Queue a report for the event and send the user to the job status or download page."""
+    event = Event.query.get(event_id)
+    if not event:
+        flash("Event not found.", "error")
+        return redirect(url_for('finance_manager.event_details', user_id=user_id, event_id=event_id))
+
+    job = enqueue_report(event_id, user_id, report_format)
+    if not job:
+        flash("Error queuing report.", "error")
         return redirect(url_for('finance_manager.event_details', user_id=user_id, event_id=event_id))
 
+    # Served from the report cache (or built inline): download straight away
+    if job.Status == 'done':
+        return redirect(url_for('finance_manager.report_job_download', user_id=user_id, job_id=job.Job_ID))
+    return redirect(url_for('finance_manager.report_job_view', user_id=user_id, job_id=job.Job_ID))
+
+@finance_manager_bp.route('/reports/<int:event_id>/<report_format>', methods=['POST'])
+def enqueue_report_job(user_id, event_id, report_format):
+    """Queue an Excel or PDF report and return the job ID as JSON."""
+    if report_format not in REPORT_FORMATS:
+        return jsonify({'error': f'Unknown report format: {report_format}'}), 400
+    if not Event.query.get(event_id):
+        return jsonify({'error': 'Event not found'}), 404
+
+    job = enqueue_report(event_id, user_id, report_format)
+    if not job:
+        return jsonify({'error': 'Could not queue report'}), 500
+    return jsonify(report_job_data(user_id, job)), 202
+
+def report_job_data(user_id, job):
+    """Status payload for a report job."""
+    data = {
+        'job_id': job.Job_ID,
+        'event_id': job.Event_ID,
+        'format': job.Format,
+        'status': job.Status,
+        'progress': job.Progress,
+        'error': job.Error,
+        'status_url': url_for('finance_manager.report_job_status', user_id=user_id, job_id=job.Job_ID)
+    }
+    if job.Status == 'done':
+        data['download_url'] = url_for('finance_manager.report_job_download', user_id=user_id, job_id=job.Job_ID)
+    return data
+
+@finance_manager_bp.route('/reports/jobs/<int:job_id>')
+def report_job_status(user_id, job_id):
+    """Report job status and progress as JSON."""
+    job = get_report_job(job_id, user_id)
+    if not job:
+        return jsonify({'error': 'Report job not found'}), 404
+    return jsonify(report_job_data(user_id, job))
+
+@finance_manager_bp.route('/reports/jobs/<int:job_id>/view')
+def report_job_view(user_id, job_id):
+    """Page that polls a report job and offers the download when it is ready."""
+    job = get_report_job(job_id, user_id)
+    if not job:
+        flash("Report not found.", "error")
+        return redirect(url_for('finance_manager.view_events', user_id=user_id))
+    return render_template(
+        'finance_manager/report_job.html',
+        job=report_job_data(user_id, job),
+        event=Event.query.get(job.Event_ID),
+        label=REPORT_FORMATS[job.Format]['label'],
+        user_id=user_id
+    )
+
+@finance_manager_bp.route('/reports/jobs/<int:job_id>/download')
+def report_job_download(user_id, job_id):
+    """Serve a finished report from disk."""
+    job = get_report_job(job_id, user_id)
+    if not job or job.Status != 'done' or not job.File_Path or not os.path.exists(job.File_Path):
+        flash("Report is not available.", "error")
+        return redirect(url_for('finance_manager.view_events', user_id=user_id))
+
+    return send_file(
+        job.File_Path,
+        mimetype=REPORT_FORMATS[job.Format]['mimetype'],
+        as_attachment=True,
+        download_name=job.File_Name
+    )
+
 @finance_manager_bp.route('/ledger/<int:event_id>')
+@read_only
 def ledger_view(user_id, event_id):
     try:
         event = Event.query.get(event_id)
@@ -975,38 +621,23 @@ def ledger_view(user_id, event_id):
             flash("Event not found.", "error")
             return redirect(url_for('finance_manager.view_events', user_id=user_id))
         
-        # Fetch all transactions with related data
-        transactions = Transaction.query.filter_by(Event_ID=event_id).order_by(Transaction.Date.desc()).all()
-        
-        # Calculate running balance
-        running_balance = 0
-        ledger_entries = []
-        
-        for txn in reversed(transactions):
-            # Calculate total amount from transaction items
-            total_amount = sum(item.Amount for item in txn.items) if txn.items else 0
-            
-            if txn.transaction_nature and txn.transaction_nature.Nature_Name == 'Credit':
-                running_balance += float(total_amount)
-            else:
-                running_balance -= float(total_amount)
-            
-            ledger_entries.append({
-                'transaction': txn,
-                'balance': running_balance,
-                'amount': total_amount
-            })
-        
-        ledger_entries.reverse()
+        # One page of ledger rows with running balance, newest first
+        snapshot = get_event_snapshot(event_id)
+        page_size = get_page_size(request.args)
+        page = snapshot.ledger_page(page_size, after=request.args.get('after'), before=request.args.get('before'))
+        ledger_entries = page['rows']
         
         # Get totals
-        revenue = get_revenue_total(event_id)
-        expense = get_expense_total(event_id)
+        revenue = snapshot.revenue
+        expense = snapshot.expense
         
         return render_template(
             'finance_manager/ledger_view.html',
             event=event,
             ledger_entries=ledger_entries,
+            older_cursor=page['older_cursor'],
+            newer_cursor=page['newer_cursor'],
+            page_size=page_size,
             revenue=revenue,
             expense=expense,
             user_id=user_id
@@ -1082,6 +713,7 @@ def edit_finance_manager_profile(user_id):
                 )
             
             db.session.commit()
+            fragment_cache.publish('users', user_id=user_id)
             
             changes = []
             if old_username != username:
@@ -1110,15 +742,25 @@ def edit_finance_manager_profile(user_id):
 
 
 @finance_manager_bp.route('/notifications')
+@read_only
 def notifications(user_id):
     """Display notifications for finance manager"""
     try:
-        # Get all notifications for this user, ordered by most recent
-        notifications_list = Notification.query.filter_by(User_ID=user_id).order_by(Notification.Created_At.desc()).all()
-        unread_count = Notification.query.filter_by(User_ID=user_id, Is_Read=False).count()
+        # One page of this user's notifications, most recent first, filtered in SQL
+        page_size = get_page_size(request.args)
+        filters = {'type': request.args.get('type'), 'status': request.args.get('status')}
+        page = get_notification_page(
+            user_id, page_size, after=request.args.get('after'), before=request.args.get('before'),
+            notification_type=filters['type'], status=filters['status']
+        )
+        unread_count = get_unread_notification_count(user_id)
         
         return render_template('finance_manager/notifications.html', 
-                             notifications=notifications_list,
+                             notifications=page['rows'],
+                             older_cursor=page['older_cursor'],
+                             newer_cursor=page['newer_cursor'],
+                             page_size=page_size,
+                             filters={k: v for k, v in filters.items() if v},
                              unread_count=unread_count,
                              user_id=user_id)
     except Exception as e:
@@ -1,6 +1,7 @@
 from flask import render_template, Blueprint, request, redirect, url_for, session, flash
 from app.modules import validations
-from .modules.models import Department, Role, User
+from .modules.models import User
+from .modules import reference_cache, fragment_cache
 from .modules.db_queries import filter_data, create_entry, update_entry
 from sqlalchemy.exc import SQLAlchemyError
 from werkzeug.security import generate_password_hash, check_password_hash
@@ -47,7 +48,7 @@ def login():
             return render_template("home/login.html", errors=errors, email=email, password=password)
 
         # Check the role of the user
-        role = current_user.role.Role_Name  # Assuming the role is an object and has a 'Role_Name' attribute
+        role = reference_cache.get_name('role', current_user.Role)
 
         # Create session for authenticated user
         session['user_id'] = current_user.User_ID
@@ -163,8 +164,8 @@ def reset_password(user_id):
 @home_bp.route("/signup", methods=["GET", "POST"])
 def signup():
     # Fetch department and role data before processing POST or GET request
-    departments = filter_data(Department, columns=["Dept_ID", "Name"])
-    roles = filter_data(Role, columns=["Role_ID", "Role_Name"])
+    departments = reference_cache.get_rows('department')
+    roles = reference_cache.get_rows('role')
 
     # Initialize empty error messages dictionary
     error_messages = {
@@ -222,6 +223,7 @@ def signup():
 
         try:
             create_entry(User, **new_user)
+            fragment_cache.publish('users')  # New pending authorization
             return redirect(url_for('home.login'))  # Redirect to login page after successful signup
         except SQLAlchemyError:
             error_messages["general"] = "An error occurred while creating your account. Please try again."
@@ -3,15 +3,22 @@ Activity Logger Module
 Handles logging user activities and creating notifications
 """
 from app import db
-from .models import ActivityLog, Notification
-from flask import request
-from datetime import datetime
+from app.db_routing import RoutingSession
+from .models import ActivityLog, Notification, NotificationArchive, User
+from .pagination import keyset_page, format_cursor
+from . import audit_writer
+from flask import request, g, session, has_request_context
+from sqlalchemy import event, insert, select, case, func
+from datetime import datetime, timedelta
 
 
 def log_activity(user_id, action, entity_type, entity_id, description):
     """
     Log a user activity
     
+    The entry is handed to the background audit writer; with AUDIT_QUEUE_SIZE = 0
+    it is inserted and committed right away.
+    
     Args:
         user_id: ID of the user performing the action
         action: Type of action (created, updated, deleted, etc.)
@@ -21,19 +28,22 @@ def log_activity(user_id, action, entity_type, entity_id, description):
     """
     try:
         # Get IP address from request
-        ip_address = request.remote_addr if request else None
+        ip_address = request.remote_addr if has_request_context() else None
         
-        activity = ActivityLog(
-            User_ID=user_id,
-            Action=action,
-            Entity_Type=entity_type,
-            Entity_ID=entity_id,
-            Description=description,
-            IP_Address=ip_address,
-            Timestamp=datetime.now()
-        )
+        row = {
+            'User_ID': user_id,
+            'Action': action,
+            'Entity_Type': entity_type,
+            'Entity_ID': entity_id,
+            'Description': description,
+            'IP_Address': ip_address,
+            'Timestamp': datetime.now()
+        }
+        if audit_writer.is_enabled():
+            audit_writer.submit(row)
+            return True
         
-        db.session.add(activity)
+        db.session.add(ActivityLog(**row))
         db.session.commit()
         return True
     except Exception as e:
@@ -42,6 +52,71 @@ def log_activity(user_id, action, entity_type, entity_id, description):
         return False
 
 
+def _notification_row(user_id, title, message, notification_type='info', event_id=None, transaction_id=None):
+    return {
+        'User_ID': int(user_id),
+        'Title': title,
+        'Message': message,
+        'Type': notification_type,
+        'Is_Read': False,
+        'Created_At': datetime.now(),
+        'Related_Event_ID': event_id,
+        'Related_Transaction_ID': transaction_id,
+    }
+
+
+def create_notifications_bulk(notifications):
+    """
+    Insert several notifications with one multi-row INSERT in the current transaction
+
+    Does not commit: the rows (and the recipients' User.Unread_Notifications
+    counters) are committed or rolled back together with the caller's
+    business write.
+
+    Args:
+        notifications: List of dicts with the arguments of create_notification
+            (user_id, title, message, notification_type, event_id, transaction_id)
+
+    Returns:
+        int: Number of notifications inserted
+    """
+    rows = [_notification_row(**notification) for notification in notifications]
+    if rows:
+        db.session.execute(insert(Notification).values(rows))
+
+        # Keep the recipients' unread counters in the same transaction
+        counts = {}
+        for row in rows:
+            counts[row['User_ID']] = counts.get(row['User_ID'], 0) + 1
+        _adjust_unread_counts(counts)
+    return len(rows)
+
+
+def queue_notifications(notifications):
+    """
+    Queue notifications in the request's buffer
+
+    The buffer is inserted with create_notifications_bulk in the next commit
+    of the request, or committed at the end of the request; a rollback drops
+    it along with the write it belonged to. Outside a request
+    (report workers, CLI) the notifications are inserted and committed now.
+
+    Args:
+        notifications: List of dicts, as for create_notifications_bulk
+    """
+    if has_request_context():
+        g.setdefault('notification_buffer', []).extend(notifications)
+        return True
+    try:
+        create_notifications_bulk(notifications)
+        db.session.commit()
+        return True
+    except Exception as e:
+        print(f"Error creating notifications: {e}")
+        db.session.rollback()
+        return False
+
+
 def create_notification(user_id, title, message, notification_type='info', event_id=None, transaction_id=None):
     """
     Create a notification for a user
@@ -54,42 +129,164 @@ def create_notification(user_id, title, message, notification_type='info', event
         event_id: Optional related event ID
         transaction_id: Optional related transaction ID
     """
-    try:
-        notification = Notification(
-            User_ID=user_id,
-            Title=title,
-            Message=message,
-            Type=notification_type,
-            Is_Read=False,
-            Created_At=datetime.now(),
-            Related_Event_ID=event_id,
-            Related_Transaction_ID=transaction_id
-        )
-        
-        db.session.add(notification)
-        db.session.commit()
-        return True
-    except Exception as e:
-        print(f"Error creating notification: {e}")
-        db.session.rollback()
-        return False
+    return queue_notifications([{
+        'user_id': user_id,
+        'title': title,
+        'message': message,
+        'notification_type': notification_type,
+        'event_id': event_id,
+        'transaction_id': transaction_id,
+    }])
+
+
+@event.listens_for(RoutingSession, 'before_commit')
+def _flush_notification_buffer(session):
+    """Insert queued notifications in the transaction being committed"""
+    if has_request_context() and g.get('notification_buffer'):
+        notifications, g.notification_buffer = g.notification_buffer, []
+        create_notifications_bulk(notifications)
+
+
+@event.listens_for(RoutingSession, 'after_rollback')
+def _discard_notification_buffer(session):
+    """Drop queued notifications together with the transaction they belonged to"""
+    if has_request_context():
+        g.pop('notification_buffer', None)
+
+
+def _commit_notification_buffer(exc):
+    """Teardown: commit notifications queued after the request's last commit"""
+    if exc is not None:
+        g.pop('notification_buffer', None)
+        return
+    if g.get('notification_buffer'):
+        try:
+            db.session.commit()
+        except Exception as e:
+            print(f"Error creating notifications: {e}")
+            db.session.rollback()
+
+
+def init_app(app):
+    """Commit buffered notifications at the end of every request"""
+    app.teardown_request(_commit_notification_buffer)
+
+
+NOTIFICATION_TYPES = ('info', 'success', 'warning', 'danger')
+
+
+def get_notification_page(user_id, page_size, after=None, before=None, notification_type=None, status=None):
+    """
+    Fetch one page of a user's inbox, newest first
+
+    Pages by (Created_At, Notification_ID) cursors and filters in SQL, so the
+    cost does not grow with the user's notification history.
+
+    Args:
+        user_id: Owner of the notifications
+        page_size: Maximum number of notifications on the page
+        after, before: Cursors from a previous page (see keyset_page)
+        notification_type: Optional Type filter (info, success, warning, danger)
+        status: Optional 'unread' or 'read' filter
+
+    Returns:
+        dict: rows, older_cursor and newer_cursor
+    """
+    query = Notification.query.filter(Notification.User_ID == user_id)
+    if notification_type in NOTIFICATION_TYPES:
+        query = query.filter(Notification.Type == notification_type)
+    if status in ('unread', 'read'):
+        query = query.filter(Notification.Is_Read == (status == 'read'))
+
+    rows, has_older, has_newer = keyset_page(
+        query, Notification.Created_At, Notification.Notification_ID, page_size, after=after, before=before
+    )
+    return {
+        'rows': rows,
+        'older_cursor': format_cursor(rows[-1].Created_At, rows[-1].Notification_ID) if rows and has_older else None,
+        'newer_cursor': format_cursor(rows[0].Created_At, rows[0].Notification_ID) if rows and has_newer else None,
+    }
+
+
+def archive_read_notifications(days, batch_size=1000):
+    """
+    Move read notifications older than the given number of days to Notification_Archive
+
+    Works in batches of batch_size IDs, each copied and deleted in its own
+    transaction, so locks stay short however large the backlog is. Unread
+    notifications are never archived, so the unread counters are unaffected.
+
+    Args:
+        days: Retention in days
+        batch_size: Notifications moved per transaction
+
+    Returns:
+        int: Number of notifications archived
+    """
+    cutoff = datetime.now() - timedelta(days=days)
+    columns = [column.name for column in Notification.__table__.columns]
+    archived = 0
+    while True:
+        ids = [
+            row.Notification_ID for row in
+            db.session.query(Notification.Notification_ID)
+            .filter(Notification.Is_Read == True, Notification.Created_At < cutoff)
+            .order_by(Notification.Notification_ID)
+            .limit(batch_size)
+        ]
+        if not ids:
+            return archived
+        try:
+            db.session.execute(
+                insert(NotificationArchive).from_select(
+                    columns,
+                    select(*[Notification.__table__.c[name] for name in columns]).where(Notification.Notification_ID.in_(ids))
+                )
+            )
+            Notification.query.filter(Notification.Notification_ID.in_(ids)).delete(synchronize_session=False)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        archived += len(ids)
 
 
 def get_unread_notification_count(user_id):
-    """Get count of unread notifications for a user"""
+    """Get count of unread notifications for a user from the User.Unread_Notifications counter"""
     try:
-        return Notification.query.filter_by(User_ID=user_id, Is_Read=False).count()
+        user = db.session.get(User, int(user_id))  # Served from the identity map if the view loaded the user
+        return user.Unread_Notifications if user else 0
     except Exception as e:
         print(f"Error getting notification count: {e}")
         return 0
 
 
+def unread_notification_count(user_id=None):
+    """Template global for the header badges; defaults to the logged-in user"""
+    user_id = user_id or session.get('user_id')
+    return get_unread_notification_count(user_id) if user_id else 0
+
+
+def _adjust_unread_counts(counts):
+    """Add per-user deltas to User.Unread_Notifications with one UPDATE"""
+    counts = {user_id: delta for user_id, delta in counts.items() if delta}
+    if counts:
+        User.query.filter(User.User_ID.in_(counts)).update(
+            {'Unread_Notifications': User.Unread_Notifications + case(counts, value=User.User_ID, else_=0)},
+            synchronize_session=False
+        )
+
+
 def mark_notification_read(notification_id):
     """Mark a notification as read"""
     try:
         notification = Notification.query.get(notification_id)
         if notification:
-            notification.Is_Read = True
+            # Only the request that flips Is_Read decrements the counter
+            updated = Notification.query.filter_by(Notification_ID=notification_id, Is_Read=False).update(
+                {'Is_Read': True}, synchronize_session=False
+            )
+            _adjust_unread_counts({notification.User_ID: -updated})
             db.session.commit()
             return True
         return False
@@ -102,10 +299,34 @@ def mark_notification_read(notification_id):
 def mark_all_notifications_read(user_id):
     """Mark all notifications as read for a user"""
     try:
-        Notification.query.filter_by(User_ID=user_id, Is_Read=False).update({'Is_Read': True})
+        updated = Notification.query.filter_by(User_ID=user_id, Is_Read=False).update({'Is_Read': True})
+        _adjust_unread_counts({int(user_id): -updated})
         db.session.commit()
         return True
     except Exception as e:
         print(f"Error marking all notifications as read: {e}")
         db.session.rollback()
         return False
+
+
+def recount_unread_notifications():
+    """
+    Recompute every User.Unread_Notifications counter from the Notification table
+
+    Returns:
+        int: Number of users whose counter was wrong
+    """
+    unread = (
+        select(func.count(Notification.Notification_ID))
+        .where(Notification.User_ID == User.User_ID, Notification.Is_Read == False)
+        .scalar_subquery()
+    )
+    try:
+        corrected = User.query.filter(User.Unread_Notifications != unread).update(
+            {'Unread_Notifications': unread}, synchronize_session=False
+        )
+        db.session.commit()
+        return corrected
+    except Exception:
+        db.session.rollback()
+        raise
@@ -0,0 +1,46 @@
+"""
+Transaction Aggregation Module
+Computes event and sub-event totals from the materialized Event_Financial_Summary table
+"""
+from .financial_summary import get_summary_totals
+from sqlalchemy.exc import SQLAlchemyError
+
+
+def get_grouped_totals(event_id, is_sub_event=False):
+    """
+    Fetch item totals for an event or sub-event grouped by nature, category and mode
+
+    Reads the running totals kept in Event_Financial_Summary, so the cost
+    depends on the number of categories and modes, not on the number of
+    transactions.
+
+    Args:
+        event_id: ID of the event (or sub-event when is_sub_event is True)
+        is_sub_event: Filter on Sub_Event_ID instead of Event_ID
+
+    Returns:
+        list: Rows with Nature_ID, Transaction_Category_ID, Mode_ID and Total
+    """
+    try:
+        return get_summary_totals(event_id, is_sub_event)
+    except SQLAlchemyError as e:
+        print(f"Error aggregating transactions: {e}")
+        return []
+
+
+def sum_grouped_totals(grouped_totals, nature_id=None, category_id=None, mode_id=None):
+    """
+    Add up the grouped rows matching the given nature, category and mode
+
+    Any filter left as None matches every row.
+    """
+    total = 0
+    for row in grouped_totals:
+        if nature_id is not None and row.Nature_ID != nature_id:
+            continue
+        if category_id is not None and row.Transaction_Category_ID != category_id:
+            continue
+        if mode_id is not None and row.Mode_ID != mode_id:
+            continue
+        total += row.Total or 0
+    return total
@@ -0,0 +1,228 @@
+"""
+Audit Writer Module
+Writes Activity_Log rows from a background thread in batches, with a fallback file
+"""
+from .models import ActivityLog
+from sqlalchemy import insert
+from datetime import datetime
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+
+_stats = {
+    'queued': 0,
+    'written': 0,
+    'batches': 0,
+    'fallback_rows': 0,
+    'replayed': 0,
+}
+_lock = threading.Lock()
+_file_lock = threading.Lock()
+_queue = None
+_thread = None
+_pid = None
+_engine = None
+_settings = {}
+_STOP = object()
+
+
+def init_app(app):
+    """
+    Configure the writer; the thread starts on the first log entry in each process
+
+    AUDIT_QUEUE_SIZE = 0 disables the queue and log_activity writes synchronously.
+    """
+    _settings.update(
+        app=app,
+        queue_size=app.config.get('AUDIT_QUEUE_SIZE', 0),
+        batch_size=app.config.get('AUDIT_BATCH_SIZE', 200),
+        flush_interval=app.config.get('AUDIT_FLUSH_INTERVAL_MS', 500) / 1000,
+        enqueue_timeout=app.config.get('AUDIT_ENQUEUE_TIMEOUT_MS', 50) / 1000,
+        fallback_file=app.config.get('AUDIT_FALLBACK_FILE', ''),
+    )
+
+
+def is_enabled():
+    return _settings.get('queue_size', 0) > 0
+
+
+def _start():
+    """Start the writer thread (again after a fork, where threads do not survive)"""
+    global _queue, _thread, _pid, _engine
+    with _lock:
+        if _thread is not None and _pid == os.getpid() and _thread.is_alive():
+            return
+        app = _settings['app']
+        with app.app_context():
+            from app import db
+            _engine = db.engine
+        _queue = queue.Queue(maxsize=_settings['queue_size'])
+        _thread = threading.Thread(target=_run, name='audit-writer', daemon=True)
+        _pid = os.getpid()
+        _thread.start()
+
+
+def submit(row):
+    """
+    Hand an Activity_Log row to the writer thread
+
+    Blocks up to AUDIT_ENQUEUE_TIMEOUT_MS when the queue is full (backpressure),
+    then appends the row to AUDIT_FALLBACK_FILE for 'flask audit replay'.
+
+    Args:
+        row: Dict of ActivityLog column values
+    """
+    _start()
+    try:
+        _queue.put(row, timeout=_settings['enqueue_timeout'])
+    except queue.Full:
+        _write_fallback([row])
+        return
+    with _lock:
+        _stats['queued'] += 1
+
+
+def _run():
+    """Writer loop: insert a batch when it is full, AUDIT_FLUSH_INTERVAL_MS after its first row, or on shutdown"""
+    batch = []
+    deadline = None
+    stopping = False
+    while not stopping:
+        timeout = _settings['flush_interval'] if deadline is None else max(deadline - time.monotonic(), 0)
+        try:
+            item = _queue.get(timeout=timeout)
+        except queue.Empty:
+            item = None
+        if item is _STOP:
+            stopping = True
+        elif item is not None:
+            batch.append(item)
+            if deadline is None:
+                deadline = time.monotonic() + _settings['flush_interval']
+
+        if batch and (stopping or len(batch) >= _settings['batch_size'] or time.monotonic() >= deadline):
+            _write_batch(batch)
+            batch = []
+            deadline = None
+
+
+def _write_batch(rows):
+    try:
+        with _engine.begin() as connection:
+            connection.execute(insert(ActivityLog).values(rows))
+    except Exception as e:
+        print(f"⚠ Could not write {len(rows)} activity log entries, saving them to the fallback file: {e}")
+        _write_fallback(rows)
+        return
+    with _lock:
+        _stats['written'] += len(rows)
+        _stats['batches'] += 1
+
+
+def _write_fallback(rows):
+    """Append rows to the fallback file as JSON lines"""
+    path = _settings.get('fallback_file')
+    if not path:
+        print(f"✗ Dropped {len(rows)} activity log entries (no AUDIT_FALLBACK_FILE)")
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with _file_lock, open(path, 'a', encoding='utf-8') as file:
+        for row in rows:
+            file.write(json.dumps({**row, 'Timestamp': row['Timestamp'].isoformat()}) + '\n')
+    with _lock:
+        _stats['fallback_rows'] += len(rows)
+
+
+def shutdown(timeout=5):
+    """Write everything still queued; registered with atexit"""
+    global _thread
+    if _thread is None or _pid != os.getpid() or not _thread.is_alive():
+        return
+    try:
+        _queue.put(_STOP, timeout=timeout)
+    except queue.Full:
+        pass
+    _thread.join(timeout)
+    _thread = None
+
+    # Anything the thread could not take in time goes to the fallback file
+    leftover = []
+    while True:
+        try:
+            item = _queue.get_nowait()
+        except queue.Empty:
+            break
+        if item is not _STOP:
+            leftover.append(item)
+    if leftover:
+        _write_fallback(leftover)
+
+
+atexit.register(shutdown)
+
+
+def replay_fallback(engine, path=None, batch_size=None):
+    """
+    Insert the rows of the fallback file into Activity_Log
+
+    The file is renamed before reading, so entries appended meanwhile go to a
+    new file; it is deleted once every row has been written.
+
+    Args:
+        engine: SQLAlchemy engine (db.engine)
+        path: Fallback file (default AUDIT_FALLBACK_FILE)
+        batch_size: Rows per INSERT (default AUDIT_BATCH_SIZE)
+
+    Returns:
+        int: Number of rows replayed
+    """
+    path = path or _settings.get('fallback_file')
+    if not path:
+        return 0
+    batch_size = batch_size or _settings.get('batch_size', 200)
+    replaying = path + '.replaying'
+    if not os.path.exists(replaying):
+        if not os.path.exists(path):
+            return 0
+        with _file_lock:
+            os.replace(path, replaying)
+
+    rows = []
+    with open(replaying, 'r', encoding='utf-8') as file:
+        for line in file:
+            if line.strip():
+                row = json.loads(line)
+                row['Timestamp'] = datetime.fromisoformat(row['Timestamp'])
+                rows.append(row)
+
+    # One transaction, so a failed replay can simply be run again
+    with engine.begin() as connection:
+        for start in range(0, len(rows), batch_size):
+            connection.execute(insert(ActivityLog).values(rows[start:start + batch_size]))
+    os.remove(replaying)
+
+    with _lock:
+        _stats['replayed'] += len(rows)
+    return len(rows)
+
+
+def get_stats():
+    """
+    Counters of this process
+
+    Returns:
+        dict: Queued, written, batches, fallback and replayed rows, plus the
+        current queue depth and fallback file size
+    """
+    with _lock:
+        stats = dict(_stats)
+    path = _settings.get('fallback_file')
+    stats.update(
+        enabled=is_enabled(),
+        queue_depth=_queue.qsize() if _queue is not None and _pid == os.getpid() else 0,
+        fallback_bytes=os.path.getsize(path) if path and os.path.exists(path) else 0,
+    )
+    return stats
@@ -3,16 +3,63 @@ Budget Monitoring Utility
 Checks budget thresholds and creates notifications
 """
 from app import db
-from .models import Event, Budget, Transaction, TransactionItem
-from .activity_logger import create_notification
+from .models import Event, SubEvent, Budget
+from .activity_logger import queue_notifications, create_notifications_bulk
+from .financial_summary import compute_summary_rows
+from . import reference_cache
+from decimal import Decimal
+from sqlalchemy import and_, or_, select
 
+# Usage thresholds (%) that trigger a notification, highest first
+BUDGET_THRESHOLDS = (100, 90, 75, 50)
 
-def check_budget_thresholds(event_id):
+
+def get_threshold_reached(usage_percentage):
+    """Highest threshold the usage has reached, or 0"""
+    return next((threshold for threshold in BUDGET_THRESHOLDS if usage_percentage >= threshold), 0)
+
+
+def apply_budget_delta(key, amount_delta):
+    """
+    Add an expense delta to the Spent_Total of the budgets it belongs to
+
+    Called with every summary delta, so the running totals are committed (or
+    rolled back) together with the transaction write.
+
+    Args:
+        key: Summary key (event, sub-event, nature, category, mode)
+        amount_delta: Amount added to (or, negative, removed from) that key
+    """
+    event_id, sub_event_id, nature_id = key[0], key[1], key[2]
+    if not amount_delta or nature_id != reference_cache.get_id_by_name('nature', 'Expense'):
+        return
+
+    # Event budgets count all of the event's expenses, sub-event budgets only their own
+    scopes = []
+    if event_id is not None:
+        scopes.append(Budget.Event_ID == event_id)
+    if sub_event_id is not None:
+        scopes.append(and_(Budget.Event_ID.is_(None), Budget.Sub_Event_ID == sub_event_id))
+    if scopes:
+        Budget.query.filter(or_(*scopes)).update(
+            {'Spent_Total': Budget.Spent_Total + Decimal(str(amount_delta))},
+            synchronize_session=False
+        )
+
+
+def check_budget_thresholds(event_id, commit=True):
     """
-    Check budget usage and send notifications if thresholds are crossed
+    Check budget usage and send notifications if a new threshold is crossed
+    
+    Reads the budget's running Spent_Total; each threshold is notified once
+    (Notified_Threshold), and again only after usage has dropped below it.
     
     Args:
         event_id: ID of the event to check
+        commit: Commit the new threshold and its notifications. Write routes pass
+            False to insert them in the transaction of the change being checked
+            (also outside a request); errors are then raised for the caller to
+            roll back.
     
     Returns:
         dict: Budget status information
@@ -23,88 +70,146 @@ def check_budget_thresholds(event_id):
             return None
         
         # Get budget
-        budget = Budget.query.filter_by(Event_ID=event_id).first()
+        # populate_existing: apply_budget_delta updates Spent_Total in bulk, behind the identity map
+        budget = Budget.query.filter_by(Event_ID=event_id).populate_existing().first()
         if not budget:
             return None
         
         budget_amount = float(budget.Amount)
-        
-        # Calculate total expenses
-        transactions = Transaction.query.filter_by(Event_ID=event_id).all()
-        total_expense = 0
-        
-        for txn in transactions:
-            if txn.transaction_nature and txn.transaction_nature.Nature_Name == 'Expense':
-                for item in txn.items:
-                    total_expense += float(item.Amount)
+        total_expense = float(budget.Spent_Total or 0)
         
         # Calculate usage percentage
         usage_percentage = (total_expense / budget_amount * 100) if budget_amount > 0 else 0
         remaining = budget_amount - total_expense
+        reached = get_threshold_reached(usage_percentage)
+        notified = budget.Notified_Threshold or 0
         
-        # Determine notification type and message
-        notification_data = None
-        
-        if usage_percentage >= 100:
-            notification_data = {
-                'title': '⚠️ Budget Exceeded!',
-                'message': f'Event "{event.Name}" has exceeded its budget! Spent: ₹{total_expense:,.2f} / Budget: ₹{budget_amount:,.2f} ({usage_percentage:.1f}%)',
-                'type': 'danger'
-            }
-        elif usage_percentage >= 90:
-            notification_data = {
-                'title': '🚨 Budget Alert - 90% Used',
-                'message': f'Event "{event.Name}" has used 90% of its budget. Spent: ₹{total_expense:,.2f} / Budget: ₹{budget_amount:,.2f}. Remaining: ₹{remaining:,.2f}',
-                'type': 'danger'
-            }
-        elif usage_percentage >= 75:
-            notification_data = {
-                'title': '⚠️ Budget Warning - 75% Used',
-                'message': f'Event "{event.Name}" has used 75% of its budget. Spent: ₹{total_expense:,.2f} / Budget: ₹{budget_amount:,.2f}. Remaining: ₹{remaining:,.2f}',
-                'type': 'warning'
-            }
-        elif usage_percentage >= 50:
-            notification_data = {
-                'title': '📊 Budget Milestone - 50% Used',
-                'message': f'Event "{event.Name}" has used half of its budget. Spent: ₹{total_expense:,.2f} / Budget: ₹{budget_amount:,.2f}. Remaining: ₹{remaining:,.2f}',
-                'type': 'info'
-            }
-        
-        # Send notifications if threshold crossed
-        if notification_data:
-            # Notify Event Manager
-            if event.Event_Manager:
-                create_notification(
-                    user_id=event.Event_Manager,
-                    title=notification_data['title'],
-                    message=notification_data['message'],
-                    notification_type=notification_data['type'],
-                    event_id=event_id
-                )
-            
-            # Notify Finance Manager
-            if event.Finance_Manager:
-                create_notification(
-                    user_id=event.Finance_Manager,
-                    title=notification_data['title'],
-                    message=notification_data['message'],
-                    notification_type=notification_data['type'],
-                    event_id=event_id
-                )
+        if reached != notified:
+            # Only the request that moves Notified_Threshold sends the alert
+            updated = Budget.query.filter_by(Budget_ID=budget.Budget_ID, Notified_Threshold=notified).update(
+                {'Notified_Threshold': reached}, synchronize_session=False
+            )
+            if updated and reached > notified:
+                # Notify Event Manager and Finance Manager together
+                notification_data = get_threshold_notification(reached, event, total_expense, budget_amount, remaining)
+                (queue_notifications if commit else create_notifications_bulk)([
+                    {
+                        'user_id': manager_id,
+                        'title': notification_data['title'],
+                        'message': notification_data['message'],
+                        'notification_type': notification_data['type'],
+                        'event_id': event_id
+                    }
+                    for manager_id in (event.Event_Manager, event.Finance_Manager) if manager_id
+                ])
+            # Commits the new threshold together with its notifications
+            if commit:
+                db.session.commit()
         
         return {
             'budget': budget_amount,
             'spent': total_expense,
             'remaining': remaining,
             'usage_percentage': usage_percentage,
+            'notified_threshold': reached,
             'status': 'exceeded' if usage_percentage >= 100 else 'warning' if usage_percentage >= 75 else 'normal'
         }
     
     except Exception as e:
+        if not commit:
+            raise
         print(f"Error checking budget thresholds: {e}")
+        db.session.rollback()
         return None
 
 
+def get_threshold_notification(threshold, event, total_expense, budget_amount, remaining):
+    """Title, message and type of the notification for a crossed threshold"""
+    if threshold >= 100:
+        return {
+            'title': '⚠️ Budget Exceeded!',
+            'message': f'Event "{event.Name}" has exceeded its budget! Spent: ₹{total_expense:,.2f} / Budget: ₹{budget_amount:,.2f} ({total_expense / budget_amount * 100:.1f}%)',
+            'type': 'danger'
+        }
+    if threshold >= 90:
+        return {
+            'title': '🚨 Budget Alert - 90% Used',
+            'message': f'Event "{event.Name}" has used 90% of its budget. Spent: ₹{total_expense:,.2f} / Budget: ₹{budget_amount:,.2f}. Remaining: ₹{remaining:,.2f}',
+            'type': 'danger'
+        }
+    if threshold >= 75:
+        return {
+            'title': '⚠️ Budget Warning - 75% Used',
+            'message': f'Event "{event.Name}" has used 75% of its budget. Spent: ₹{total_expense:,.2f} / Budget: ₹{budget_amount:,.2f}. Remaining: ₹{remaining:,.2f}',
+            'type': 'warning'
+        }
+    return {
+        'title': '📊 Budget Milestone - 50% Used',
+        'message': f'Event "{event.Name}" has used half of its budget. Spent: ₹{total_expense:,.2f} / Budget: ₹{budget_amount:,.2f}. Remaining: ₹{remaining:,.2f}',
+        'type': 'info'
+    }
+
+
+def reconcile_budgets(event_id=None, notify=True):
+    """
+    Recompute Spent_Total of every budget from transaction items and fix drift
+
+    Meant to run nightly ('flask budget reconcile'). Budgets that were corrected
+    are checked against their thresholds afterwards.
+
+    Args:
+        event_id: Optional event to limit the pass to (with its sub-events' budgets)
+        notify: Send threshold notifications for corrected event budgets
+
+    Returns:
+        list: One dict per corrected budget with 'budget_id', 'event_id',
+        'sub_event_id', 'stored' and 'expected'
+    """
+    expense_id = reference_cache.get_id_by_name('nature', 'Expense')
+    event_totals, sub_event_totals = {}, {}
+    for key, (total, _) in compute_summary_rows(event_id).items():
+        if key[2] != expense_id:
+            continue
+        event_totals[key[0]] = event_totals.get(key[0], Decimal('0.00')) + total
+        if key[1] is not None:
+            sub_event_totals[key[1]] = sub_event_totals.get(key[1], Decimal('0.00')) + total
+
+    query = Budget.query
+    if event_id is not None:
+        # Sub-event budgets have no Event_ID: match them through their sub-event
+        query = query.filter(or_(
+            Budget.Event_ID == event_id,
+            Budget.Sub_Event_ID.in_(select(SubEvent.Sub_Event_ID).where(SubEvent.Event_ID == event_id))
+        ))
+
+    corrected = []
+    try:
+        for budget in query.all():
+            if budget.Event_ID is not None:
+                expected = event_totals.get(budget.Event_ID, Decimal('0.00'))
+            else:
+                expected = sub_event_totals.get(budget.Sub_Event_ID, Decimal('0.00'))
+            stored = Decimal(budget.Spent_Total or 0).quantize(Decimal('0.01'))
+            if stored != expected:
+                corrected.append({
+                    'budget_id': budget.Budget_ID,
+                    'event_id': budget.Event_ID,
+                    'sub_event_id': budget.Sub_Event_ID,
+                    'stored': stored,
+                    'expected': expected,
+                })
+                budget.Spent_Total = expected
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    if notify:
+        for event_id in {row['event_id'] for row in corrected if row['event_id'] is not None}:
+            check_budget_thresholds(event_id)
+    return corrected
+
+
 def notify_large_transaction(user_id, transaction_id, amount, event_id, threshold=10000):
     """
     Notify relevant parties about large transactions
@@ -124,27 +229,18 @@ def notify_large_transaction(user_id, transaction_id, amount, event_id, threshol
             
             message = f'Large transaction of ₹{amount:,.2f} was created in event "{event.Name}"'
             
-            # Notify Finance Manager
-            if event.Finance_Manager and event.Finance_Manager != user_id:
-                create_notification(
-                    user_id=event.Finance_Manager,
-                    title='💰 Large Transaction Alert',
-                    message=message,
-                    notification_type='warning',
-                    event_id=event_id,
-                    transaction_id=transaction_id
-                )
-            
-            # Notify Event Manager if different from creator
-            if event.Event_Manager and event.Event_Manager != user_id:
-                create_notification(
-                    user_id=event.Event_Manager,
-                    title='💰 Large Transaction Alert',
-                    message=message,
-                    notification_type='warning',
-                    event_id=event_id,
-                    transaction_id=transaction_id
-                )
+            # Notify Finance Manager and Event Manager unless they created it
+            queue_notifications([
+                {
+                    'user_id': manager_id,
+                    'title': '💰 Large Transaction Alert',
+                    'message': message,
+                    'notification_type': 'warning',
+                    'event_id': event_id,
+                    'transaction_id': transaction_id
+                }
+                for manager_id in (event.Finance_Manager, event.Event_Manager) if manager_id and manager_id != user_id
+            ])
     
     except Exception as e:
         print(f"Error notifying large transaction: {e}")
@@ -0,0 +1,130 @@
+"""
+Event Query Module
+Event card data for the admin pages from one joined query, bucketed by status in SQL
+"""
+from app import db
+from .models import Event, EventType, Department, User
+from .event_status import STATUSES, status_criterion, status_order, count_by_status
+from sqlalchemy import func
+from sqlalchemy.orm import aliased
+
+EVENT_STATUSES = STATUSES
+
+
+def _window_criteria(date_from=None, date_to=None):
+    criteria = []
+    if date_from:
+        criteria.append(Event.Date >= date_from)
+    if date_to:
+        criteria.append(Event.Date <= date_to)
+    return criteria
+
+
+def event_card_query():
+    """Events joined with their type, department and event manager names (one row per event)"""
+    manager = aliased(User)
+    return (
+        db.session.query(
+            Event.Event_ID,
+            Event.Name,
+            Event.Date,
+            EventType.Event_Type_Name,
+            Department.Name.label('Department_Name'),
+            manager.Username.label('Manager_Name'),
+        )
+        .outerjoin(EventType, EventType.Event_Type_ID == Event.Event_Type_ID)
+        .outerjoin(Department, Department.Dept_ID == Event.Dept_ID)
+        .outerjoin(manager, manager.User_ID == Event.Event_Manager)
+    )
+
+
+def _card(row, status):
+    return {
+        "id": row.Event_ID,
+        "event_name": row.Name,
+        "status": status,
+        "type": row.Event_Type_Name or "Unknown",
+        "department": row.Department_Name or "Unknown",
+        "event_manager": row.Manager_Name or "Unknown",
+    }
+
+
+def count_events_by_status(date_from=None, date_to=None):
+    """
+    Number of events in each status bucket, from one GROUP BY over the status CASE
+
+    Returns:
+        dict: {status: count} for every status in EVENT_STATUSES
+    """
+    return count_by_status(db.session.query(Event.Event_ID).filter(*_window_criteria(date_from, date_to)), Event)
+
+
+def get_event_card_page(status, page=1, page_size=12, date_from=None, date_to=None, total=None):
+    """
+    Fetch one page of event cards of a single status bucket
+
+    Args:
+        status: One of EVENT_STATUSES
+        page: 1-based page number (clamped to the last page)
+        page_size: Cards per page
+        date_from, date_to: Optional window on the event date (inclusive)
+        total: Size of the bucket if already known (skips the COUNT query)
+
+    Returns:
+        dict: rows (card dicts), total, page, pages, page_size
+    """
+    criteria = [status_criterion(Event, status), *_window_criteria(date_from, date_to)]
+    if total is None:
+        total = db.session.query(func.count(Event.Event_ID)).filter(*criteria).scalar() or 0
+    pages = max(1, -(-total // page_size))
+    page = max(1, min(page, pages))
+
+    rows = []
+    if total:
+        rows = (
+            event_card_query()
+            .filter(*criteria)
+            .order_by(*status_order(Event, status))
+            .offset((page - 1) * page_size)
+            .limit(page_size)
+            .all()
+        )
+    return {
+        'rows': [_card(row, status) for row in rows],
+        'total': total,
+        'page': page,
+        'pages': pages,
+        'page_size': page_size,
+    }
+
+
+def get_grouped_event_cards(page_size=3, statuses=EVENT_STATUSES, pages=None, date_from=None, date_to=None):
+    """
+    Event cards grouped by status, one page per bucket
+
+    One grouped COUNT query plus one LIMITed query per non-empty bucket, so the
+    cost follows the number of cards shown rather than the number of events or users.
+
+    Args:
+        page_size: Cards per bucket
+        statuses: Buckets to load (in display order)
+        pages: Optional {status: page number}
+        date_from, date_to: Optional window on the event date (inclusive)
+
+    Returns:
+        dict: {status: page dict as returned by get_event_card_page}
+    """
+    pages = pages or {}
+    # A single bucket is counted with its own (indexed) criterion instead of the grouped CASE
+    counts = count_events_by_status(date_from, date_to) if len(statuses) > 1 else {}
+    return {
+        status: get_event_card_page(
+            status,
+            page=pages.get(status, 1),
+            page_size=page_size,
+            date_from=date_from,
+            date_to=date_to,
+            total=counts.get(status),
+        )
+        for status in statuses
+    }
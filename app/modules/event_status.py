@@ -0,0 +1,145 @@
+"""
+Event Status Module
+Upcoming / Ongoing / Completed computed in SQL over an event's date range (Date .. Date + Days - 1)
+"""
+from sqlalchemy import and_, case, func, literal, Date
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import FunctionElement
+from datetime import date, timedelta
+
+STATUSES = ('Upcoming', 'Ongoing', 'Completed')
+
+
+class date_add(FunctionElement):
+    """date_add(date_expr, days_expr): the date days_expr days after date_expr, in the database's dialect"""
+    type = Date()
+    name = 'date_add'
+    inherit_cache = True
+
+
+@compiles(date_add)
+def _date_add_default(element, compiler, **kw):
+    start, days = list(element.clauses)
+    return f"({compiler.process(start, **kw)} + {compiler.process(days, **kw)})"
+
+
+@compiles(date_add, 'mysql')
+def _date_add_mysql(element, compiler, **kw):
+    start, days = list(element.clauses)
+    return f"DATE_ADD({compiler.process(start, **kw)}, INTERVAL ({compiler.process(days, **kw)}) DAY)"
+
+
+@compiles(date_add, 'sqlite')
+def _date_add_sqlite(element, compiler, **kw):
+    start, days = list(element.clauses)
+    return f"date({compiler.process(start, **kw)}, ({compiler.process(days, **kw)}) || ' days')"
+
+
+def date_range(model):
+    """
+    First and last day of an event as SQL expressions
+
+    Models with a Days column (Event) span Date .. Date + Days - 1; others (Sub_Event) last one day.
+    """
+    start = model.Date
+    days = getattr(model, 'Days', None)
+    if days is None:
+        return start, start
+    return start, date_add(start, days - 1)
+
+
+def status_criterion(model, status):
+    """
+    WHERE clause selecting one status bucket against CURRENT_DATE
+
+    Every bucket also bounds the start date, so an index on Date narrows the scan.
+    """
+    today = func.current_date()
+    start, end = date_range(model)
+    if status == 'Upcoming':
+        return start > today
+    if status == 'Ongoing':
+        return and_(start <= today, end >= today)
+    return and_(start < today, end < today)
+
+
+def status_column(model):
+    """CASE expression labelling each row Upcoming / Ongoing / Completed"""
+    today = func.current_date()
+    start, end = date_range(model)
+    return case(
+        (start > today, literal('Upcoming')),
+        (end >= today, literal('Ongoing')),
+        else_=literal('Completed'),
+    )
+
+
+def status_order(model, status):
+    """ORDER BY for a bucket: soonest upcoming / ongoing first, most recently completed first"""
+    primary_key = model.__mapper__.primary_key[0]
+    if status == 'Completed':
+        return model.Date.desc(), primary_key.desc()
+    return model.Date.asc(), primary_key.asc()
+
+
+def determine_status(start_date, days=1, today=None):
+    """Python equivalent of status_column for a row that is already loaded"""
+    today = today or date.today()
+    if start_date > today:
+        return 'Upcoming'
+    if start_date + timedelta(days=(days or 1) - 1) >= today:
+        return 'Ongoing'
+    return 'Completed'
+
+
+def fetch_by_status(query, model, statuses=STATUSES, limit=None):
+    """
+    Group the rows of a query by status
+
+    Without a limit this is one query with the status column; with a limit each
+    requested bucket is one LIMITed query, so an "Upcoming" list never loads the
+    completed history.
+
+    Args:
+        query: Query of model instances (filters applied, no ordering)
+        model: Mapped class with a Date column (and optionally Days)
+        statuses: Buckets to return
+        limit: Maximum rows per bucket
+
+    Returns:
+        dict: {status: [model instances]} with an entry for every requested status
+    """
+    grouped = {status: [] for status in statuses}
+    if limit is None:
+        status = status_column(model).label('event_status')
+        rows = query.add_columns(status).order_by(model.Date, model.__mapper__.primary_key[0]).all()
+        for instance, row_status in rows:
+            if row_status in grouped:
+                grouped[row_status].append(instance)
+        return grouped
+
+    for status in statuses:
+        grouped[status] = (
+            query.filter(status_criterion(model, status))
+            .order_by(*status_order(model, status))
+            .limit(limit)
+            .all()
+        )
+    return grouped
+
+
+def count_by_status(query, model):
+    """
+    Number of rows in each bucket from one GROUP BY over the status CASE
+
+    Args:
+        query: Query selecting model's primary key (filters applied)
+
+    Returns:
+        dict: {status: count} for every status
+    """
+    status = status_column(model).label('event_status')
+    rows = query.with_entities(status, func.count()).group_by(status).all()
+    counts = dict.fromkeys(STATUSES, 0)
+    counts.update({row[0]: row[1] for row in rows})
+    return counts
@@ -0,0 +1,314 @@
+"""
+Event Financial Snapshot Module
+Loads an event's financial aggregates once and shares them for the rest of the request
+"""
+from app import db
+from .models import Budget, Transaction, TransactionItem
+from .aggregations import get_grouped_totals, sum_grouped_totals
+from .transaction_queries import item_total_subquery, event_scope
+from .pagination import keyset_page, format_cursor, newer_than
+from . import reference_cache
+from flask import current_app, g
+from itsdangerous import URLSafeSerializer, BadSignature
+from sqlalchemy import case, func, select, type_coerce
+
+# Natures that add to the running balance in the ledger
+CREDIT_NATURES = ('Revenue', 'Credit')
+
+
+class EventFinancialSnapshot:
+    """
+    Financial figures for one event or sub-event
+
+    Aggregates and budget are loaded in a fixed number of queries when the
+    snapshot is built and lookup names come from the reference cache;
+    ledger rows are loaded on first access.
+    """
+
+    def __init__(self, event_id, is_sub_event=False):
+        self.event_id = event_id
+        self.is_sub_event = is_sub_event
+
+        self.grouped_totals = get_grouped_totals(event_id, is_sub_event)
+        self.nature_names = reference_cache.get_names('nature')
+        self.category_names = reference_cache.get_names('category')
+        self.mode_names = reference_cache.get_names('mode')
+
+        budget_filter = Budget.Sub_Event_ID if is_sub_event else Budget.Event_ID
+        budget_amount = db.session.query(Budget.Amount).filter(budget_filter == event_id).limit(1).scalar()
+        self.budget_amount = float(budget_amount) if budget_amount else 0
+
+        self._ledger_rows = None
+
+    def _nature_total(self, nature_name, category_id=None):
+        total = 0
+        for nature_id, name in self.nature_names.items():
+            if name == nature_name:
+                total += sum_grouped_totals(self.grouped_totals, nature_id=nature_id, category_id=category_id)
+        return total
+
+    @property
+    def revenue(self):
+        return self._nature_total('Revenue')
+
+    @property
+    def expense(self):
+        return self._nature_total('Expense')
+
+    @property
+    def profit_loss(self):
+        return self.revenue - self.expense
+
+    @property
+    def budget_remaining(self):
+        return self.budget_amount - self.expense
+
+    @property
+    def budget_utilization(self):
+        return (self.expense / self.budget_amount * 100) if self.budget_amount > 0 else 0
+
+    @property
+    def category_totals(self):
+        """Totals for every transaction category, keyed by category name"""
+        return {
+            name: sum_grouped_totals(self.grouped_totals, category_id=category_id)
+            for category_id, name in self.category_names.items()
+        }
+
+    @property
+    def mode_totals(self):
+        """Totals for every payment mode, keyed by mode name"""
+        return {
+            name: sum_grouped_totals(self.grouped_totals, mode_id=mode_id)
+            for mode_id, name in self.mode_names.items()
+        }
+
+    @property
+    def category_breakdown(self):
+        """Non-zero category totals as a list of {'name', 'total'} dicts"""
+        return [{'name': name, 'total': total} for name, total in self.category_totals.items() if total > 0]
+
+    @property
+    def mode_breakdown(self):
+        """Non-zero payment mode totals as a list of {'name', 'total'} dicts"""
+        return [{'name': name, 'total': total} for name, total in self.mode_totals.items() if total > 0]
+
+    def _category_totals_for_nature(self, nature_name):
+        totals = {}
+        for category_id, name in self.category_names.items():
+            total = self._nature_total(nature_name, category_id=category_id)
+            if total > 0:
+                totals[name] = total
+        return totals
+
+    @property
+    def revenue_by_category(self):
+        return self._category_totals_for_nature('Revenue')
+
+    @property
+    def expense_by_category(self):
+        return self._category_totals_for_nature('Expense')
+
+    @property
+    def ledger_rows(self):
+        """Transactions in date order with item totals and a running balance"""
+        if self._ledger_rows is None:
+            self._ledger_rows = self._load_ledger_rows()
+        return self._ledger_rows
+
+    @property
+    def closing_balance(self):
+        """Running balance after the newest transaction (credits minus debits)"""
+        credit_ids = self._credit_nature_ids()
+        return sum(
+            (row.Total or 0) if row.Nature_ID in credit_ids else -(row.Total or 0)
+            for row in self.grouped_totals
+        )
+
+    def _credit_nature_ids(self):
+        return [nature_id for nature_id, name in self.nature_names.items() if name in CREDIT_NATURES]
+
+    def _ledger_query(self):
+        first_description = (
+            select(TransactionItem.Description)
+            .where(TransactionItem.Transaction_ID == Transaction.Transaction_ID)
+            .order_by(TransactionItem.TransactionItem_ID)
+            .limit(1)
+            .scalar_subquery()
+        )
+        return (
+            db.session.query(
+                Transaction.Transaction_ID,
+                Transaction.Date,
+                Transaction.Bill_No,
+                Transaction.Party_Name,
+                Transaction.Nature_ID,
+                Transaction.Transaction_Category_ID,
+                Transaction.Mode_ID,
+                item_total_subquery().label('Item_Total'),
+                first_description.label('First_Description')
+            )
+            .filter(event_scope(self.event_id, self.is_sub_event))
+        )
+
+    def _ledger_row(self, txn, balance):
+        amount = float(txn.Item_Total or 0)
+        nature = self.nature_names.get(txn.Nature_ID)
+        return {
+            'id': txn.Transaction_ID,
+            'date': txn.Date,
+            'bill_no': txn.Bill_No,
+            'party_name': txn.Party_Name,
+            'description': txn.First_Description or txn.Party_Name or '',
+            'category': self.category_names.get(txn.Transaction_Category_ID, 'N/A'),
+            'nature': nature or 'N/A',
+            'payment_mode': self.mode_names.get(txn.Mode_ID, 'N/A'),
+            'amount': amount,
+            'is_credit': nature in CREDIT_NATURES,
+            'balance': balance
+        }
+
+    def _signed_amount(self, txn):
+        amount = float(txn.Item_Total or 0)
+        return amount if self.nature_names.get(txn.Nature_ID) in CREDIT_NATURES else -amount
+
+    def _load_ledger_rows(self):
+        return list(self.iter_ledger_rows())
+
+    def iter_ledger_rows(self, batch_size=1000):
+        """
+        Yield ledger rows oldest first without loading the whole ledger
+
+        Rows are fetched through a server-side cursor in batches of
+        batch_size, so memory use does not grow with the number of
+        transactions. Avoid other queries on the session while iterating.
+        """
+        transactions = (
+            self._ledger_query()
+            .order_by(Transaction.Date, Transaction.Transaction_ID)
+            .execution_options(stream_results=True)
+            .yield_per(batch_size)
+        )
+        running_balance = 0
+        for txn in transactions:
+            running_balance += self._signed_amount(txn)
+            yield self._ledger_row(txn, running_balance)
+
+    def ledger_extents(self):
+        """Longest description and largest amount in the ledger, computed in SQL"""
+        ledger = self._ledger_query().subquery()
+        max_description, max_amount = db.session.query(
+            func.max(func.length(func.coalesce(ledger.c.First_Description, ledger.c.Party_Name, ''))),
+            type_coerce(func.max(func.abs(ledger.c.Item_Total)), db.Float)
+        ).one()
+        return {'max_description_length': max_description or 0, 'max_amount': max_amount or 0}
+
+    def _balance_after_newer_rows(self, position):
+        """Closing balance minus the signed item totals of transactions newer than position"""
+        signed_amount = case(
+            (Transaction.Nature_ID.in_(self._credit_nature_ids()), TransactionItem.Amount),
+            else_=-TransactionItem.Amount
+        )
+        newer_total = (
+            db.session.query(type_coerce(func.sum(signed_amount), db.Float))
+            .select_from(Transaction)
+            .join(TransactionItem, TransactionItem.Transaction_ID == Transaction.Transaction_ID)
+            .filter(
+                event_scope(self.event_id, self.is_sub_event),
+                newer_than(Transaction.Date, Transaction.Transaction_ID, position)
+            )
+            .scalar()
+        )
+        return self.closing_balance - (newer_total or 0)
+
+    def _ledger_version(self):
+        """Closing balance and last summary change: a carried balance is only valid while both are unchanged"""
+        changed_at = max((row.Changed_At for row in self.grouped_totals if row.Changed_At), default=None)
+        return [self.event_id, self.is_sub_event, round(self.closing_balance, 2), str(changed_at)]
+
+    def _ledger_cursor(self, row, balance, version):
+        """Keyset cursor of row plus a signed running balance at it"""
+        token = _balance_serializer().dumps(version + [round(balance, 2)])
+        return f"{format_cursor(row.Date, row.Transaction_ID)}~{token}"
+
+    def _split_cursor(self, cursor, version):
+        """(keyset cursor, carried balance or None when missing, forged or outdated)"""
+        if not cursor or '~' not in cursor:
+            return cursor, None
+        cursor, token = cursor.split('~', 1)
+        try:
+            payload = _balance_serializer().loads(token)
+        except BadSignature:
+            return cursor, None
+        if payload[:-1] != version:
+            return cursor, None
+        return cursor, payload[-1]
+
+    def ledger_page(self, page_size, after=None, before=None):
+        """
+        One page of the ledger, newest first, with running balances
+
+        The first page starts from the materialized closing balance. The page
+        cursors carry the running balance at their row (signed, and tied to the
+        closing balance and last summary change), so following them costs the
+        same at any depth; only a cursor issued before a write falls back to
+        subtracting the rows above the page in SQL.
+
+        Args:
+            page_size: Maximum number of rows
+            after: Cursor of the last row of the previous (newer) page
+            before: Cursor of the first row of the following (older) page
+
+        Returns:
+            dict: 'rows', 'older_cursor' and 'newer_cursor' (None when there is no such page)
+        """
+        version = self._ledger_version()
+        after, after_balance = self._split_cursor(after, version)
+        before, before_balance = self._split_cursor(before, version)
+        transactions, has_older, has_newer = keyset_page(
+            self._ledger_query(), Transaction.Date, Transaction.Transaction_ID, page_size, after=after, before=before
+        )
+        if not transactions:
+            return {'rows': [], 'older_cursor': None, 'newer_cursor': None}
+
+        first = transactions[0]
+        if not has_newer:
+            balance = self.closing_balance
+        elif before and before_balance is not None:
+            # The cursor holds the balance of the row just older than this page
+            balance = before_balance + sum(self._signed_amount(txn) for txn in transactions)
+        elif after and before is None and after_balance is not None:
+            balance = after_balance
+        else:
+            balance = self._balance_after_newer_rows((first.Date, first.Transaction_ID))
+        newest_balance = balance
+
+        rows = []
+        for txn in transactions:
+            rows.append(self._ledger_row(txn, balance))
+            balance -= self._signed_amount(txn)
+
+        last = transactions[-1]
+        return {
+            'rows': rows,
+            # Older page starts at the balance left after this page's last row
+            'older_cursor': self._ledger_cursor(last, balance, version) if has_older else None,
+            'newer_cursor': self._ledger_cursor(first, newest_balance, version) if has_newer else None
+        }
+
+def _balance_serializer():
+    return URLSafeSerializer(current_app.secret_key, salt='ledger-balance')
+
+
+def get_event_snapshot(event_id, is_sub_event=False):
+    """
+    Get the financial snapshot for an event or sub-event
+
+    The snapshot is memoized on flask.g, so every caller in the same request
+    shares one set of queries.
+    """
+    snapshots = g.setdefault('event_snapshots', {})
+    key = (event_id, is_sub_event)
+    if key not in snapshots:
+        snapshots[key] = EventFinancialSnapshot(event_id, is_sub_event)
+    return snapshots[key]
@@ -0,0 +1,250 @@
+"""
+Event Financial Summary Module
+Maintains per-event running totals in Event_Financial_Summary as transactions change
+"""
+from app import db
+from .models import EventFinancialSummary, Transaction, TransactionItem
+from . import reference_cache
+from decimal import Decimal
+from sqlalchemy import func, insert, inspect, type_coerce
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+# Columns that identify one summary row
+SUMMARY_KEY_COLUMNS = ('Event_ID', 'Sub_Event_ID', 'Nature_ID', 'Transaction_Category_ID', 'Mode_ID')
+
+
+def _to_int(value):
+    """Normalize a foreign key value that may still be a raw form string"""
+    if value is None or value == '':
+        return None
+    return int(value)
+
+
+def get_summary_key(transaction):
+    """Build the summary key (event, sub-event, nature, category, mode) for a transaction"""
+    return tuple(_to_int(getattr(transaction, column)) for column in SUMMARY_KEY_COLUMNS)
+
+
+def get_transaction_contribution(transaction):
+    """
+    Capture what a transaction currently contributes to the summary
+
+    Call this before changing a transaction so the old contribution can be
+    removed afterwards.
+
+    Returns:
+        tuple: (summary key, item total, item count)
+    """
+    total, count = (
+        db.session.query(func.coalesce(func.sum(TransactionItem.Amount), 0), func.count(TransactionItem.TransactionItem_ID))
+        .filter(TransactionItem.Transaction_ID == transaction.Transaction_ID)
+        .one()
+    )
+    return get_summary_key(transaction), total, count
+
+
+def _upsert_summary_row(filters, amount_delta, count_delta):
+    """
+    Add a delta to one summary row, creating the row if needed, in one atomic statement
+
+    The upsert targets the NOT NULL key (Event_ID plus the COALESCE'd *_Key
+    columns), so two requests writing the first delta of a key at the same time
+    end up on one row instead of inserting it twice.
+    """
+    table = EventFinancialSummary.__table__
+    values = dict(filters, Total_Amount=amount_delta, Item_Count=count_delta)
+    dialect = db.session.get_bind(mapper=EventFinancialSummary.__mapper__, clause=insert(table)).dialect.name
+
+    if dialect == 'mysql':
+        statement = mysql_insert(table).values(**values)
+        db.session.execute(statement.on_duplicate_key_update(
+            Total_Amount=table.c.Total_Amount + statement.inserted.Total_Amount,
+            Item_Count=table.c.Item_Count + statement.inserted.Item_Count,
+            modified_date=func.current_timestamp(),
+        ))
+    elif dialect == 'sqlite':
+        statement = sqlite_insert(table).values(**values)
+        db.session.execute(statement.on_conflict_do_update(
+            index_elements=[table.c.Event_ID, table.c.Sub_Event_Key, table.c.Nature_Key,
+                            table.c.Category_Key, table.c.Mode_Key],
+            set_={
+                'Total_Amount': table.c.Total_Amount + statement.excluded.Total_Amount,
+                'Item_Count': table.c.Item_Count + statement.excluded.Item_Count,
+                'modified_date': func.current_timestamp(),
+            },
+        ))
+    else:
+        # Other databases: UPDATE, then INSERT when no row exists yet (the unique key rejects a racing insert)
+        updated = EventFinancialSummary.query.filter_by(**filters).update(
+            {
+                'Total_Amount': EventFinancialSummary.Total_Amount + amount_delta,
+                'Item_Count': EventFinancialSummary.Item_Count + count_delta
+            },
+            synchronize_session=False
+        )
+        if not updated:
+            db.session.execute(insert(table).values(**values))
+
+
+def apply_summary_delta(key, amount_delta, count_delta=0):
+    """
+    Add an amount and item count delta to one summary row
+
+    The change (and the matching Budget.Spent_Total change) is made in the
+    current session, so it is committed (or rolled back) together with the
+    transaction write that caused it.
+
+    Args:
+        key: Summary key as returned by get_summary_key
+        amount_delta: Amount to add (negative to subtract)
+        count_delta: Number of items to add (negative to subtract)
+    """
+    if not amount_delta and not count_delta:
+        return
+
+    amount_delta = Decimal(str(amount_delta or 0))
+    _upsert_summary_row(dict(zip(SUMMARY_KEY_COLUMNS, key)), amount_delta, count_delta)
+
+    # Keep the budgets' running expense totals in step
+    from .budget_monitor import apply_budget_delta
+    apply_budget_delta(key, amount_delta)
+
+
+def apply_contribution(contribution, sign=1):
+    """Add (sign=1) or remove (sign=-1) a contribution captured by get_transaction_contribution"""
+    key, total, count = contribution
+    apply_summary_delta(key, sign * total, sign * count)
+
+
+def get_summary_totals(event_id, is_sub_event=False):
+    """
+    Fetch summary totals for an event or sub-event grouped by nature, category and mode
+
+    Reads Event_Financial_Summary only, so the cost depends on the number of
+    categories and modes rather than the number of transactions.
+
+    Returns:
+        list: Rows with Nature_ID, Transaction_Category_ID, Mode_ID, Total and
+        Changed_At (last modified_date of the rows)
+    """
+    scope_column = EventFinancialSummary.Sub_Event_ID if is_sub_event else EventFinancialSummary.Event_ID
+    return (
+        db.session.query(
+            EventFinancialSummary.Nature_ID,
+            EventFinancialSummary.Transaction_Category_ID,
+            EventFinancialSummary.Mode_ID,
+            type_coerce(func.sum(EventFinancialSummary.Total_Amount), db.Float).label('Total'),
+            func.max(EventFinancialSummary.modified_date).label('Changed_At')
+        )
+        .filter(scope_column == event_id)
+        .group_by(
+            EventFinancialSummary.Nature_ID,
+            EventFinancialSummary.Transaction_Category_ID,
+            EventFinancialSummary.Mode_ID
+        )
+        .all()
+    )
+
+
+def get_nature_total(event_id, nature_name, is_sub_event=False):
+    """Get the summary total for one transaction nature (e.g., 'Expense') of an event"""
+    scope_column = EventFinancialSummary.Sub_Event_ID if is_sub_event else EventFinancialSummary.Event_ID
+    total = (
+        db.session.query(type_coerce(func.sum(EventFinancialSummary.Total_Amount), db.Float))
+        .filter(scope_column == event_id, EventFinancialSummary.Nature_ID == reference_cache.get_id_by_name('nature', nature_name))
+        .scalar()
+    )
+    return total or 0
+
+
+def compute_summary_rows(event_id=None):
+    """
+    Recompute summary rows from transactionitem JOIN transaction_table
+
+    Args:
+        event_id: Optional event to limit the computation to
+
+    Returns:
+        dict: Summary key -> (total, item count)
+    """
+    query = (
+        db.session.query(
+            Transaction.Event_ID,
+            Transaction.Sub_Event_ID,
+            Transaction.Nature_ID,
+            Transaction.Transaction_Category_ID,
+            Transaction.Mode_ID,
+            func.sum(TransactionItem.Amount),
+            func.count(TransactionItem.TransactionItem_ID)
+        )
+        .join(TransactionItem, TransactionItem.Transaction_ID == Transaction.Transaction_ID)
+        .group_by(*[getattr(Transaction, column) for column in SUMMARY_KEY_COLUMNS])
+    )
+    if event_id is not None:
+        query = query.filter(Transaction.Event_ID == event_id)
+    return {tuple(row[:5]): (Decimal(str(row[5] or 0)).quantize(Decimal('0.01')), row[6]) for row in query.all()}
+
+
+def load_summary_rows(event_id=None):
+    """Load the stored summary rows as summary key -> (total, item count)"""
+    query = EventFinancialSummary.query
+    if event_id is not None:
+        query = query.filter_by(Event_ID=event_id)
+    return {
+        get_summary_key(summary): (Decimal(summary.Total_Amount or 0).quantize(Decimal('0.01')), summary.Item_Count)
+        for summary in query.all()
+    }
+
+
+def verify_financial_summary(event_id=None):
+    """
+    Compare the stored summary with totals recomputed from transaction items
+
+    Returns:
+        list: One dict per drifting key with 'key', 'expected' and 'stored' (total, count) tuples
+    """
+    expected = compute_summary_rows(event_id)
+    stored = load_summary_rows(event_id)
+    empty = (Decimal('0.00'), 0)
+
+    drift = []
+    for key in sorted(set(expected) | set(stored), key=lambda k: tuple(-1 if v is None else v for v in k)):
+        expected_value = expected.get(key, empty)
+        stored_value = stored.get(key, empty)
+        if expected_value != stored_value:
+            drift.append({'key': dict(zip(SUMMARY_KEY_COLUMNS, key)), 'expected': expected_value, 'stored': stored_value})
+    return drift
+
+
+def rebuild_financial_summary(event_id=None):
+    """
+    Recompute Event_Financial_Summary from scratch
+
+    Args:
+        event_id: Optional event to rebuild; rebuilds every event when None
+
+    Returns:
+        int: Number of summary rows written
+
+    Raises:
+        RuntimeError: If the table does not exist yet (it is created by migration 0002)
+    """
+    if not inspect(db.engine).has_table(EventFinancialSummary.__tablename__):
+        raise RuntimeError(f"Table {EventFinancialSummary.__tablename__} does not exist; run 'flask db upgrade' first")
+    rows = compute_summary_rows(event_id)
+    try:
+        query = EventFinancialSummary.query
+        if event_id is not None:
+            query = query.filter_by(Event_ID=event_id)
+        query.delete(synchronize_session=False)
+
+        db.session.add_all([
+            EventFinancialSummary(Total_Amount=total, Item_Count=count, **dict(zip(SUMMARY_KEY_COLUMNS, key)))
+            for key, (total, count) in rows.items()
+        ])
+        db.session.commit()
+        return len(rows)
+    except Exception:
+        db.session.rollback()
+        raise
@@ -0,0 +1,267 @@
+"""
+Fragment Cache Module
+Caches rendered dashboard fragments (event cards, user tables) until an admin write invalidates them
+"""
+from flask import current_app, get_template_attribute
+from app.db_routing import replica_enabled, REPLICA_BIND
+from markupsafe import Markup
+from blinker import Namespace
+from collections import OrderedDict
+from datetime import date
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+
+# Publish/subscribe hook: write routes send these after committing, the cache listens
+_signals = Namespace()
+TOPICS = {
+    'events': _signals.signal('events-changed'),
+    'users': _signals.signal('users-changed'),
+}
+
+# Fragment namespaces dropped by each topic (user names appear on the event cards too)
+INVALIDATES = {
+    'events': ('events',),
+    'users': ('users', 'events'),
+}
+
+_stats = {'hits': 0, 'misses': 0, 'invalidations': 0}
+_lock = threading.Lock()
+
+
+def _count(counter):
+    with _lock:
+        _stats[counter] += 1
+
+
+class MemoryStore:
+    """In-process LRU store (per worker); entries also expire after their TTL"""
+
+    def __init__(self, max_entries=1000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires and expires < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=0):
+        with self._lock:
+            self._entries[key] = (time.time() + ttl if ttl else 0, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            count = len(self._entries)
+            self._entries.clear()
+        return count
+
+
+class FileSystemStore:
+    """Store shared by every worker on the host: one JSON file per entry, written atomically"""
+
+    PRUNE_EVERY = 100  # Writes between sweeps of expired entries
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._writes = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, hashlib.sha1(key.encode('utf-8')).hexdigest() + '.json')
+
+    def get(self, key):
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as file:
+                entry = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if entry['expires'] and entry['expires'] < time.time():
+            return None
+        return entry['value']
+
+    def set(self, key, value, ttl=0):
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as file:
+            json.dump({'expires': time.time() + ttl if ttl else 0, 'value': value}, file)
+        os.replace(temp_path, self._path(key))
+
+        self._writes += 1
+        if self._writes % self.PRUNE_EVERY == 0:
+            self.prune()
+
+    def prune(self):
+        """Delete expired entries (old generations are never read again and expire with their TTL)"""
+        now = time.time()
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                with open(path, 'r', encoding='utf-8') as file:
+                    expires = json.load(file)['expires']
+                if expires and expires < now:
+                    os.remove(path)
+            except (OSError, ValueError, KeyError):
+                continue
+
+    def clear(self):
+        count = 0
+        for name in os.listdir(self.directory):
+            if name.endswith('.json'):
+                os.remove(os.path.join(self.directory, name))
+                count += 1
+        return count
+
+
+class NullStore:
+    """Caching disabled: every fragment is rendered"""
+
+    def get(self, key):
+        return None
+
+    def set(self, key, value, ttl=0):
+        pass
+
+    def clear(self):
+        return 0
+
+
+# FRAGMENT_CACHE_BACKEND name -> factory(app); register_store() adds others (e.g. a Redis-backed store)
+STORES = {
+    'memory': lambda app: MemoryStore(app.config.get('FRAGMENT_CACHE_MAX_ENTRIES', 1000)),
+    'filesystem': lambda app: FileSystemStore(app.config['FRAGMENT_CACHE_DIR']),
+    'none': lambda app: NullStore(),
+}
+
+
+def register_store(name, factory):
+    """Make a store available as FRAGMENT_CACHE_BACKEND = name; factory(app) returns an object with get/set/clear"""
+    STORES[name] = factory
+
+
+def init_app(app):
+    """Create the configured store and subscribe it to the write topics"""
+    backend = app.config.get('FRAGMENT_CACHE_BACKEND', 'memory')
+    if backend not in STORES:
+        print(f"⚠ Unknown FRAGMENT_CACHE_BACKEND '{backend}', fragment caching disabled")
+        backend = 'none'
+    app.extensions['fragment_cache'] = STORES[backend](app)
+
+    for topic, signal in TOPICS.items():
+        signal.connect(_invalidate, sender=app)
+
+
+def reading_from_replica():
+    return replica_enabled() and REPLICA_BIND in current_app.config.get('SQLALCHEMY_BINDS', {})
+
+
+def _store():
+    return current_app.extensions.get('fragment_cache') or NullStore()
+
+
+def _generation_key(namespace):
+    return f"generation:{namespace}"
+
+
+def _new_generation():
+    # Random token plus the time it was created ('<hex>.<epoch seconds>')
+    return f"{uuid.uuid4().hex}.{int(time.time())}"
+
+
+def _invalidate(app, topic, **payload):
+    # A new generation token makes every key of the namespace unreachable, in all workers sharing the store
+    store = app.extensions.get('fragment_cache')
+    if store is None:
+        return
+    for namespace in INVALIDATES[topic]:
+        store.set(_generation_key(namespace), _new_generation())
+    _count('invalidations')
+
+
+def publish(topic, **payload):
+    """
+    Announce a committed change; subscribers (the fragment cache) drop what depends on it
+
+    Args:
+        topic: 'events' or 'users'
+        **payload: Passed to the subscribers (e.g. event_id=..., user_id=...)
+    """
+    TOPICS[topic].send(current_app._get_current_object(), topic=topic, **payload)
+
+
+def subscribe(topic, receiver):
+    """Call receiver(app, topic=..., **payload) whenever topic is published"""
+    TOPICS[topic].connect(receiver)
+
+
+def get_or_render(namespace, key_parts, render):
+    """
+    Return the cached HTML of a fragment, rendering and storing it on a miss
+
+    The key includes today's date, so status buckets (Upcoming/Ongoing/Completed)
+    roll over at midnight even without a write.
+
+    Args:
+        namespace: 'events' or 'users' (what invalidates the fragment)
+        key_parts: Values identifying the fragment, e.g. (role, user_id)
+        render: Callable returning the fragment's HTML
+
+    Returns:
+        Markup: The fragment
+    """
+    store = _store()
+    if isinstance(store, NullStore):
+        return Markup(render())
+
+    generation = store.get(_generation_key(namespace))
+    if generation is None:
+        # Never fall back to a fixed token: entries of an evicted generation must stay unreachable
+        generation = _new_generation()
+        store.set(_generation_key(namespace), generation)
+    key = f"{namespace}:{generation}:{date.today().isoformat()}:{tuple(key_parts)!r}"
+    html = store.get(key)
+    if html is not None:
+        _count('hits')
+        return Markup(html)
+
+    _count('misses')
+    html = str(render())
+
+    # Right after an invalidation the replica may not have the write yet; do not cache what it returned
+    changed_at = int(generation.rsplit('.', 1)[-1])
+    if reading_from_replica() and time.time() - changed_at < current_app.config.get('REPLICA_READ_YOUR_WRITES_SECONDS', 5):
+        return Markup(html)
+    store.set(key, html, current_app.config.get('FRAGMENT_CACHE_TTL', 300))
+    return Markup(html)
+
+
+def render_macro(template_name, macro_name, *args, **kwargs):
+    """Render a template macro on its own (the fragments are macros, so they can be cached)"""
+    return get_template_attribute(template_name, macro_name)(*args, **kwargs)
+
+
+def clear():
+    """Drop every cached fragment; returns the number of entries removed"""
+    return _store().clear()
+
+
+def get_stats():
+    """Hit, miss and invalidation counters of this process"""
+    with _lock:
+        stats = dict(_stats)
+    stats['backend'] = type(_store()).__name__
+    return stats
@@ -0,0 +1,218 @@
+"""
+Schema Migrations Module
+Applies the ordered SQL scripts in database/migrations and records them in schema_version
+"""
+from app import db
+from .models import SchemaVersion
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import SQLAlchemyError
+from urllib.parse import urlparse, unquote
+import os
+import re
+
+MIGRATION_FILE = re.compile(r'^(\d{4})_(\w+)\.sql$')
+
+
+class Migration:
+    """One migration script: database/migrations/NNNN_name.sql"""
+
+    def __init__(self, version, name, path):
+        self.version = version
+        self.name = name
+        self.path = path
+
+    def statements(self):
+        """SQL statements of the script, split the same way setup_database.py splits tables.sql"""
+        with open(self.path, 'r', encoding='utf-8') as file:
+            lines = file.read().split('\n')
+
+        statements, current = [], []
+        for line in lines:
+            if line.strip().startswith('--') or line.strip().startswith('#'):
+                continue
+            current.append(line)
+            if line.strip().endswith(';'):
+                statement = '\n'.join(current).strip().rstrip(';')
+                if statement:
+                    statements.append(statement)
+                current = []
+        return statements
+
+
+def _migrations_dir():
+    return current_app.config['MIGRATIONS_DIR']
+
+
+def discover_migrations():
+    """
+    List the migration scripts in version order
+
+    Returns:
+        list: Migration objects
+
+    Raises:
+        ValueError: If two scripts share a version number
+    """
+    migrations = {}
+    directory = _migrations_dir()
+    for filename in sorted(os.listdir(directory)) if os.path.isdir(directory) else []:
+        match = MIGRATION_FILE.match(filename)
+        if not match:
+            continue
+        version = int(match.group(1))
+        if version in migrations:
+            raise ValueError(f"Duplicate migration version {version:04d}: {filename}")
+        migrations[version] = Migration(version, match.group(2), os.path.join(directory, filename))
+    return [migrations[version] for version in sorted(migrations)]
+
+
+def is_versioned():
+    """True when the database has a schema_version table"""
+    return inspect(db.engine).has_table(SchemaVersion.__tablename__)
+
+
+def get_applied_versions():
+    """Versions recorded in schema_version (empty if the table does not exist)"""
+    if not is_versioned():
+        return set()
+    return {row.Version for row in db.session.query(SchemaVersion.Version).all()}
+
+
+def get_current_version():
+    """Highest applied migration version, 0 for an unversioned database"""
+    return max(get_applied_versions(), default=0)
+
+
+def get_pending_migrations():
+    """Migrations not yet recorded in schema_version, in version order"""
+    applied = get_applied_versions()
+    return [migration for migration in discover_migrations() if migration.version not in applied]
+
+
+def _record(migration):
+    db.session.add(SchemaVersion(Version=migration.version, Name=migration.name, Applied_At=datetime.now()))
+
+
+def apply_migration(migration):
+    """
+    Run one migration and record it
+
+    MySQL commits DDL implicitly, so a script that fails halfway leaves its
+    earlier statements applied; keep each script small and re-runnable.
+
+    Args:
+        migration: Migration to apply
+
+    Raises:
+        SQLAlchemyError: If a statement fails; the version is not recorded
+    """
+    try:
+        for statement in migration.statements():
+            db.session.execute(text(statement))
+        _record(migration)
+        db.session.commit()
+    except SQLAlchemyError:
+        db.session.rollback()
+        raise
+
+
+def upgrade(target=None):
+    """
+    Apply pending migrations in order
+
+    Args:
+        target: Stop after this version (default: apply all)
+
+    Returns:
+        list: Migrations that were applied
+    """
+    SchemaVersion.__table__.create(db.engine, checkfirst=True)
+
+    applied = []
+    for migration in get_pending_migrations():
+        if target is not None and migration.version > target:
+            break
+        apply_migration(migration)
+        applied.append(migration)
+    return applied
+
+
+def stamp(target=None):
+    """
+    Mark migrations as applied without running them
+
+    For databases whose schema already matches a migration (e.g. created
+    from tables.sql or by an earlier create_all).
+
+    Args:
+        target: Mark versions up to this one (default: all)
+
+    Returns:
+        list: Migrations that were marked
+    """
+    SchemaVersion.__table__.create(db.engine, checkfirst=True)
+
+    stamped = []
+    for migration in get_pending_migrations():
+        if target is not None and migration.version > target:
+            break
+        _record(migration)
+        stamped.append(migration)
+    db.session.commit()
+    return stamped
+
+
+def create_database_if_not_exists(db_uri):
+    """
+    Create the MySQL database named in the URI if it is missing
+
+    Returns:
+        bool: True if the database exists (or the URI is not MySQL)
+    """
+    parsed = urlparse(db_uri)
+    if not parsed.scheme.startswith('mysql'):
+        return True
+
+    import mysql.connector
+    from mysql.connector import Error
+
+    database_name = parsed.path.lstrip('/')
+    try:
+        connection = mysql.connector.connect(
+            host=parsed.hostname or 'localhost',
+            port=parsed.port or 3306,
+            user=parsed.username,
+            password=unquote(parsed.password) if parsed.password else ''
+        )
+        cursor = connection.cursor()
+        cursor.execute(f"CREATE DATABASE IF NOT EXISTS `{database_name}`")
+        cursor.close()
+        connection.close()
+        return True
+    except Error as e:
+        print(f"⚠ Database creation error: {e}")
+        return False
+
+
+def init_database():
+    """
+    Prepare a database for migrations
+
+    An empty database gets the full schema from the models and is stamped
+    with every migration. A database that already has tables only gets the
+    schema_version table; run upgrade (or stamp) afterwards.
+
+    Returns:
+        str: 'created' or 'existing'
+    """
+    create_database_if_not_exists(current_app.config['SQLALCHEMY_DATABASE_URI'])
+
+    if not inspect(db.engine).get_table_names():
+        db.create_all()
+        stamp()
+        return 'created'
+
+    SchemaVersion.__table__.create(db.engine, checkfirst=True)
+    return 'existing'
@@ -26,11 +26,18 @@ class User(db.Model, BaseMixin):
     Role = db.Column(db.Integer, db.ForeignKey('Role.Role_ID'))
     Dept_ID = db.Column(db.Integer, db.ForeignKey('Department.Dept_ID'))  # Foreign key reference to Department
     Verified = db.Column(db.Integer, default=0, nullable=False)  # Default value of 0, only 0 or 1 are valid
+    Unread_Notifications = db.Column(db.Integer, default=0, nullable=False)  # Counter cache for the header badge
     modified_date = db.Column(db.DateTime, default=db.func.current_timestamp())
     
     department = db.relationship('Department', backref='users', lazy=True)
     role = db.relationship('Role', backref='users', lazy=True)
 
+    __table_args__ = (
+        db.Index('ix_user_username', 'Username', 'User_ID'),
+        db.Index('ix_user_verified', 'Verified', 'User_ID'),
+        db.Index('ix_user_role_verified', 'Role', 'Verified'),
+    )
+
 class EventType(db.Model, BaseMixin):
     __tablename__ = 'Event_Type'
     Event_Type_ID = db.Column(db.Integer, primary_key=True)
@@ -54,6 +61,10 @@ class Event(db.Model, BaseMixin):
     event_type = db.relationship('EventType', backref='events', lazy=True)
     department = db.relationship('Department', backref='events', lazy=True)
 
+    __table_args__ = (
+        db.Index('ix_event_date', 'Date', 'Event_ID'),
+    )
+
 class SubEvent(db.Model, BaseMixin):
     __tablename__ = 'Sub_Event'
     Sub_Event_ID = db.Column(db.Integer, primary_key=True, autoincrement=True)
@@ -122,15 +133,30 @@ class Transaction(db.Model, BaseMixin):
     transaction_category = db.relationship('TransactionCategory', backref='transactions', lazy=True)
     account_category = db.relationship('AccountCategory', backref='transactions', lazy=True)
 
+    # Hot filter paths: per-event totals by nature/category/mode, sub-event scope and the dated ledger
+    __table_args__ = (
+        db.Index('ix_transaction_event_nature', 'Event_ID', 'Nature_ID'),
+        db.Index('ix_transaction_event_category', 'Event_ID', 'Transaction_Category_ID'),
+        db.Index('ix_transaction_event_mode', 'Event_ID', 'Mode_ID'),
+        db.Index('ix_transaction_event_date', 'Event_ID', 'Date', 'Transaction_ID'),
+        db.Index('ix_transaction_sub_event_date', 'Sub_Event_ID', 'Date', 'Transaction_ID'),
+        db.Index('ix_transaction_date', 'Date'),
+    )
+
         
 class TransactionItem(db.Model):
     __tablename__ = 'transactionitem'
 
     # Make sure these are the correct column names
     TransactionItem_ID = db.Column(db.Integer, primary_key=True)
-    Transaction_ID = db.Column(db.Integer, db.ForeignKey('transaction_table.Transaction_ID'))
-    Description = db.Column(db.String(255))
-    Amount = db.Column(db.Float)
+    Transaction_ID = db.Column(db.Integer, db.ForeignKey('transaction_table.Transaction_ID'), nullable=False)
+    Description = db.Column(db.Text)
+    Amount = db.Column(DECIMAL(10, 2), nullable=False)
+
+    # Covers SUM(Amount) per transaction without reading the rows
+    __table_args__ = (
+        db.Index('ix_transactionitem_transaction_amount', 'Transaction_ID', 'Amount'),
+    )
 
     # Relationship if needed, though it might not be necessary for the query
     transaction = db.relationship('Transaction', backref='items')
@@ -143,6 +169,8 @@ class Budget(db.Model, BaseMixin):
     Notes = db.Column(db.Text, nullable=True)  # Optional description or notes
     Event_ID = db.Column(db.Integer, db.ForeignKey('Event.Event_ID'), nullable=True)  # Linked to Event
     Sub_Event_ID = db.Column(db.Integer, db.ForeignKey('Sub_Event.Sub_Event_ID'), nullable=True)  # Linked to SubEvent
+    Spent_Total = db.Column(DECIMAL(14, 2), nullable=False, default=0.00)  # Running expense total of the event / sub-event
+    Notified_Threshold = db.Column(db.Integer, nullable=False, default=0)  # Highest usage threshold (%) already notified
     modified_date = db.Column(db.DateTime, default=func.current_timestamp(), onupdate=func.current_timestamp())
 
     # Relationships with Event and SubEvent
@@ -150,6 +178,50 @@ class Budget(db.Model, BaseMixin):
     sub_event = db.relationship('SubEvent', backref='budgets', lazy=True)
 
 
+class EventFinancialSummary(db.Model, BaseMixin):
+    __tablename__ = 'Event_Financial_Summary'
+    Summary_ID = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    Event_ID = db.Column(db.Integer, db.ForeignKey('Event.Event_ID'), nullable=False)
+    Sub_Event_ID = db.Column(db.Integer, db.ForeignKey('Sub_Event.Sub_Event_ID'), nullable=True)
+    Nature_ID = db.Column(db.Integer, db.ForeignKey('Transaction_Nature.Nature_ID'), nullable=True)
+    Transaction_Category_ID = db.Column(db.Integer, db.ForeignKey('Transaction_Category.Transaction_Category_ID'), nullable=True)
+    Mode_ID = db.Column(db.Integer, db.ForeignKey('Payment_Mode.Mode_ID'), nullable=True)
+    Total_Amount = db.Column(DECIMAL(14, 2), nullable=False, default=0.00)  # Sum of item amounts for this key
+    Item_Count = db.Column(db.Integer, nullable=False, default=0)  # Number of items for this key
+    modified_date = db.Column(db.DateTime, default=func.current_timestamp(), onupdate=func.current_timestamp())
+
+    # NOT NULL copies of the nullable key columns (0 = none): a unique key over NULLs does not stop duplicates
+    Sub_Event_Key = db.Column(db.Integer, db.Computed('COALESCE(Sub_Event_ID, 0)'))
+    Nature_Key = db.Column(db.Integer, db.Computed('COALESCE(Nature_ID, 0)'))
+    Category_Key = db.Column(db.Integer, db.Computed('COALESCE(Transaction_Category_ID, 0)'))
+    Mode_Key = db.Column(db.Integer, db.Computed('COALESCE(Mode_ID, 0)'))
+
+    __table_args__ = (
+        db.UniqueConstraint('Event_ID', 'Sub_Event_Key', 'Nature_Key', 'Category_Key', 'Mode_Key',
+                            name='uq_event_financial_summary_key'),
+    )
+
+
+class ReportJob(db.Model, BaseMixin):
+    __tablename__ = 'Report_Job'
+    Job_ID = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    Event_ID = db.Column(db.Integer, db.ForeignKey('Event.Event_ID'), nullable=False)
+    User_ID = db.Column(db.Integer, db.ForeignKey('User.User_ID'), nullable=False)  # Requested by
+    Format = db.Column(db.String(10), nullable=False)  # xlsx, pdf
+    Status = db.Column(db.String(20), nullable=False, default='queued')  # queued, running, done, failed
+    Progress = db.Column(db.Integer, nullable=False, default=0)  # 0-100
+    File_Path = db.Column(db.String(500), nullable=True)
+    File_Name = db.Column(db.String(255), nullable=True)
+    Error = db.Column(db.Text, nullable=True)
+    Created_At = db.Column(db.DateTime, default=func.current_timestamp())
+    Started_At = db.Column(db.DateTime, nullable=True)
+    Completed_At = db.Column(db.DateTime, nullable=True)
+
+    # Relationships
+    event = db.relationship('Event', backref='report_jobs', lazy=True)
+    user = db.relationship('User', backref='report_jobs', lazy=True)
+
+
 class Notification(db.Model, BaseMixin):
     __tablename__ = 'Notification'
     Notification_ID = db.Column(db.Integer, primary_key=True, autoincrement=True)
@@ -167,6 +239,29 @@ class Notification(db.Model, BaseMixin):
     event = db.relationship('Event', backref='notifications', lazy=True)
     transaction = db.relationship('Transaction', backref='notifications', lazy=True)
 
+    __table_args__ = (
+        db.Index('ix_notification_user_read_created', 'User_ID', 'Is_Read', 'Created_At'),
+        db.Index('ix_notification_user_created', 'User_ID', 'Created_At', 'Notification_ID'),
+    )
+
+
+class NotificationArchive(db.Model, BaseMixin):
+    __tablename__ = 'Notification_Archive'
+    Notification_ID = db.Column(db.Integer, primary_key=True)  # Same ID as in Notification
+    User_ID = db.Column(db.Integer, db.ForeignKey('User.User_ID'), nullable=False)
+    Title = db.Column(db.String(200), nullable=False)
+    Message = db.Column(db.Text, nullable=False)
+    Type = db.Column(db.String(50), default='info')
+    Is_Read = db.Column(db.Boolean, default=True)
+    Created_At = db.Column(db.DateTime)
+    Related_Event_ID = db.Column(db.Integer, nullable=True)
+    Related_Transaction_ID = db.Column(db.Integer, nullable=True)
+    Archived_At = db.Column(db.DateTime, default=func.current_timestamp())
+
+    __table_args__ = (
+        db.Index('ix_notification_archive_user_created', 'User_ID', 'Created_At'),
+    )
+
 
 class ActivityLog(db.Model, BaseMixin):
     __tablename__ = 'Activity_Log'
@@ -182,3 +277,13 @@ class ActivityLog(db.Model, BaseMixin):
     # Relationship
     user = db.relationship('User', backref='activity_logs', lazy=True)
 
+    __table_args__ = (
+        db.Index('ix_activity_log_timestamp', 'Timestamp'),
+    )
+
+
+class SchemaVersion(db.Model, BaseMixin):
+    __tablename__ = 'schema_version'
+    Version = db.Column(db.Integer, primary_key=True, autoincrement=False)  # NNNN of database/migrations/NNNN_name.sql
+    Name = db.Column(db.String(255), nullable=False)
+    Applied_At = db.Column(db.DateTime, nullable=False, default=func.current_timestamp())
@@ -0,0 +1,81 @@
+"""
+Keyset Pagination Module
+Cursor helpers for paging through rows ordered by (date or datetime, id) newest first
+"""
+from datetime import date, datetime
+from sqlalchemy import and_, or_
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def get_page_size(args, default=DEFAULT_PAGE_SIZE):
+    """Read the 'per_page' query argument, clamped to 1..MAX_PAGE_SIZE"""
+    try:
+        page_size = int(args.get('per_page', default))
+    except (TypeError, ValueError):
+        page_size = default
+    return max(1, min(page_size, MAX_PAGE_SIZE))
+
+
+def format_cursor(row_date, row_id):
+    """Encode a (date, id) position as an opaque URL-safe cursor, e.g. '2024-12-20.42' or '2024-12-20T09:30:00.42'"""
+    return f"{row_date.isoformat()}.{row_id}"
+
+
+def parse_cursor(cursor):
+    """Decode a cursor made by format_cursor; returns None when missing or malformed"""
+    if not cursor:
+        return None
+    try:
+        date_part, id_part = cursor.rsplit('.', 1)
+        parse = datetime.fromisoformat if 'T' in date_part else date.fromisoformat
+        return parse(date_part), int(id_part)
+    except ValueError:
+        return None
+
+
+def older_than(date_column, id_column, position):
+    """Rows strictly after position in (date DESC, id DESC) order"""
+    row_date, row_id = position
+    return or_(date_column < row_date, and_(date_column == row_date, id_column < row_id))
+
+
+def newer_than(date_column, id_column, position):
+    """Rows strictly before position in (date DESC, id DESC) order"""
+    row_date, row_id = position
+    return or_(date_column > row_date, and_(date_column == row_date, id_column > row_id))
+
+
+def keyset_page(query, date_column, id_column, page_size, after=None, before=None):
+    """
+    Fetch one page of a query in (date DESC, id DESC) order
+
+    Args:
+        query: Query selecting the rows, without ordering
+        date_column, id_column: Columns forming the sort key
+        page_size: Maximum number of rows on the page
+        after: Cursor of the last row of the previous page (older rows follow)
+        before: Cursor of the first row of the next page (newer rows precede)
+
+    Returns:
+        tuple: (rows, has_older, has_newer)
+    """
+    after, before = parse_cursor(after), parse_cursor(before)
+
+    if before is not None:
+        # Walk backwards towards newer rows, then restore newest-first order
+        rows = (
+            query.filter(newer_than(date_column, id_column, before))
+            .order_by(date_column.asc(), id_column.asc())
+            .limit(page_size + 1)
+            .all()
+        )
+        has_newer = len(rows) > page_size
+        return list(reversed(rows[:page_size])), True, has_newer
+
+    if after is not None:
+        query = query.filter(older_than(date_column, id_column, after))
+    rows = query.order_by(date_column.desc(), id_column.desc()).limit(page_size + 1).all()
+    has_older = len(rows) > page_size
+    return rows[:page_size], has_older, after is not None
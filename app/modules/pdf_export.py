@@ -0,0 +1,223 @@
+"""
+PDF Export Module
+Renders an event's financial report to PDF with xhtml2pdf
+"""
+from .financial_snapshot import get_event_snapshot
+from . import reference_cache
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from flask import current_app
+from io import BytesIO
+from itertools import chain, islice
+from pypdf import PdfReader
+from pypdf.generic import ArrayObject, DictionaryObject, IndirectObject, NameObject
+from tempfile import SpooledTemporaryFile
+from xhtml2pdf import pisa
+import gc
+import threading
+
+PDF_TEMPLATE = 'finance_manager/report_pdf.html'
+DEFAULT_ROWS_PER_PART = 2000
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor(workers):
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=workers)
+        return _executor
+
+
+def render_pdf_part(html_content):
+    """
+    Convert one rendered HTML document to PDF bytes
+
+    Runs in PDF render worker processes, so it only takes plain strings.
+    """
+    pdf_file = BytesIO()
+    pisa_status = pisa.CreatePDF(html_content, dest=pdf_file)
+    if pisa_status.err:
+        raise Exception("Error generating PDF")
+    return pdf_file.getvalue()
+
+
+def _render_html_parts(event, snapshot, rows_per_part):
+    """
+    Yield the report as HTML documents of at most rows_per_part ledger rows
+
+    The first part carries the event information and summary, the last one
+    the footer. Ledger rows are streamed, so only one part is held at a time.
+    """
+    template = current_app.jinja_env.get_template(PDF_TEMPLATE)
+    context = dict(
+        event=event,
+        department_name=reference_cache.get_name('department', event.Dept_ID, 'N/A'),
+        event_type_name=reference_cache.get_name('event_type', event.Event_Type_ID, 'N/A'),
+        revenue=snapshot.revenue,
+        expense=snapshot.expense,
+        profit_loss=snapshot.profit_loss,
+        budget_amount=snapshot.budget_amount,
+        category_data=snapshot.category_breakdown,
+        now=datetime.now().strftime('%B %d, %Y %I:%M %p')
+    )
+
+    rows = snapshot.iter_ledger_rows()
+    chunk = list(islice(rows, rows_per_part))
+    first_part = True
+    while True:
+        next_chunk = list(islice(rows, rows_per_part))
+        yield template.render(
+            context,
+            transaction_data=chunk,
+            first_part=first_part,
+            last_part=not next_chunk
+        )
+        if not next_chunk:
+            return
+        chunk, first_part = next_chunk, False
+
+
+class _StreamingPdfMerger:
+    """
+    Concatenate PDF documents into a file one document at a time
+
+    pypdf's PdfWriter keeps every appended page until write(). Here each
+    document's pages, and the objects they reference, are renumbered and
+    written to the output as soon as the document is added, so only one
+    document is loaded at a time; what stays in memory is a byte offset per
+    written object and an object number per page. Only the pages are carried
+    over (no outlines or forms), which is all xhtml2pdf produces.
+    """
+
+    CATALOG, PAGES = 1, 2
+
+    def __init__(self, output):
+        self.output = output
+        self.offsets = {}
+        self.kids = []
+        self.next_number = self.PAGES + 1
+        output.write(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+
+    def _reserve(self):
+        number, self.next_number = self.next_number, self.next_number + 1
+        return number
+
+    def append(self, pdf_bytes):
+        reader = PdfReader(BytesIO(pdf_bytes))
+        numbers, pending = {}, []
+
+        def renumber(obj):
+            # Replace references to the document's objects with their new numbers, queueing unseen ones
+            if isinstance(obj, IndirectObject):
+                if obj.pdf is not reader:
+                    return obj  # Already points into the merged file
+                key = (obj.idnum, obj.generation)
+                if key not in numbers:
+                    numbers[key] = self._reserve()
+                    pending.append((numbers[key], obj.get_object()))
+                return IndirectObject(numbers[key], 0, None)
+            if isinstance(obj, DictionaryObject):
+                for key, value in list(obj.items()):
+                    obj[key] = renumber(value)
+            elif isinstance(obj, ArrayObject):
+                for index, value in enumerate(obj):
+                    obj[index] = renumber(value)
+            return obj
+
+        # Pages first (reader.pages copies inherited attributes onto each page),
+        # re-parented to the merged page tree so the old tree is never reached
+        for page in reader.pages:
+            reference = page.indirect_reference
+            number = numbers[(reference.idnum, reference.generation)] = self._reserve()
+            page[NameObject('/Parent')] = IndirectObject(self.PAGES, 0, None)
+            pending.append((number, page))
+            self.kids.append(number)
+
+        while pending:
+            number, obj = pending.pop()
+            self._write_object(number, renumber(obj))
+
+        # The reader's objects reference each other: free this part now instead of
+        # letting parts pile up until the next automatic cycle collection
+        del reader, pending
+        gc.collect()
+
+    def _write_object(self, number, obj):
+        self.offsets[number] = self.output.tell()
+        self.output.write(f'{number} 0 obj\n'.encode())
+        obj.write_to_stream(self.output, None)
+        self.output.write(b'\nendobj\n')
+
+    def close(self):
+        """Write the page tree, catalog, cross-reference table and trailer"""
+        kids = ' '.join(f'{number} 0 R' for number in self.kids)
+        for number, body in (
+            (self.PAGES, f'<< /Type /Pages /Kids [{kids}] /Count {len(self.kids)} >>'),
+            (self.CATALOG, f'<< /Type /Catalog /Pages {self.PAGES} 0 R >>'),
+        ):
+            self.offsets[number] = self.output.tell()
+            self.output.write(f'{number} 0 obj\n{body}\nendobj\n'.encode())
+
+        xref_offset = self.output.tell()
+        self.output.write(f'xref\n0 {self.next_number}\n0000000000 65535 f \n'.encode())
+        for number in range(1, self.next_number):
+            self.output.write(f'{self.offsets[number]:010d} 00000 n \n'.encode())
+        self.output.write(
+            f'trailer\n<< /Size {self.next_number} /Root {self.CATALOG} 0 R >>\n'
+            f'startxref\n{xref_offset}\n%%EOF\n'.encode()
+        )
+
+
+def build_event_pdf(event):
+    """
+    Render the financial report of an event as a PDF
+
+    Ledgers longer than PDF_ROWS_PER_PART rows are split into parts that
+    are converted separately (in PDF_RENDER_WORKERS processes, if set) and
+    streamed into the output as they finish, so peak memory is bounded by the
+    part size (times the parts in flight) rather than the ledger length.
+
+    Args:
+        event: Event model instance
+
+    Returns:
+        SpooledTemporaryFile: The PDF, positioned at the start
+    """
+    snapshot = get_event_snapshot(event.Event_ID)
+    rows_per_part = current_app.config.get('PDF_ROWS_PER_PART', DEFAULT_ROWS_PER_PART)
+    workers = current_app.config.get('PDF_RENDER_WORKERS', 0)
+
+    html_parts = _render_html_parts(event, snapshot, rows_per_part)
+    first_html = next(html_parts)
+    next_html = next(html_parts, None)
+
+    output = SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    if next_html is None:
+        # Single part: no worker pool and nothing to merge
+        output.write(render_pdf_part(first_html))
+        output.seek(0)
+        return output
+
+    merger = _StreamingPdfMerger(output)
+    if workers > 0:
+        # Keep a couple of parts per worker in flight and merge them in order
+        executor = _get_executor(workers)
+        pending = deque()
+        for html_content in chain([first_html, next_html], html_parts):
+            pending.append(executor.submit(render_pdf_part, html_content))
+            if len(pending) >= workers * 2:
+                merger.append(pending.popleft().result())
+        while pending:
+            merger.append(pending.popleft().result())
+    else:
+        for html_content in chain([first_html, next_html], html_parts):
+            merger.append(render_pdf_part(html_content))
+
+    merger.close()
+    output.seek(0)
+    return output
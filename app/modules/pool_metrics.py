@@ -0,0 +1,115 @@
+"""
+Connection Pool Metrics Module
+Counts connection checkouts, waits, timeouts and invalidations of the SQLAlchemy pool
+"""
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import Pool, QueuePool
+import threading
+import time
+
+DEFAULT_SLOW_CHECKOUT_MS = 100
+
+_stats = {
+    'checkouts': 0,
+    'checkins': 0,
+    'connects': 0,
+    'invalidations': 0,
+    'timeouts': 0,
+    'slow_checkouts': 0,
+    'wait_total_ms': 0.0,
+    'wait_max_ms': 0.0,
+}
+_lock = threading.Lock()
+_slow_checkout_ms = DEFAULT_SLOW_CHECKOUT_MS
+_listening = False
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection"""
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            with _lock:
+                _stats['timeouts'] += 1
+            print(f"⚠ Timed out waiting for a database connection ({self.status()})")
+            raise
+        _record_wait((time.perf_counter() - start) * 1000, self)
+        return connection
+
+
+def _record_wait(wait_ms, pool):
+    with _lock:
+        _stats['wait_total_ms'] += wait_ms
+        _stats['wait_max_ms'] = max(_stats['wait_max_ms'], wait_ms)
+        slow = wait_ms >= _slow_checkout_ms
+        if slow:
+            _stats['slow_checkouts'] += 1
+    if slow:
+        print(f"⚠ Waited {wait_ms:.0f} ms for a database connection ({pool.status()})")
+
+
+def _count(counter):
+    def listener(*args):
+        with _lock:
+            _stats[counter] += 1
+    return listener
+
+
+def init_app(app):
+    """
+    Instrument the pool of the app's engine; call before db.init_app(app)
+
+    Server databases get InstrumentedQueuePool unless SQLALCHEMY_ENGINE_OPTIONS
+    names another poolclass. Pool events are counted for every engine.
+    """
+    global _slow_checkout_ms, _listening
+    _slow_checkout_ms = app.config.get('DB_POOL_SLOW_CHECKOUT_MS', DEFAULT_SLOW_CHECKOUT_MS)
+
+    options = app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {}
+    if 'pool_size' in options and 'poolclass' not in options:
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {**options, 'poolclass': InstrumentedQueuePool}
+
+    if not _listening:
+        event.listen(Pool, 'checkout', _count('checkouts'))
+        event.listen(Pool, 'checkin', _count('checkins'))
+        event.listen(Pool, 'connect', _count('connects'))
+        event.listen(Pool, 'invalidate', _count('invalidations'))
+        _listening = True
+
+
+def get_stats(engine):
+    """
+    Current pool state plus counters of this process
+
+    Args:
+        engine: SQLAlchemy engine (db.engine)
+
+    Returns:
+        dict: Pool size, checked out / idle / overflow connections, checkout
+        counts and the average and maximum checkout wait
+    """
+    pool = engine.pool
+    with _lock:
+        stats = dict(_stats)
+
+    timed = isinstance(pool, InstrumentedQueuePool)
+    stats.update(
+        pool_class=type(pool).__name__,
+        status=pool.status(),
+        wait_avg_ms=round(stats['wait_total_ms'] / stats['checkouts'], 2) if timed and stats['checkouts'] else None,
+        wait_max_ms=round(stats['wait_max_ms'], 2) if timed else None,
+    )
+    del stats['wait_total_ms']
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=pool.overflow(),
+            timeout=pool.timeout(),
+        )
+    return stats
@@ -0,0 +1,128 @@
+"""
+Reference Data Cache Module
+Keeps the small lookup tables (categories, modes, natures, roles, departments, event types) in process memory
+"""
+from app import db
+from .models import TransactionCategory, PaymentMode, TransactionNature, Role, Department, EventType
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+import threading
+import time
+
+# Cached lookup tables: name -> (model, id column, name column)
+REFERENCE_TABLES = {
+    'category': (TransactionCategory, 'Transaction_Category_ID', 'Category_Name'),
+    'mode': (PaymentMode, 'Mode_ID', 'Mode_Name'),
+    'nature': (TransactionNature, 'Nature_ID', 'Nature_Name'),
+    'role': (Role, 'Role_ID', 'Role_Name'),
+    'department': (Department, 'Dept_ID', 'Name'),
+    'event_type': (EventType, 'Event_Type_ID', 'Event_Type_Name'),
+}
+
+DEFAULT_TTL = 300  # seconds
+
+_cache = {}  # table name -> (loaded_at, rows, names by id, ids by name)
+_lock = threading.Lock()
+
+
+def _ttl():
+    try:
+        return current_app.config.get('REFERENCE_CACHE_TTL', DEFAULT_TTL)
+    except RuntimeError:
+        return DEFAULT_TTL
+
+
+def _load(table):
+    model, id_column, name_column = REFERENCE_TABLES[table]
+    rows = (
+        db.session.query(getattr(model, id_column), getattr(model, name_column))
+        .order_by(getattr(model, id_column))
+        .all()
+    )
+    names = {row[0]: row[1] for row in rows}
+    ids = {row[1]: row[0] for row in rows}
+    return time.monotonic(), rows, names, ids
+
+
+def _get_entry(table):
+    entry = _cache.get(table)
+    if entry is None or time.monotonic() - entry[0] > _ttl():
+        entry = _load(table)
+        with _lock:
+            _cache[table] = entry
+    return entry
+
+
+def get_rows(table):
+    """
+    Get every row of a lookup table ordered by ID
+
+    Rows are plain (ID, Name) tuples that keep the model's column names as
+    attributes (e.g., row.Mode_ID, row.Mode_Name), so templates can use them
+    in place of model instances.
+    """
+    return _get_entry(table)[1]
+
+
+def get_names(table):
+    """Get an ID -> name dictionary for a lookup table"""
+    return _get_entry(table)[2]
+
+
+def get_name(table, item_id, default=None):
+    """Resolve a lookup table ID to its name"""
+    if item_id is None or item_id == '':
+        return default
+    try:
+        item_id = int(item_id)
+    except (TypeError, ValueError):
+        return default
+    return _get_entry(table)[2].get(item_id, default)
+
+
+def get_id_by_name(table, name):
+    """Resolve a lookup table name (e.g., 'Revenue') to its ID"""
+    return _get_entry(table)[3].get(name)
+
+
+def invalidate(table=None):
+    """Drop one cached lookup table, or all of them when table is None"""
+    with _lock:
+        if table is None:
+            _cache.clear()
+        else:
+            _cache.pop(table, None)
+
+
+_tables_by_model = {model: table for table, (model, _, _) in REFERENCE_TABLES.items()}
+
+
+@event.listens_for(Session, 'after_flush')
+def _track_reference_writes(session, flush_context):
+    """Remember which lookup tables were written in this session"""
+    for instance in list(session.new) + list(session.dirty) + list(session.deleted):
+        table = _tables_by_model.get(type(instance))
+        if table:
+            session.info.setdefault('reference_tables_written', set()).add(table)
+
+
+@event.listens_for(Session, 'after_bulk_update')
+@event.listens_for(Session, 'after_bulk_delete')
+def _track_reference_bulk_writes(context):
+    """Same as _track_reference_writes for query.update() / query.delete()"""
+    table = _tables_by_model.get(context.mapper.class_)
+    if table:
+        context.session.info.setdefault('reference_tables_written', set()).add(table)
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_after_commit(session):
+    """Invalidate written lookup tables once the change is committed"""
+    for table in session.info.pop('reference_tables_written', ()):
+        invalidate(table)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_reference_writes(session):
+    session.info.pop('reference_tables_written', None)
@@ -0,0 +1,199 @@
+"""
+Report Cache Module
+Keeps generated Excel/PDF reports on disk, keyed by event, format and data version
+"""
+from app import db
+from .models import Budget, EventFinancialSummary, Transaction, TransactionItem
+from . import reference_cache
+from flask import current_app
+from sqlalchemy import func, select
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+_stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+_lock = threading.Lock()
+
+
+def _count(counter):
+    with _lock:
+        _stats[counter] += 1
+
+
+def _cache_dir():
+    return current_app.config['REPORT_CACHE_DIR']
+
+
+def _entry_path(event_id, report_format, version):
+    return os.path.join(_cache_dir(), f"event_{event_id}_{version}.{report_format}")
+
+
+def get_data_version(event):
+    """
+    Fingerprint everything an event report is built from
+
+    Transactions, items, budget and the materialized summary are reduced to
+    row counts, max IDs, sums and max modified_date in one query (item writes
+    touch their transaction's modified_date); the event header and lookup
+    names, including the department and event type, come from memory.
+
+    Args:
+        event: Event model instance
+
+    Returns:
+        str: Hex digest that changes whenever the report would change
+    """
+    event_id = event.Event_ID
+    event_transactions = select(Transaction.Transaction_ID).where(Transaction.Event_ID == event_id)
+
+    def scalar(*columns, where):
+        return [select(column).where(where).scalar_subquery() for column in columns]
+
+    data = db.session.execute(select(
+        *scalar(func.count(Transaction.Transaction_ID), func.max(Transaction.Transaction_ID),
+                func.max(Transaction.modified_date), where=Transaction.Event_ID == event_id),
+        *scalar(func.count(TransactionItem.TransactionItem_ID), func.max(TransactionItem.TransactionItem_ID),
+                func.sum(TransactionItem.Amount), where=TransactionItem.Transaction_ID.in_(event_transactions)),
+        *scalar(func.count(Budget.Budget_ID), func.sum(Budget.Amount),
+                func.max(Budget.modified_date), where=Budget.Event_ID == event_id),
+        *scalar(func.max(EventFinancialSummary.modified_date), where=EventFinancialSummary.Event_ID == event_id),
+    )).one()
+
+    fingerprint = repr((
+        tuple(data),
+        event.Name, event.Date, event.Dept_ID, event.Event_Type_ID,
+        reference_cache.get_name('department', event.Dept_ID),
+        reference_cache.get_name('event_type', event.Event_Type_ID),
+        sorted(reference_cache.get_names('category').items()),
+        sorted(reference_cache.get_names('nature').items()),
+        sorted(reference_cache.get_names('mode').items()),
+    ))
+    return hashlib.sha256(fingerprint.encode('utf-8')).hexdigest()[:32]
+
+
+def lookup(event_id, report_format, version):
+    """
+    Find a cached report and mark it as recently used
+
+    Args:
+        event_id: Event the report belongs to
+        report_format: 'xlsx' or 'pdf'
+        version: Data version from get_data_version
+
+    Returns:
+        str: Path of the cached file, or None on a miss
+    """
+    path = _entry_path(event_id, report_format, version)
+    try:
+        os.utime(path)
+    except OSError:
+        _count('misses')
+        return None
+    _count('hits')
+    return path
+
+
+def store(event_id, report_format, version, artifact):
+    """
+    Copy a freshly built report into the cache and evict old entries
+
+    The file is written under a temporary name and renamed into place, so
+    concurrent workers never serve a half-written report.
+
+    Args:
+        event_id: Event the report belongs to
+        report_format: 'xlsx' or 'pdf'
+        version: Data version the report was built from
+        artifact: Readable file object positioned at the start
+
+    Returns:
+        str: Path of the cached file
+    """
+    cache_dir = _cache_dir()
+    os.makedirs(cache_dir, exist_ok=True)
+    path = _entry_path(event_id, report_format, version)
+
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+    with os.fdopen(fd, 'wb') as target:
+        shutil.copyfileobj(artifact, target)
+    os.replace(tmp_path, path)
+    _count('stores')
+
+    evict(keep=path)
+    return path
+
+
+def _entries():
+    cache_dir = _cache_dir()
+    entries = []
+    for entry in os.scandir(cache_dir) if os.path.isdir(cache_dir) else []:
+        if entry.is_file() and not entry.name.endswith('.tmp'):
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+    return entries
+
+
+def evict(keep=None):
+    """
+    Delete least recently used reports until the cache fits REPORT_CACHE_MAX_BYTES
+
+    Args:
+        keep: Path that must not be evicted (the entry just stored)
+
+    Returns:
+        int: Number of files removed
+    """
+    max_bytes = current_app.config.get('REPORT_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES)
+    entries = sorted(_entries())
+    total = sum(size for _, size, _ in entries)
+
+    removed = 0
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        if path == keep:
+            continue
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+        _count('evictions')
+    return removed
+
+
+def clear():
+    """Remove every cached report; returns the number of files removed"""
+    removed = 0
+    for _, _, path in _entries():
+        try:
+            os.remove(path)
+            removed += 1
+        except OSError:
+            pass
+    return removed
+
+
+def get_stats():
+    """
+    Hit/miss counters of this process plus the current size of the cache
+
+    Returns:
+        dict: hits, misses, stores, evictions, hit_rate, entries, bytes, max_bytes
+    """
+    with _lock:
+        stats = dict(_stats)
+    lookups = stats['hits'] + stats['misses']
+    entries = _entries()
+    stats.update(
+        hit_rate=round(stats['hits'] / lookups, 3) if lookups else 0.0,
+        entries=len(entries),
+        bytes=sum(size for _, size, _ in entries),
+        max_bytes=current_app.config.get('REPORT_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES),
+    )
+    return stats
@@ -0,0 +1,252 @@
+"""
+Report Jobs Module
+Generates Excel and PDF reports in a local process pool and tracks them in Report_Job
+"""
+from app import db
+from .models import Event, ReportJob
+from .activity_logger import log_activity, create_notification
+from . import report_cache, audit_writer
+from app.db_routing import recently_wrote, use_replica
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from flask import current_app
+from sqlalchemy.exc import SQLAlchemyError
+import os
+import shutil
+import threading
+import time
+
+REPORT_FORMATS = {
+    'xlsx': {
+        'label': 'Excel',
+        'mimetype': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        'notification_title': 'Financial Report Generated',
+        'notification_noun': 'an Excel report',
+    },
+    'pdf': {
+        'label': 'PDF',
+        'mimetype': 'application/pdf',
+        'notification_title': 'PDF Report Generated',
+        'notification_noun': 'a PDF report',
+    },
+}
+
+_executor = None
+_executor_lock = threading.Lock()
+_worker_app = None
+
+
+def _init_worker(config_name):
+    """Process pool initializer: each worker builds its own app and engine"""
+    global _worker_app
+    from app import create_app
+    _worker_app = create_app(config_name)
+
+    # Pool workers exit without running atexit handlers, so they write activity log entries directly
+    _worker_app.config['AUDIT_QUEUE_SIZE'] = 0
+    audit_writer.init_app(_worker_app)
+
+
+def _get_executor(app):
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=app.config['REPORT_WORKERS'],
+                initializer=_init_worker,
+                initargs=(app.config['CONFIG_NAME'],)
+            )
+        return _executor
+
+
+def enqueue_report(event_id, user_id, report_format):
+    """
+    Create a Report_Job and hand it to the worker pool
+
+    If the report cache already holds the report for the event's current
+    data version the job is completed from it right away. With
+    REPORT_WORKERS = 0 the job runs immediately in the calling process.
+    The report is read from the replica unless the user has just written.
+
+    Args:
+        event_id: Event to report on
+        user_id: User requesting the report
+        report_format: 'xlsx' or 'pdf'
+
+    Returns:
+        ReportJob: The new job, or None if it could not be created
+    """
+    if report_format not in REPORT_FORMATS:
+        raise ValueError(f"Unknown report format: {report_format}")
+
+    read_from_replica = not recently_wrote()
+    try:
+        with use_replica(read_from_replica):
+            event = db.session.get(Event, event_id)
+            cached_path = report_cache.lookup(event_id, report_format, report_cache.get_data_version(event))
+
+        job = ReportJob(Event_ID=event_id, User_ID=user_id, Format=report_format, Status='queued', Progress=0)
+        db.session.add(job)
+        db.session.commit()
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        print(f"Error creating report job: {e}")
+        return None
+
+    if cached_path:
+        _update_job(job, Started_At=datetime.now())
+        _complete_job(job, event, cached_path)
+        return job
+
+    app = current_app._get_current_object()
+    if app.config.get('REPORT_WORKERS', 0) > 0:
+        _get_executor(app).submit(run_report_job, job.Job_ID, read_from_replica)
+    else:
+        _run_report_job(job.Job_ID, read_from_replica)
+        db.session.refresh(job)
+    return job
+
+
+def get_report_job(job_id, user_id):
+    """Fetch a job owned by the given user, or None"""
+    return ReportJob.query.filter_by(Job_ID=job_id, User_ID=user_id).first()
+
+
+def run_report_job(job_id, read_from_replica=True):
+    """Worker entry point: run a job inside the worker's own app context"""
+    with _worker_app.app_context():
+        _run_report_job(job_id, read_from_replica)
+
+
+def _update_job(job, **fields):
+    for key, value in fields.items():
+        setattr(job, key, value)
+    db.session.commit()
+
+
+def _build_artifact(event, report_format):
+    """Build the report and return a readable file object positioned at the start"""
+    if report_format == 'xlsx':
+        from .excel_export import build_event_workbook
+        return build_event_workbook(event)
+    from .pdf_export import build_event_pdf
+    return build_event_pdf(event)
+
+
+def _run_report_job(job_id, read_from_replica=True):
+    job = db.session.get(ReportJob, job_id)
+    if job is None:
+        print(f"Report job {job_id} not found")
+        return
+
+    report_format = REPORT_FORMATS[job.Format]
+    label = report_format['label']
+    try:
+        _update_job(job, Status='running', Progress=10, Started_At=datetime.now())
+        event_id, job_format = job.Event_ID, job.Format  # job status stays on the primary
+
+        # Reads for the report may go to the replica; any write switches back to the primary
+        with use_replica(read_from_replica):
+            event = db.session.get(Event, event_id)
+            if event is None:
+                raise ValueError(f"Event {event_id} not found")
+
+            # Version the data before building, so edits made meanwhile get a new entry
+            version = report_cache.get_data_version(event)
+            artifact = _build_artifact(event, job_format)
+        _update_job(job, Progress=80)
+
+        file_path = report_cache.store(event_id, job_format, version, artifact)
+        artifact.close()
+    except Exception as e:
+        db.session.rollback()
+        print(f"Error generating {label} report for job {job_id}: {e}")
+        _update_job(job, Status='failed', Error=str(e), Completed_At=datetime.now())
+        create_notification(
+            user_id=job.User_ID,
+            title='Report Failed',
+            message=f'Your {label} report could not be generated. Please try again.',
+            notification_type='danger',
+            event_id=job.Event_ID
+        )
+        return
+
+    _complete_job(job, event, file_path)
+
+
+def _job_file(job, cached_path):
+    """
+    Give the job its own link to the cached report
+
+    Cache eviction deletes cache entries, so a finished job must not point into
+    the cache. A hard link costs no extra space while the entry is cached (a copy
+    is made where links are not possible). Job files older than
+    REPORT_JOB_FILE_MAX_AGE_HOURS are removed; their downloads then report the
+    file as no longer available.
+    """
+    jobs_dir = os.path.join(current_app.config['REPORT_OUTPUT_DIR'], 'jobs')
+    os.makedirs(jobs_dir, exist_ok=True)
+    _prune_job_files(jobs_dir)
+
+    path = os.path.join(jobs_dir, f"job_{job.Job_ID}.{job.Format}")
+    if os.path.exists(path):
+        os.remove(path)
+    try:
+        os.link(cached_path, path)
+    except OSError:
+        shutil.copyfile(cached_path, path)
+    return path
+
+
+def _prune_job_files(jobs_dir):
+    max_age = current_app.config.get('REPORT_JOB_FILE_MAX_AGE_HOURS', 168) * 3600
+    cutoff = time.time() - max_age
+    for entry in os.scandir(jobs_dir):
+        try:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+        except OSError:
+            continue
+
+
+def _complete_job(job, event, cached_path):
+    """Mark a job done and log/notify only once the report actually exists"""
+    report_format = REPORT_FORMATS[job.Format]
+    label = report_format['label']
+    try:
+        file_path = _job_file(job, cached_path)
+    except OSError as e:
+        print(f"Error saving report for job {job.Job_ID}: {e}")
+        _update_job(job, Status='failed', Error=str(e), Completed_At=datetime.now())
+        return
+    _update_job(
+        job,
+        Status='done',
+        Progress=100,
+        File_Path=file_path,
+        File_Name=f"{event.Name.replace(' ', '_')}_Financial_Report.{job.Format}",
+        Completed_At=datetime.now()
+    )
+
+    log_activity(
+        user_id=job.User_ID,
+        action='generated',
+        entity_type='Report',
+        entity_id=event.Event_ID,
+        description=f'Finance Manager generated {label} report for event "{event.Name}"'
+    )
+    if event.Event_Manager:
+        create_notification(
+            user_id=event.Event_Manager,
+            title=report_format['notification_title'],
+            message=f'Finance Manager has generated {report_format["notification_noun"]} for event "{event.Name}"',
+            notification_type='info',
+            event_id=event.Event_ID
+        )
+    create_notification(
+        user_id=job.User_ID,
+        title='Report Ready',
+        message=f'Your {label} report for event "{event.Name}" is ready to download.',
+        notification_type='success',
+        event_id=event.Event_ID
+    )
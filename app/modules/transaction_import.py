@@ -0,0 +1,415 @@
+"""
+Transaction Import Module
+Bulk import of transactions and items from a CSV or XLSX file, inserted in chunks in one DB transaction
+"""
+from app import db
+from flask import current_app
+from .models import Event, SubEvent, Transaction, TransactionItem
+from .activity_logger import log_activity, create_notifications_bulk
+from .financial_summary import apply_summary_delta
+from . import reference_cache
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+from datetime import datetime, date
+from decimal import Decimal, InvalidOperation
+import csv
+import io
+
+DEFAULT_CHUNK_SIZE = 500
+LARGE_TRANSACTION_AMOUNT = 10000  # Same threshold as notify_large_transaction
+
+# Accepted column headings (case, spaces and underscores ignored) -> row field
+COLUMNS = {
+    'date': 'date',
+    'billno': 'bill_no',
+    'partyname': 'party_name',
+    'party': 'party_name',
+    'nature': 'nature',
+    'mode': 'mode',
+    'paymentmode': 'mode',
+    'category': 'category',
+    'description': 'description',
+    'amount': 'amount',
+    'subeventid': 'sub_event_id',
+}
+REQUIRED_COLUMNS = ('date', 'nature', 'mode', 'category', 'description', 'amount')
+
+# Lookup table behind each reference column
+LOOKUPS = {'nature': 'nature', 'mode': 'mode', 'category': 'category'}
+
+# Row fields shared by all items of one transaction
+TRANSACTION_FIELDS = ('date', 'bill_no', 'party_name', 'nature', 'mode', 'category', 'sub_event_id')
+
+
+class ImportFileError(ValueError):
+    """The file cannot be read as a transaction import (wrong format or missing columns)"""
+
+
+def _column_key(heading):
+    return ''.join(ch for ch in str(heading or '').lower() if ch.isalnum())
+
+
+def _rows_from_header(header, rows):
+    fields = [COLUMNS.get(_column_key(heading)) for heading in header]
+    missing = [column for column in REQUIRED_COLUMNS if column not in fields]
+    if missing:
+        raise ImportFileError(f"Missing columns: {', '.join(missing)}")
+
+    for values in rows:
+        record = {}
+        for field, value in zip(fields, values):
+            if field:
+                record[field] = value
+        yield record
+
+
+def iter_csv_rows(stream):
+    """Yield one dict per CSV line (UTF-8, optional BOM) without reading the whole file"""
+    reader = csv.reader(io.TextIOWrapper(stream, encoding='utf-8-sig', newline=''))
+    header = next(reader, None)
+    if header is None:
+        raise ImportFileError("The file is empty")
+    yield from _rows_from_header(header, reader)
+
+
+def iter_xlsx_rows(stream):
+    """Yield one dict per row of the first worksheet, read with openpyxl's read-only mode"""
+    from openpyxl import load_workbook  # Only loaded for XLSX imports
+
+    try:
+        workbook = load_workbook(stream, read_only=True, data_only=True)
+    except Exception as e:
+        raise ImportFileError(f"Not a valid XLSX file: {e}")
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            raise ImportFileError("The file is empty")
+        yield from _rows_from_header(header, rows)
+    finally:
+        workbook.close()
+
+
+def iter_rows(stream, filename):
+    """Pick the reader from the file extension (.csv or .xlsx)"""
+    extension = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+    if extension == 'csv':
+        return iter_csv_rows(stream)
+    if extension == 'xlsx':
+        return iter_xlsx_rows(stream)
+    raise ImportFileError("Upload a .csv or .xlsx file")
+
+
+def _text(value):
+    if value is None:
+        return ''
+    return str(value).strip()
+
+
+def _lookup_ids(table):
+    """name (lower case) or ID as text -> ID, from the cached lookup table"""
+    ids = {}
+    for item_id, name in reference_cache.get_names(table).items():
+        ids[str(item_id)] = item_id
+        ids[str(name).strip().lower()] = item_id
+    return ids
+
+
+def _parse_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(_text(value), "%Y-%m-%d").date()
+
+
+def _parse_amount(value):
+    amount = Decimal(_text(value).replace(',', ''))
+    if not amount.is_finite() or amount <= 0:
+        raise InvalidOperation
+    return amount.quantize(Decimal('0.01'))
+
+
+def validate_row(record, lookups, sub_event_ids):
+    """
+    Check one row against the lookup tables and the event's sub-events
+
+    Args:
+        record: Row dict as yielded by iter_rows
+        lookups: {column: ids by name} from _lookup_ids
+        sub_event_ids: IDs of the event's sub-events, or None when the import targets a sub-event
+
+    Returns:
+        tuple: (cleaned row dict, list of error messages)
+    """
+    errors = []
+    row = {
+        'bill_no': _text(record.get('bill_no')) or None,
+        'party_name': _text(record.get('party_name')) or None,
+        'description': _text(record.get('description')),
+    }
+
+    try:
+        row['date'] = _parse_date(record.get('date'))
+    except (TypeError, ValueError):
+        errors.append(f"Invalid date '{_text(record.get('date'))}' (use YYYY-MM-DD)")
+
+    try:
+        row['amount'] = _parse_amount(record.get('amount'))
+    except (InvalidOperation, ValueError):
+        errors.append(f"Invalid amount '{_text(record.get('amount'))}' (must be a positive number)")
+
+    for column, ids in lookups.items():
+        value = _text(record.get(column))
+        # Spreadsheet IDs arrive as floats (e.g. 1.0)
+        if value.endswith('.0') and value[:-2].isdigit():
+            value = value[:-2]
+        row[column] = ids.get(value.lower())
+        if row[column] is None:
+            errors.append(f"Unknown {column} '{value}'" if value else f"{column.capitalize()} is required")
+
+    if not row['description']:
+        errors.append("Description is required")
+    if row['bill_no'] and len(row['bill_no']) > 50:
+        errors.append("Bill number is longer than 50 characters")
+    if row['party_name'] and len(row['party_name']) > 100:
+        errors.append("Party name is longer than 100 characters")
+
+    row['sub_event_id'] = None
+    sub_event = _text(record.get('sub_event_id'))
+    if sub_event and sub_event_ids is not None:
+        try:
+            row['sub_event_id'] = int(float(sub_event))
+        except (ValueError, OverflowError):
+            row['sub_event_id'] = None
+        if row['sub_event_id'] not in sub_event_ids:
+            errors.append(f"Sub-event {sub_event} does not belong to this event")
+
+    return row, errors
+
+
+def _insert_transactions(rows):
+    """
+    Insert a chunk of transaction rows and return their IDs in row order
+
+    The items need these IDs, so they must come back in row order: with RETURNING
+    SQLAlchemy batches the rows where the database can guarantee that order and
+    inserts them one by one otherwise; MySQL has no RETURNING, so each row is
+    inserted on its own to read its auto-increment ID. Either way there is no
+    commit per row, and the items of the whole chunk go in with one executemany.
+    """
+    dialect = db.session.get_bind(mapper=Transaction.__mapper__, clause=insert(Transaction)).dialect
+    if getattr(dialect, 'insert_executemany_returning_sort_by_parameter_order', False):
+        statement = insert(Transaction).returning(Transaction.Transaction_ID, sort_by_parameter_order=True)
+        return list(db.session.execute(statement, rows).scalars())
+    return [db.session.execute(insert(Transaction).values(**row)).inserted_primary_key[0] for row in rows]
+
+
+class _Importer:
+    """Groups validated rows into transactions and writes them chunk by chunk"""
+
+    def __init__(self, user_id, event_id, sub_event_id, chunk_size, dry_run):
+        self.user_id = user_id
+        self.event_id = event_id
+        self.sub_event_id = sub_event_id
+        self.chunk_size = chunk_size
+        self.dry_run = dry_run
+        self.pending = []  # [(transaction row, [item rows], amount)]
+        self.deltas = {}  # summary key -> [amount, item count]
+        self.large = []  # (transaction ID, amount) at or above LARGE_TRANSACTION_AMOUNT
+        self.transactions = 0
+        self.items = 0
+        self.total = Decimal('0')
+        self.writing = not dry_run
+
+    def add(self, group):
+        first = group[0]
+        amount = sum((row['amount'] for row in group), Decimal('0'))
+        sub_event_id = self.sub_event_id or first['sub_event_id']
+        transaction_row = {
+            'User_ID': self.user_id,
+            'Event_ID': self.event_id,
+            'Sub_Event_ID': sub_event_id,
+            'Bill_No': first['bill_no'],
+            'Party_Name': first['party_name'],
+            'Nature_ID': first['nature'],
+            'Mode_ID': first['mode'],
+            'Transaction_Category_ID': first['category'],
+            'Date': first['date'],
+        }
+        item_rows = [{'Description': row['description'], 'Amount': float(row['amount'])} for row in group]
+
+        key = (self.event_id, sub_event_id, first['nature'], first['category'], first['mode'])
+        delta = self.deltas.setdefault(key, [Decimal('0'), 0])
+        delta[0] += amount
+        delta[1] += len(group)
+
+        self.transactions += 1
+        self.items += len(group)
+        self.total += amount
+        if self.writing:
+            self.pending.append((transaction_row, item_rows, amount))
+            if len(self.pending) >= self.chunk_size:
+                self.flush()
+
+    def flush(self):
+        """Insert the pending transactions with one statement and their items with one executemany"""
+        if not self.pending:
+            return
+        transaction_ids = _insert_transactions([transaction_row for transaction_row, _, _ in self.pending])
+        item_rows = []
+        for transaction_id, (_, items, amount) in zip(transaction_ids, self.pending):
+            item_rows.extend(dict(item, Transaction_ID=transaction_id) for item in items)
+            if amount >= LARGE_TRANSACTION_AMOUNT:
+                self.large.append((transaction_id, amount))
+        db.session.execute(insert(TransactionItem), item_rows)
+        self.pending = []
+
+    def stop_writing(self):
+        """An invalid row was found: nothing will be committed, so keep validating without inserting"""
+        self.writing = False
+        self.pending = []
+
+
+def _resolve_target(event_id):
+    """
+    Resolve the route's ID like create_transaction: an Event, or else a Sub_Event of one
+
+    Returns:
+        tuple: (event, sub-event ID or None, IDs of the event's sub-events or None)
+    """
+    event = Event.query.get(event_id)
+    if event:
+        sub_event_ids = {row[0] for row in db.session.query(SubEvent.Sub_Event_ID).filter_by(Event_ID=event_id)}
+        return event, None, sub_event_ids
+
+    sub_event = SubEvent.query.get(event_id)
+    if not sub_event:
+        return None, None, None
+    return Event.query.get(sub_event.Event_ID), sub_event.Sub_Event_ID, None
+
+
+def import_transactions(user_id, event_id, rows, dry_run=False, chunk_size=None):
+    """
+    Import transactions for an event (or sub-event) from parsed file rows
+
+    Each row is one transaction item. Consecutive rows with the same bill number,
+    date, party, nature, mode, category and sub-event form one transaction; rows
+    without a bill number are transactions of their own.
+
+    All rows are validated first-to-last while valid transactions are inserted in
+    chunks of IMPORT_CHUNK_SIZE (one statement for the transactions, one
+    executemany for their items) inside a single DB transaction. The summary and
+    budget totals are updated once per summary key and everything is committed
+    together; if any row is invalid nothing is committed, so a corrected file can
+    be imported again without duplicates. Budget thresholds and notifications are
+    evaluated once, in the same transaction.
+
+    Args:
+        user_id: Importing user (recorded on the transactions)
+        event_id: Event_ID, or a Sub_Event_ID as in create_transaction
+        rows: Iterable of row dicts (iter_rows)
+        dry_run: Validate only, insert nothing
+        chunk_size: Transactions per insert (default: IMPORT_CHUNK_SIZE)
+
+    Returns:
+        dict: ok, committed, dry_run, rows, transactions, items, total and
+            errors ([{'row': file line, 'errors': [messages]}])
+    """
+    chunk_size = chunk_size or current_app.config.get('IMPORT_CHUNK_SIZE', DEFAULT_CHUNK_SIZE)
+    report = {'ok': False, 'committed': False, 'dry_run': dry_run, 'rows': 0,
+              'transactions': 0, 'items': 0, 'total': 0.0, 'errors': []}
+
+    event, sub_event_id, sub_event_ids = _resolve_target(event_id)
+    if not event:
+        report['errors'].append({'row': None, 'errors': ["Event or Sub-Event not found."]})
+        return report
+
+    lookups = {column: _lookup_ids(table) for column, table in LOOKUPS.items()}
+    importer = _Importer(user_id, event.Event_ID, sub_event_id, chunk_size, dry_run)
+
+    group, group_key = [], None
+    try:
+        for line, record in enumerate(rows, start=2):  # Line 1 is the header
+            if not any(_text(value) for value in record.values()):
+                continue
+            report['rows'] += 1
+            row, errors = validate_row(record, lookups, sub_event_ids)
+            if errors:
+                report['errors'].append({'row': line, 'errors': errors})
+                importer.stop_writing()
+                continue
+
+            key = tuple(row[field] for field in TRANSACTION_FIELDS)
+            if group and (key != group_key or not row['bill_no']):
+                importer.add(group)
+                group = []
+            group.append(row)
+            group_key = key
+        if group:
+            importer.add(group)
+
+        report.update(transactions=importer.transactions, items=importer.items, total=float(importer.total))
+        if report['errors'] or dry_run:
+            db.session.rollback()
+            report['ok'] = not report['errors']
+            return report
+
+        importer.flush()
+        # One summary (and budget) update per key instead of one per transaction
+        for key, (amount, count) in importer.deltas.items():
+            apply_summary_delta(key, amount, count)
+        if importer.transactions:
+            _notify_import(user_id, event, importer)
+        db.session.commit()
+    except (ImportFileError, UnicodeDecodeError, csv.Error) as e:
+        db.session.rollback()
+        report['errors'].append({'row': None, 'errors': [str(e)]})
+        return report
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        print(f"✗ Error importing transactions: {e}")
+        report['errors'].append({'row': None, 'errors': ["The transactions could not be saved."]})
+        return report
+
+    report['ok'] = report['committed'] = True
+    if importer.transactions:
+        log_activity(
+            user_id=user_id,
+            action='imported',
+            entity_type='Transaction',
+            entity_id=event.Event_ID,
+            description=f'Imported {importer.transactions} transactions ({importer.items} items) for ₹{importer.total:,.2f}'
+        )
+    return report
+
+
+def _notify_import(user_id, event, importer):
+    """Notifications and budget check, once per import and in its DB transaction"""
+    from .budget_monitor import check_budget_thresholds
+
+    notifications = []
+    if event.Finance_Manager:
+        notifications.append({
+            'user_id': event.Finance_Manager,
+            'title': 'Transactions Imported',
+            'message': f'Event Manager imported {importer.transactions} transactions for ₹{importer.total:,.2f} in event "{event.Name}"',
+            'notification_type': 'info',
+            'event_id': event.Event_ID,
+        })
+    for transaction_id, amount in importer.large:
+        notifications.extend(
+            {
+                'user_id': manager_id,
+                'title': '💰 Large Transaction Alert',
+                'message': f'Large transaction of ₹{amount:,.2f} was created in event "{event.Name}"',
+                'notification_type': 'warning',
+                'event_id': event.Event_ID,
+                'transaction_id': transaction_id,
+            }
+            for manager_id in (event.Finance_Manager, event.Event_Manager) if manager_id and manager_id != user_id
+        )
+    # Inserted directly: queue_notifications would commit on its own outside a request (CLI)
+    create_notifications_bulk(notifications)
+
+    check_budget_thresholds(event.Event_ID, commit=False)
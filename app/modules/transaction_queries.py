@@ -0,0 +1,44 @@
+"""
+Transaction Query Module
+Shared transaction list queries that load items and item totals without per-row lazy loads
+"""
+from app import db
+from .models import Transaction, TransactionItem
+from sqlalchemy import func, select
+from sqlalchemy.orm import selectinload
+
+
+def item_total_subquery():
+    """Correlated SUM of TransactionItem.Amount for the enclosing Transaction row"""
+    return (
+        select(func.coalesce(func.sum(TransactionItem.Amount), 0))
+        .where(TransactionItem.Transaction_ID == Transaction.Transaction_ID)
+        .scalar_subquery()
+    )
+
+
+def transactions_with_totals(with_items=False):
+    """
+    Build a query returning (Transaction, Item_Total) rows
+
+    The item total is computed in SQL. With with_items=True the items of
+    every returned transaction are loaded in one extra SELECT ... IN query,
+    so reading transaction.items in a loop does not hit the database again.
+    Lookup names (nature, mode, category) should be resolved through
+    reference_cache rather than the lazy relationships.
+
+    Args:
+        with_items: Eager-load Transaction.items
+
+    Returns:
+        Query: Callers add their own filter() and order_by()
+    """
+    query = db.session.query(Transaction, item_total_subquery().label('Item_Total'))
+    if with_items:
+        query = query.options(selectinload(Transaction.items))
+    return query
+
+
+def event_scope(event_id, is_sub_event=False):
+    """Filter criterion selecting the transactions of an event or sub-event"""
+    return (Transaction.Sub_Event_ID if is_sub_event else Transaction.Event_ID) == event_id
@@ -1,6 +1,9 @@
 from app import db
 from .models import *
 from .db_queries import filter_data
+from .aggregations import get_grouped_totals, sum_grouped_totals
+from . import reference_cache
+from sqlalchemy import func
 from sqlalchemy.exc import SQLAlchemyError
 
 def get_transaction_ids(event_id, transaction_nature=None, transaction_category=None, transaction_mode=None):
@@ -77,14 +80,13 @@ def get_transaction_amounts(transaction_ids):
         return []  # Return an empty list if no IDs are provided
 
     try:
-        amounts = []
-        for transaction_id in transaction_ids:
-            # Query for each transaction ID individually
-            transaction_items = filter_data(TransactionItem, filters={"Transaction_ID": transaction_id}, columns=["Amount"])
-            
-            for item in transaction_items:
-                amounts.append(item.Amount)  # Collecting each Amount one by one
-        return amounts
+        # Query all the items for the given transactions at once
+        transaction_items = (
+            db.session.query(TransactionItem.Amount)
+            .filter(TransactionItem.Transaction_ID.in_(transaction_ids))
+            .all()
+        )
+        return [item.Amount for item in transaction_items]
     except SQLAlchemyError as e:
         print(f"Error reading entries: {e}")
         return []
@@ -93,9 +95,19 @@ def get_transaction_amounts(transaction_ids):
 
 def calculate_total_amount(transaction_ids):
     """Calculate the total amount for the given list of Transaction_IDs."""
-    amounts = get_transaction_amounts(transaction_ids)
-    total = sum(amounts)
-    return total
+    if not transaction_ids:
+        return 0
+
+    try:
+        total = (
+            db.session.query(func.sum(TransactionItem.Amount))
+            .filter(TransactionItem.Transaction_ID.in_(transaction_ids))
+            .scalar()
+        )
+        return total or 0
+    except SQLAlchemyError as e:
+        print(f"Error reading entries: {e}")
+        return 0
 
 
 def get_revenue_total(event_id, is_sub_event=False):
@@ -106,8 +118,7 @@ def get_revenue_total(event_id, is_sub_event=False):
     nature_id = get_nature_id("Revenue")  # Dynamically fetch Nature_ID
     if not nature_id:
         raise ValueError("Revenue nature not found.")
-    transaction_ids = get_transaction_ids_by_nature(event_id, nature_id, is_sub_event)
-    return calculate_total_amount(transaction_ids)
+    return sum_grouped_totals(get_grouped_totals(event_id, is_sub_event), nature_id=nature_id)
 
 def get_expense_total(event_id, is_sub_event=False):
     """
@@ -117,35 +128,30 @@ def get_expense_total(event_id, is_sub_event=False):
     nature_id = get_nature_id("Expense")  # Dynamically fetch Nature_ID
     if not nature_id:
         raise ValueError("Expense nature not found.")
-    transaction_ids = get_transaction_ids_by_nature(event_id, nature_id, is_sub_event)
-    return calculate_total_amount(transaction_ids)
+    return sum_grouped_totals(get_grouped_totals(event_id, is_sub_event), nature_id=nature_id)
 
 def get_category_total(event_id, category_id, is_sub_event=False):
     """
     Get total amount for a specific Transaction-Category in an event or sub-event.
     """
-    transaction_ids = get_transaction_ids_by_category(event_id, category_id, is_sub_event)
-    return calculate_total_amount(transaction_ids)
+    return sum_grouped_totals(get_grouped_totals(event_id, is_sub_event), category_id=category_id)
 
 def get_mode_total(event_id, mode_id, is_sub_event=False):
     """
     Get total amount for a specific Transaction-Mode in an event or sub-event.
     """
-    transaction_ids = get_transaction_ids_by_mode(event_id, mode_id, is_sub_event)
-    return calculate_total_amount(transaction_ids)
+    return sum_grouped_totals(get_grouped_totals(event_id, is_sub_event), mode_id=mode_id)
 
 def get_nature_id(nature_name):
     """
     Fetch Nature_ID based on Nature_Name (e.g., 'Revenue', 'Expense').
     """
-    nature = filter_data(TransactionNature, filters={"Nature_Name": nature_name}, columns=["Nature_ID"])
-    return nature[0].Nature_ID if nature else None
+    return reference_cache.get_id_by_name('nature', nature_name)
 
 # Helper Function: Fetch All Transaction Category IDs
 def get_all_transaction_category_ids():
     try:
-        categories = db.session.query(TransactionCategory.Transaction_Category_ID).all()
-        return [category[0] for category in categories]
+        return list(reference_cache.get_names('category'))
     except SQLAlchemyError as e:
         print("Error fetching transaction categories:", e)
         return []
@@ -153,8 +159,7 @@ def get_all_transaction_category_ids():
 # Helper Function: Fetch All Payment Mode IDs
 def get_all_payment_mode_ids():
     try:
-        modes = db.session.query(PaymentMode.Mode_ID).all()
-        return [mode[0] for mode in modes]
+        return list(reference_cache.get_names('mode'))
     except SQLAlchemyError as e:
         print("Error fetching payment modes:", e)
         return []
@@ -162,12 +167,10 @@ def get_all_payment_mode_ids():
 
 def get_category_name(category_id):
     """Fetch Category Name based on Transaction Category ID."""
-    category = filter_data(TransactionCategory, filters={"Transaction_Category_ID": category_id}, columns=["Category_Name"])
-    return category[0].Category_Name if category else "Unknown Category"
+    return reference_cache.get_name('category', category_id, "Unknown Category")
 
 def get_mode_name(mode_id):
     """Fetch Payment Mode Name based on Mode ID."""
-    mode = filter_data(PaymentMode, filters={"Mode_ID": mode_id}, columns=["Mode_Name"])
-    return mode[0].Mode_Name if mode else "Unknown Mode"
+    return reference_cache.get_name('mode', mode_id, "Unknown Mode")
 
 
@@ -0,0 +1,138 @@
+"""
+User Query Module
+Paginated user listing for the admin pages, sorted, filtered and counted in SQL
+"""
+from app import db
+from .models import User, Role, Department
+from . import reference_cache
+from sqlalchemy import func, or_
+
+# Sort keys accepted from the query string and the columns they order by
+USER_SORT_COLUMNS = {
+    'username': User.Username,
+    'email': User.Email,
+    'role': Role.Role_Name,
+    'department': Department.Name,
+}
+
+
+def user_listing_query():
+    """Users joined with their role and department names (one row per user)"""
+    return (
+        db.session.query(
+            User.User_ID,
+            User.Username,
+            User.Email,
+            User.Verified,
+            Role.Role_Name,
+            Department.Name.label('Department_Name'),
+        )
+        .outerjoin(Role, Role.Role_ID == User.Role)
+        .outerjoin(Department, Department.Dept_ID == User.Dept_ID)
+    )
+
+
+def get_user_page(page=1, page_size=50, sort_key='username', sort_order='asc',
+                  filter_role='', filter_department='', search='', verified=None):
+    """
+    Fetch one page of the user listing plus the total number of matching users
+
+    Args:
+        page: 1-based page number (clamped to the last page)
+        page_size: Users per page
+        sort_key: One of USER_SORT_COLUMNS (unknown keys sort by username)
+        sort_order: 'asc' or 'desc'
+        filter_role: Role_ID to keep, or '' for all
+        filter_department: Dept_ID to keep, or '' for all
+        search: Substring matched against username and email
+        verified: 0 or 1 to keep only unverified / verified users
+
+    Returns:
+        dict: rows (table dicts), total, page, pages, page_size
+    """
+    criteria = []
+    if filter_role:
+        criteria.append(User.Role == filter_role)
+    if filter_department:
+        criteria.append(User.Dept_ID == filter_department)
+    if search:
+        pattern = f'%{search}%'
+        criteria.append(or_(User.Username.ilike(pattern), User.Email.ilike(pattern)))
+    if verified is not None:
+        criteria.append(User.Verified == verified)
+
+    # The count needs no joins: each user has at most one role and one department
+    total = db.session.query(func.count(User.User_ID)).filter(*criteria).scalar() or 0
+    pages = max(1, -(-total // page_size))
+    page = max(1, min(page, pages))
+
+    query = user_listing_query().filter(*criteria)
+    sort_column = USER_SORT_COLUMNS.get(sort_key, User.Username)
+    if sort_order == 'desc':
+        query = query.order_by(sort_column.desc(), User.User_ID.desc())
+    else:
+        query = query.order_by(sort_column.asc(), User.User_ID.asc())
+    users = query.offset((page - 1) * page_size).limit(page_size).all()
+
+    rows = [
+        {
+            'user_id': user.User_ID,
+            'Full Name': user.Username.title(),
+            'Email': user.Email,
+            'Role': user.Role_Name or "N/A",
+            'Department': user.Department_Name or "N/A",
+        }
+        for user in users
+    ]
+    return {'rows': rows, 'total': total, 'page': page, 'pages': pages, 'page_size': page_size}
+
+
+def get_pending_users(limit=50):
+    """
+    Unverified users for the authorization cards, oldest first
+
+    Returns:
+        list: Dicts with id, name, email, role, department and verified (as get_user_info)
+    """
+    users = (
+        user_listing_query()
+        .filter(User.Verified == 0)
+        .order_by(User.User_ID)
+        .limit(limit)
+        .all()
+    )
+    return [
+        {
+            "id": user.User_ID,
+            "name": user.Username or "User Name",
+            "email": user.Email,
+            "role": user.Role_Name or "No Role Assigned",
+            "department": user.Department_Name or "No Department Assigned",
+            "verified": user.Verified,
+        }
+        for user in users
+    ]
+
+
+def get_user_counts():
+    """
+    Verified and unverified users per role, from one GROUP BY over (Role, Verified)
+
+    Returns:
+        dict: {role name: {'verified': n, 'unverified': n}} plus a 'Total' entry
+    """
+    rows = (
+        db.session.query(User.Role, User.Verified, func.count(User.User_ID))
+        .group_by(User.Role, User.Verified)
+        .all()
+    )
+    role_names = reference_cache.get_names('role')
+    counts = {}
+    total = {'verified': 0, 'unverified': 0}
+    for role_id, verified, count in rows:
+        key = 'verified' if verified == 1 else 'unverified'
+        role_counts = counts.setdefault(role_names.get(role_id, "No Role Assigned"), {'verified': 0, 'unverified': 0})
+        role_counts[key] += count
+        total[key] += count
+    counts['Total'] = total
+    return counts
@@ -0,0 +1,16 @@
+-- 0001: Composite indexes for the hot filter paths
+-- Per-event totals by nature / category / mode, sub-event scope, the dated ledger,
+-- per-transaction item sums, unread notifications and the activity log.
+
+CREATE INDEX ix_transaction_event_nature ON transaction_table (Event_ID, Nature_ID);
+CREATE INDEX ix_transaction_event_category ON transaction_table (Event_ID, Transaction_Category_ID);
+CREATE INDEX ix_transaction_event_mode ON transaction_table (Event_ID, Mode_ID);
+CREATE INDEX ix_transaction_event_date ON transaction_table (Event_ID, Date, Transaction_ID);
+CREATE INDEX ix_transaction_sub_event_date ON transaction_table (Sub_Event_ID, Date, Transaction_ID);
+CREATE INDEX ix_transaction_date ON transaction_table (Date);
+
+CREATE INDEX ix_transactionitem_transaction_amount ON transactionitem (Transaction_ID, Amount);
+
+CREATE INDEX ix_notification_user_read_created ON Notification (User_ID, Is_Read, Created_At);
+
+CREATE INDEX ix_activity_log_timestamp ON Activity_Log (Timestamp);
@@ -0,0 +1,27 @@
+-- 0002: Event_Financial_Summary running totals
+-- Filled from the existing transaction items, so totals are correct as soon as the upgrade finishes
+
+CREATE TABLE IF NOT EXISTS Event_Financial_Summary (
+    Summary_ID INT AUTO_INCREMENT PRIMARY KEY,
+    Event_ID INT NOT NULL,
+    Sub_Event_ID INT,
+    Nature_ID INT,
+    Transaction_Category_ID INT,
+    Mode_ID INT,
+    Total_Amount DECIMAL(14, 2) NOT NULL DEFAULT 0.00,
+    Item_Count INT NOT NULL DEFAULT 0,
+    modified_date DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    UNIQUE KEY uq_event_financial_summary_key (Event_ID, Sub_Event_ID, Nature_ID, Transaction_Category_ID, Mode_ID),
+    FOREIGN KEY (Event_ID) REFERENCES Event(Event_ID),
+    FOREIGN KEY (Sub_Event_ID) REFERENCES Sub_Event(Sub_Event_ID),
+    FOREIGN KEY (Nature_ID) REFERENCES Transaction_Nature(Nature_ID),
+    FOREIGN KEY (Transaction_Category_ID) REFERENCES Transaction_Category(Transaction_Category_ID),
+    FOREIGN KEY (Mode_ID) REFERENCES Payment_Mode(Mode_ID)
+);
+
+INSERT INTO Event_Financial_Summary (Event_ID, Sub_Event_ID, Nature_ID, Transaction_Category_ID, Mode_ID, Total_Amount, Item_Count)
+SELECT t.Event_ID, t.Sub_Event_ID, t.Nature_ID, t.Transaction_Category_ID, t.Mode_ID,
+       COALESCE(SUM(ti.Amount), 0), COUNT(ti.TransactionItem_ID)
+FROM transaction_table t
+JOIN transactionitem ti ON ti.Transaction_ID = t.Transaction_ID
+GROUP BY t.Event_ID, t.Sub_Event_ID, t.Nature_ID, t.Transaction_Category_ID, t.Mode_ID;
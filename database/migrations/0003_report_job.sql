@@ -0,0 +1,18 @@
+-- 0003: Report_Job table for background Excel/PDF exports
+
+CREATE TABLE IF NOT EXISTS Report_Job (
+    Job_ID INT AUTO_INCREMENT PRIMARY KEY,
+    Event_ID INT NOT NULL,
+    User_ID INT NOT NULL,
+    Format VARCHAR(10) NOT NULL,
+    Status VARCHAR(20) NOT NULL DEFAULT 'queued',
+    Progress INT NOT NULL DEFAULT 0,
+    File_Path VARCHAR(500),
+    File_Name VARCHAR(255),
+    Error TEXT,
+    Created_At DATETIME DEFAULT CURRENT_TIMESTAMP,
+    Started_At DATETIME,
+    Completed_At DATETIME,
+    FOREIGN KEY (Event_ID) REFERENCES Event(Event_ID),
+    FOREIGN KEY (User_ID) REFERENCES User(User_ID)
+);
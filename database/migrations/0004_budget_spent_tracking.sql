@@ -0,0 +1,27 @@
+-- 0004: Running expense total and last notified threshold on Budget
+-- Existing budgets are backfilled, and thresholds already passed count as notified
+
+ALTER TABLE Budget
+    ADD COLUMN Spent_Total DECIMAL(14, 2) NOT NULL DEFAULT 0.00,
+    ADD COLUMN Notified_Threshold INT NOT NULL DEFAULT 0;
+
+UPDATE Budget b
+SET b.Spent_Total = (
+    SELECT COALESCE(SUM(ti.Amount), 0)
+    FROM transaction_table t
+    JOIN transactionitem ti ON ti.Transaction_ID = t.Transaction_ID
+    JOIN Transaction_Nature n ON n.Nature_ID = t.Nature_ID
+    WHERE n.Nature_Name = 'Expense'
+      AND ((b.Event_ID IS NOT NULL AND t.Event_ID = b.Event_ID)
+        OR (b.Event_ID IS NULL AND t.Sub_Event_ID = b.Sub_Event_ID))
+);
+
+UPDATE Budget
+SET Notified_Threshold = CASE
+    WHEN Amount <= 0 THEN 0
+    WHEN Spent_Total >= Amount THEN 100
+    WHEN Spent_Total >= Amount * 0.90 THEN 90
+    WHEN Spent_Total >= Amount * 0.75 THEN 75
+    WHEN Spent_Total >= Amount * 0.50 THEN 50
+    ELSE 0
+END;
@@ -0,0 +1,11 @@
+-- 0005: Unread notification counter on User for the header badges
+
+ALTER TABLE User
+    ADD COLUMN Unread_Notifications INT NOT NULL DEFAULT 0;
+
+UPDATE User u
+SET u.Unread_Notifications = (
+    SELECT COUNT(*)
+    FROM Notification n
+    WHERE n.User_ID = u.User_ID AND n.Is_Read = FALSE
+);
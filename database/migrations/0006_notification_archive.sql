@@ -0,0 +1,18 @@
+-- 0006: Inbox index for cursor pagination and the archive table for old read notifications
+
+CREATE INDEX ix_notification_user_created ON Notification (User_ID, Created_At, Notification_ID);
+
+CREATE TABLE IF NOT EXISTS Notification_Archive (
+    Notification_ID INT PRIMARY KEY,
+    User_ID INT NOT NULL,
+    Title VARCHAR(200) NOT NULL,
+    Message TEXT NOT NULL,
+    Type VARCHAR(50) DEFAULT 'info',
+    Is_Read BOOLEAN DEFAULT TRUE,
+    Created_At DATETIME,
+    Related_Event_ID INT,
+    Related_Transaction_ID INT,
+    Archived_At DATETIME DEFAULT CURRENT_TIMESTAMP,
+    INDEX ix_notification_archive_user_created (User_ID, Created_At),
+    FOREIGN KEY (User_ID) REFERENCES User(User_ID)
+);
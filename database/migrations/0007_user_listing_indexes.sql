@@ -0,0 +1,6 @@
+-- 0007: Indexes for the paginated admin user listing
+-- Sorting by username, the pending-authorization list and the per-role verified counts.
+
+CREATE INDEX ix_user_username ON User (Username, User_ID);
+CREATE INDEX ix_user_verified ON User (Verified, User_ID);
+CREATE INDEX ix_user_role_verified ON User (Role, Verified);
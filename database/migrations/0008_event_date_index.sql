@@ -0,0 +1,4 @@
+-- 0008: Index for the admin event cards
+-- Status buckets (Date vs CURRENT_DATE), date windows and their ordering.
+
+CREATE INDEX ix_event_date ON Event (Date, Event_ID);
@@ -0,0 +1,28 @@
+-- 0009: NOT NULL unique key for Event_Financial_Summary
+-- MySQL treats NULLs as distinct, so the old key (Sub_Event_ID, ... nullable) let two concurrent
+-- first writes insert the same summary key twice. The new key is over generated COALESCE(..., 0)
+-- columns, which apply_summary_delta upserts against (INSERT ... ON DUPLICATE KEY UPDATE).
+-- Duplicate rows cannot be merged correctly (later deltas went to both), so they are dropped here:
+-- afterwards run 'flask summary verify' and, if it reports drift, 'flask summary rebuild'.
+
+ALTER TABLE Event_Financial_Summary
+    ADD COLUMN Sub_Event_Key INT AS (COALESCE(Sub_Event_ID, 0)),
+    ADD COLUMN Nature_Key INT AS (COALESCE(Nature_ID, 0)),
+    ADD COLUMN Category_Key INT AS (COALESCE(Transaction_Category_ID, 0)),
+    ADD COLUMN Mode_Key INT AS (COALESCE(Mode_ID, 0));
+
+DELETE s FROM Event_Financial_Summary s
+JOIN Event_Financial_Summary keep
+    ON keep.Event_ID = s.Event_ID
+   AND keep.Sub_Event_Key = s.Sub_Event_Key
+   AND keep.Nature_Key = s.Nature_Key
+   AND keep.Category_Key = s.Category_Key
+   AND keep.Mode_Key = s.Mode_Key
+   AND keep.Summary_ID < s.Summary_ID;
+
+CREATE UNIQUE INDEX uq_event_financial_summary_nn_key
+    ON Event_Financial_Summary (Event_ID, Sub_Event_Key, Nature_Key, Category_Key, Mode_Key);
+
+ALTER TABLE Event_Financial_Summary DROP INDEX uq_event_financial_summary_key;
+
+ALTER TABLE Event_Financial_Summary RENAME INDEX uq_event_financial_summary_nn_key TO uq_event_financial_summary_key;
@@ -0,0 +1,12 @@
+-- 0010: transactionitem back to exact amounts and a required parent
+-- Databases created by db.create_all() (or tables.sql between 0001 and 0009) have Amount FLOAT and a
+-- nullable Transaction_ID. Items without a transaction are never counted anywhere and are removed.
+
+DELETE FROM transactionitem WHERE Transaction_ID IS NULL;
+
+UPDATE transactionitem SET Amount = 0 WHERE Amount IS NULL;
+
+ALTER TABLE transactionitem
+    MODIFY Transaction_ID INT NOT NULL,
+    MODIFY Description TEXT,
+    MODIFY Amount DECIMAL(10, 2) NOT NULL;
@@ -10,15 +10,20 @@ CREATE TABLE Role (
     Role_Name VARCHAR(50) NOT NULL
 );
 
+-- 3. User Table
 CREATE TABLE User (
     User_ID INT AUTO_INCREMENT PRIMARY KEY ,
     Username VARCHAR(50) NOT NULL,
     Email VARCHAR(100) NOT NULL UNIQUE,
-    Password VARCHAR(255) NOT NULL,
+    Password VARCHAR(255) NOT NULL DEFAULT '',
     Role INT,
     Dept_ID INT,
-    Verified INT DEFAULT 0 CHECK (Verified IN (0, 1)),
+    Verified INT NOT NULL DEFAULT 0 CHECK (Verified IN (0, 1)),
+    Unread_Notifications INT NOT NULL DEFAULT 0,
     modified_date DATETIME DEFAULT CURRENT_TIMESTAMP,
+    INDEX ix_user_username (Username, User_ID),
+    INDEX ix_user_verified (Verified, User_ID),
+    INDEX ix_user_role_verified (Role, Verified),
     FOREIGN KEY (Role) REFERENCES Role(Role_ID),
     FOREIGN KEY (Dept_ID) REFERENCES Department(Dept_ID)
 );
@@ -39,8 +44,8 @@ CREATE TABLE Event (
     Date DATE NOT NULL,
     Days INT NOT NULL,
     Dept_ID INT,
-    Budget DECIMAL(10, 2) DEFAULT NULL,  -- Added budget column
     modified_date DATETIME DEFAULT CURRENT_TIMESTAMP,
+    INDEX ix_event_date (Date, Event_ID),
     FOREIGN KEY (Finance_Manager) REFERENCES User(User_ID),  
     FOREIGN KEY (Event_Manager) REFERENCES User(User_ID),
     FOREIGN KEY (Event_Type_ID) REFERENCES Event_Type(Event_Type_ID),
@@ -57,7 +62,6 @@ CREATE TABLE Sub_Event (
     Time TIME NOT NULL,
     Dept_ID INT,
     Event_ID INT,
-    Budget DECIMAL(10, 2) DEFAULT NULL,
     modified_date DATETIME DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (Sub_Event_Manager) REFERENCES User(User_ID),
     FOREIGN KEY (Event_Type_ID) REFERENCES Event_Type(Event_Type_ID),
@@ -68,32 +72,32 @@ CREATE TABLE Sub_Event (
 -- 7. Transaction_Nature Table
 CREATE TABLE Transaction_Nature (
     Nature_ID INT PRIMARY KEY,
-    Nature_Name VARCHAR(50) NOT NULL
+    Nature_Name VARCHAR(50) NOT NULL UNIQUE
 );
 
 -- 8. Payment_Mode Table
 CREATE TABLE Payment_Mode (
     Mode_ID INT PRIMARY KEY,
-    Mode_Name VARCHAR(50) NOT NULL
+    Mode_Name VARCHAR(50) NOT NULL UNIQUE
 );
 
 -- 9. Transaction_Category Table
 CREATE TABLE Transaction_Category (
     Transaction_Category_ID INT PRIMARY KEY,
-    Category_Name VARCHAR(100) NOT NULL
+    Category_Name VARCHAR(50) NOT NULL UNIQUE
 );
 
 -- 10. Account_Category Table
 CREATE TABLE Account_Category (
     Account_Category_ID INT PRIMARY KEY,
-    Category_Name VARCHAR(100) NOT NULL
+    Category_Name VARCHAR(50) NOT NULL UNIQUE
 );
 
 -- 11. Individual Event Transaction Table
 CREATE TABLE transaction_table (
     Transaction_ID INT AUTO_INCREMENT PRIMARY KEY,
-    User_ID INT,
-    Event_ID INT,
+    User_ID INT NOT NULL,
+    Event_ID INT NOT NULL,
     Sub_Event_ID INT,
     Amount DECIMAL(10, 2) DEFAULT 0.00,
     Nature_ID INT,
@@ -105,6 +109,12 @@ CREATE TABLE transaction_table (
     Transaction_Category_ID INT,
     Account_Category_ID INT,
     modified_date DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    INDEX ix_transaction_event_nature (Event_ID, Nature_ID),
+    INDEX ix_transaction_event_category (Event_ID, Transaction_Category_ID),
+    INDEX ix_transaction_event_mode (Event_ID, Mode_ID),
+    INDEX ix_transaction_event_date (Event_ID, Date, Transaction_ID),
+    INDEX ix_transaction_sub_event_date (Sub_Event_ID, Date, Transaction_ID),
+    INDEX ix_transaction_date (Date),
     FOREIGN KEY (User_ID) REFERENCES User(User_ID),
     FOREIGN KEY (Event_ID) REFERENCES Event(Event_ID),
     FOREIGN KEY (Sub_Event_ID) REFERENCES Sub_Event(Sub_Event_ID),
@@ -147,6 +157,7 @@ CREATE TABLE transactionitem (
     Transaction_ID INT NOT NULL,
     Description TEXT,
     Amount DECIMAL(10, 2) NOT NULL,
+    INDEX ix_transactionitem_transaction_amount (Transaction_ID, Amount),
     FOREIGN KEY (Transaction_ID) REFERENCES transaction_table(Transaction_ID) ON DELETE CASCADE
 );
 
@@ -157,7 +168,118 @@ CREATE TABLE Budget (
     Notes TEXT,
     Event_ID INT,
     Sub_Event_ID INT,
+    Spent_Total DECIMAL(14, 2) NOT NULL DEFAULT 0.00,
+    Notified_Threshold INT NOT NULL DEFAULT 0,
     modified_date DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     FOREIGN KEY (Event_ID) REFERENCES Event(Event_ID),
     FOREIGN KEY (Sub_Event_ID) REFERENCES Sub_Event(Sub_Event_ID)
 );
+
+-- 17. Event Financial Summary Table (running totals maintained on write)
+CREATE TABLE Event_Financial_Summary (
+    Summary_ID INT AUTO_INCREMENT PRIMARY KEY,
+    Event_ID INT NOT NULL,
+    Sub_Event_ID INT,
+    Nature_ID INT,
+    Transaction_Category_ID INT,
+    Mode_ID INT,
+    Total_Amount DECIMAL(14, 2) NOT NULL DEFAULT 0.00,
+    Item_Count INT NOT NULL DEFAULT 0,
+    modified_date DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    Sub_Event_Key INT AS (COALESCE(Sub_Event_ID, 0)),
+    Nature_Key INT AS (COALESCE(Nature_ID, 0)),
+    Category_Key INT AS (COALESCE(Transaction_Category_ID, 0)),
+    Mode_Key INT AS (COALESCE(Mode_ID, 0)),
+    UNIQUE KEY uq_event_financial_summary_key (Event_ID, Sub_Event_Key, Nature_Key, Category_Key, Mode_Key),
+    FOREIGN KEY (Event_ID) REFERENCES Event(Event_ID),
+    FOREIGN KEY (Sub_Event_ID) REFERENCES Sub_Event(Sub_Event_ID),
+    FOREIGN KEY (Nature_ID) REFERENCES Transaction_Nature(Nature_ID),
+    FOREIGN KEY (Transaction_Category_ID) REFERENCES Transaction_Category(Transaction_Category_ID),
+    FOREIGN KEY (Mode_ID) REFERENCES Payment_Mode(Mode_ID)
+);
+
+-- 18. Report Job Table (background Excel/PDF exports)
+CREATE TABLE Report_Job (
+    Job_ID INT AUTO_INCREMENT PRIMARY KEY,
+    Event_ID INT NOT NULL,
+    User_ID INT NOT NULL,
+    Format VARCHAR(10) NOT NULL,
+    Status VARCHAR(20) NOT NULL DEFAULT 'queued',
+    Progress INT NOT NULL DEFAULT 0,
+    File_Path VARCHAR(500),
+    File_Name VARCHAR(255),
+    Error TEXT,
+    Created_At DATETIME DEFAULT CURRENT_TIMESTAMP,
+    Started_At DATETIME,
+    Completed_At DATETIME,
+    FOREIGN KEY (Event_ID) REFERENCES Event(Event_ID),
+    FOREIGN KEY (User_ID) REFERENCES User(User_ID)
+);
+
+-- 19. Notification Table
+CREATE TABLE Notification (
+    Notification_ID INT AUTO_INCREMENT PRIMARY KEY,
+    User_ID INT NOT NULL,
+    Title VARCHAR(200) NOT NULL,
+    Message TEXT NOT NULL,
+    Type VARCHAR(50) DEFAULT 'info',
+    Is_Read BOOLEAN DEFAULT FALSE,
+    Created_At DATETIME DEFAULT CURRENT_TIMESTAMP,
+    Related_Event_ID INT,
+    Related_Transaction_ID INT,
+    INDEX ix_notification_user_read_created (User_ID, Is_Read, Created_At),
+    INDEX ix_notification_user_created (User_ID, Created_At, Notification_ID),
+    FOREIGN KEY (User_ID) REFERENCES User(User_ID),
+    FOREIGN KEY (Related_Event_ID) REFERENCES Event(Event_ID),
+    FOREIGN KEY (Related_Transaction_ID) REFERENCES transaction_table(Transaction_ID)
+);
+
+-- 20. Activity Log Table
+CREATE TABLE Activity_Log (
+    Log_ID INT AUTO_INCREMENT PRIMARY KEY,
+    User_ID INT NOT NULL,
+    Action VARCHAR(100) NOT NULL,
+    Entity_Type VARCHAR(50) NOT NULL,
+    Entity_ID INT,
+    Description TEXT NOT NULL,
+    IP_Address VARCHAR(45),
+    Timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+    INDEX ix_activity_log_timestamp (Timestamp),
+    FOREIGN KEY (User_ID) REFERENCES User(User_ID)
+);
+
+-- 21. Notification Archive Table (read notifications moved by 'flask notifications archive')
+CREATE TABLE Notification_Archive (
+    Notification_ID INT PRIMARY KEY,
+    User_ID INT NOT NULL,
+    Title VARCHAR(200) NOT NULL,
+    Message TEXT NOT NULL,
+    Type VARCHAR(50) DEFAULT 'info',
+    Is_Read BOOLEAN DEFAULT TRUE,
+    Created_At DATETIME,
+    Related_Event_ID INT,
+    Related_Transaction_ID INT,
+    Archived_At DATETIME DEFAULT CURRENT_TIMESTAMP,
+    INDEX ix_notification_archive_user_created (User_ID, Created_At),
+    FOREIGN KEY (User_ID) REFERENCES User(User_ID)
+);
+
+-- 22. Schema Version Table (migrations applied by 'flask db upgrade')
+-- This file already contains every migration below; add a row here with each new database/migrations script.
+CREATE TABLE schema_version (
+    Version INT PRIMARY KEY,
+    Name VARCHAR(255) NOT NULL,
+    Applied_At DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+INSERT INTO schema_version (Version, Name) VALUES
+    (1, 'hot_path_indexes'),
+    (2, 'event_financial_summary'),
+    (3, 'report_job'),
+    (4, 'budget_spent_tracking'),
+    (5, 'user_unread_notifications'),
+    (6, 'notification_archive'),
+    (7, 'user_listing_indexes'),
+    (8, 'event_date_index'),
+    (9, 'summary_key_not_null'),
+    (10, 'transactionitem_decimal_amount');
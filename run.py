@@ -5,6 +5,7 @@ Startup Script
 This script:
 1. Checks Python dependencies
 2. Creates database and tables automatically if they don't exist
+   (existing databases are upgraded with 'flask db upgrade')
 3. Starts the Flask development server
 """
 
@@ -56,6 +57,17 @@ def main():
     
     app = create_app('development')
     
+    # Create the schema on an empty database; production uses 'flask db init' / 'flask db upgrade'
+    with app.app_context():
+        from app.modules.migrations import init_database, get_pending_migrations
+        try:
+            if init_database() == 'created':
+                print("✓ Database tables created successfully")
+            elif get_pending_migrations():
+                print("⚠ Pending schema migrations. Run 'flask db upgrade' (see 'flask db status').")
+        except Exception as e:
+            print(f"✗ Database initialization error: {e}")
+    
     print("\n" + "="*60)
     print("✓ Application started successfully!")
     print("="*60)
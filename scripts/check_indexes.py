@@ -0,0 +1,145 @@
+"""
+Script to check that the hot queries are served by the composite indexes
+Builds the in-memory sample database used by check_query_counts.py, runs the
+dashboard views and a few filter paths through EXPLAIN QUERY PLAN and fails
+when an expected index is not used or a hot table is scanned in full
+
+Usage: python scripts/check_indexes.py [--transactions N]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import re
+import sys
+from datetime import date
+
+# Add the parent directory to the path so we can import app
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event, select
+from app import db
+from app.modules.models import Transaction
+from check_query_counts import build_app, logged_in_client, ADMIN_ID, FINANCE_MANAGER_ID, EVENT_MANAGER_ID, EVENT_ID
+
+HOT_TABLES = {'transaction_table', 'transactionitem', 'Notification', 'Activity_Log'}
+
+# Views and the indexes their queries must use
+VIEW_CHECKS = {
+    f'/finmng/{FINANCE_MANAGER_ID}/ledger/{EVENT_ID}': {'ix_transaction_event_date', 'ix_transactionitem_transaction_amount'},
+    f'/evemng/{EVENT_MANAGER_ID}/event_transactions/{EVENT_ID}': {'ix_transaction_event_date', 'ix_transactionitem_transaction_amount'},
+    f'/evemng/{EVENT_MANAGER_ID}/event_details/{EVENT_ID}': {'ix_transaction_event_date', 'ix_transactionitem_transaction_amount'},
+    f'/finmng/{FINANCE_MANAGER_ID}/notifications': {'ix_notification_user_created'},
+    f'/evemng/{EVENT_MANAGER_ID}/notifications': {'ix_notification_user_created'},
+    f'/evemng/{EVENT_MANAGER_ID}/notifications?status=unread': {'ix_notification_user_read_created'},
+    '/admin/activity-log': {'ix_activity_log_timestamp'},
+    '/admin/users': {'ix_user_username', 'ix_user_verified'},
+    '/admin/': {'ix_user_role_verified', 'ix_user_verified', 'ix_event_date'},
+    '/admin/view_events?status=Upcoming': {'ix_event_date'},
+}
+
+# Filter paths used outside the views (summary rebuild/verify, sub-event and date scoped lists)
+QUERY_CHECKS = {
+    'event + nature': (
+        select(Transaction.Transaction_ID).where(Transaction.Event_ID == EVENT_ID, Transaction.Nature_ID == 1),
+        'ix_transaction_event_nature'
+    ),
+    'event + category': (
+        select(Transaction.Transaction_ID).where(Transaction.Event_ID == EVENT_ID, Transaction.Transaction_Category_ID == 1),
+        'ix_transaction_event_category'
+    ),
+    'event + mode': (
+        select(Transaction.Transaction_ID).where(Transaction.Event_ID == EVENT_ID, Transaction.Mode_ID == 1),
+        'ix_transaction_event_mode'
+    ),
+    'sub-event ledger': (
+        select(Transaction.Transaction_ID).where(Transaction.Sub_Event_ID == 1)
+        .order_by(Transaction.Date, Transaction.Transaction_ID),
+        'ix_transaction_sub_event_date'
+    ),
+    'date range': (
+        select(Transaction.Transaction_ID).where(Transaction.Date.between(date(2024, 12, 1), date(2024, 12, 7))),
+        'ix_transaction_date'
+    ),
+}
+
+
+def explain(statement, parameters=()):
+    """
+    Return (indexes used, hot tables scanned in full) for one SELECT statement
+    """
+    with db.engine.connect() as connection:
+        plan = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+    indexes, full_scans = set(), set()
+    for row in plan:
+        detail = row[-1]
+        indexes.update(re.findall(r'USING (?:COVERING )?INDEX (\w+)', detail))
+        scan = re.match(r'SCAN (\w+)$', detail)
+        if scan and scan.group(1) in HOT_TABLES:
+            full_scans.add(scan.group(1))
+    return indexes, full_scans
+
+
+def capture_selects(app, client, url):
+    """Return the status code and the (statement, parameters) of every SELECT issued by one GET request"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            statements.append((statement, parameters))
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            response = client.get(url)
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+    return response.status_code, statements
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--transactions', type=int, default=200, help='Extra transactions to add to the event')
+    args = parser.parse_args()
+
+    app = build_app(args.transactions)
+    clients = {
+        'finmng': logged_in_client(app, FINANCE_MANAGER_ID, 'Finance Manager'),
+        'evemng': logged_in_client(app, EVENT_MANAGER_ID, 'Event Manager'),
+        'admin': logged_in_client(app, ADMIN_ID, 'Admin'),
+    }
+
+    failures = 0
+    with app.app_context():
+        for url, expected in VIEW_CHECKS.items():
+            status, statements = capture_selects(app, clients[url.split('/')[1]], url)
+            used, scanned = set(), set()
+            for statement, parameters in statements:
+                indexes, full_scans = explain(statement, parameters)
+                used |= indexes
+                scanned |= full_scans
+            missing = expected - used
+            ok = status == 200 and not missing and not scanned
+            failures += not ok
+            detail = f"missing {sorted(missing)}" if missing else f"full scan of {sorted(scanned)}" if scanned else "ok"
+            print(f"{'✓' if ok else '✗'} {url}: {detail}")
+
+        for name, (query, expected) in QUERY_CHECKS.items():
+            compiled = query.compile(dialect=db.engine.dialect)
+            parameters = tuple(compiled.params[key] for key in compiled.positiontup)
+            used, scanned = explain(str(compiled), parameters)
+            ok = expected in used and not scanned
+            failures += not ok
+            print(f"{'✓' if ok else '✗'} {name}: {'uses ' + expected if ok else 'uses ' + str(sorted(used) or 'no index')}")
+
+    if failures:
+        print(f"\n{failures} check(s) not served by the expected index")
+        sys.exit(1)
+    print("\nAll hot queries use their indexes")
+
+
+if __name__ == '__main__':
+    main()
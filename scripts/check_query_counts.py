@@ -0,0 +1,140 @@
+"""
+Script to check the number of SQL queries issued by the transaction-heavy views
+Builds an in-memory database with the sample data plus extra transactions and
+fails when a view exceeds its query budget (i.e. when an N+1 loop comes back)
+
+Usage: python scripts/check_query_counts.py [--transactions N]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+from datetime import date, timedelta
+
+# Add the parent directory to the path so we can import app
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event
+from app import create_app, db
+from app.modules.models import Transaction, TransactionItem
+from app.modules.financial_summary import rebuild_financial_summary
+from app.modules.budget_monitor import reconcile_budgets
+import populate_db
+
+ADMIN_ID = 1
+FINANCE_MANAGER_ID = 3
+EVENT_MANAGER_ID = 2
+EVENT_ID = 1
+
+# Maximum queries per view on a warm worker, independent of the number of transactions
+QUERY_BUDGETS = {
+    f'/finmng/{FINANCE_MANAGER_ID}/event_details/{EVENT_ID}': 8,
+    f'/finmng/{FINANCE_MANAGER_ID}/event_visualization/{EVENT_ID}': 5,
+    f'/finmng/{FINANCE_MANAGER_ID}/ledger/{EVENT_ID}': 5,
+    # Exports run inline under the testing config (REPORT_WORKERS = 0), so these
+    # also count the Report_Job bookkeeping, activity log and notifications
+    f'/finmng/{FINANCE_MANAGER_ID}/download_excel/{EVENT_ID}': 25,
+    f'/finmng/{FINANCE_MANAGER_ID}/download_pdf/{EVENT_ID}': 25,
+    f'/evemng/{EVENT_MANAGER_ID}/event_details/{EVENT_ID}': 8,
+    f'/evemng/{EVENT_MANAGER_ID}/event_visualization/{EVENT_ID}': 5,
+    f'/evemng/{EVENT_MANAGER_ID}/event_transactions/{EVENT_ID}': 8,
+    # Count, page and pending cards, however many users exist
+    '/admin/users': 5,
+    # User counts, pending cards, event counts and one page per status bucket
+    '/admin/': 8,
+}
+
+
+def build_app(extra_transactions):
+    """Create a testing app with sample data and extra_transactions more transactions on EVENT_ID"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        app = create_app('testing')
+        with app.app_context():
+            db.create_all()
+            populate_db.populate_departments()
+            populate_db.populate_roles()
+            populate_db.populate_event_types()
+            populate_db.populate_transaction_metadata()
+            populate_db.populate_users()
+            populate_db.populate_events()
+            populate_db.populate_sub_events()
+            populate_db.populate_budgets()
+            populate_db.populate_transactions()
+
+            for i in range(extra_transactions):
+                transaction = Transaction(
+                    User_ID=EVENT_MANAGER_ID, Event_ID=EVENT_ID, Bill_No=f'QC{i:05d}',
+                    Party_Name=f'Vendor {i}', Nature_ID=1 + i % 2, Mode_ID=1 + i % 6,
+                    Transaction_Category_ID=1 + i % 9, Date=date(2024, 12, 1) + timedelta(days=i % 28)
+                )
+                db.session.add(transaction)
+                db.session.flush()
+                db.session.add_all([
+                    TransactionItem(Transaction_ID=transaction.Transaction_ID, Description=f'Item {i}.{n}', Amount=100 + n)
+                    for n in range(2)
+                ])
+            db.session.commit()
+            rebuild_financial_summary()
+            reconcile_budgets(notify=False)
+    return app
+
+
+def logged_in_client(app, user_id, role):
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess['user_id'] = user_id
+        sess['role'] = role
+    return client
+
+
+def count_queries(app, client, url):
+    """Return (status code, number of SQL statements) for one GET request"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            response = client.get(url)
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+    return response.status_code, len(statements)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--transactions', type=int, default=200, help='Extra transactions to add to the event')
+    args = parser.parse_args()
+
+    app = build_app(args.transactions)
+    clients = {
+        'admin': logged_in_client(app, ADMIN_ID, 'Admin'),
+        'finmng': logged_in_client(app, FINANCE_MANAGER_ID, 'Finance Manager'),
+        'evemng': logged_in_client(app, EVENT_MANAGER_ID, 'Event Manager'),
+    }
+
+    # Warm the reference cache so every view is measured the way a warm worker serves it
+    for url in QUERY_BUDGETS:
+        count_queries(app, clients[url.split('/')[1]], url)
+
+    failures = 0
+    for url, budget in QUERY_BUDGETS.items():
+        status, queries = count_queries(app, clients[url.split('/')[1]], url)
+        ok = status in (200, 302) and queries <= budget
+        failures += not ok
+        print(f"{'✓' if ok else '✗'} {url}: {queries} queries (budget {budget}, status {status})")
+
+    if failures:
+        print(f"\n{failures} view(s) over budget")
+        sys.exit(1)
+    print(f"\nAll views within budget with {args.transactions} extra transactions")
+
+
+if __name__ == '__main__':
+    main()
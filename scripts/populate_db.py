@@ -15,23 +15,20 @@ from app import create_app, db
 from app.modules.models import (
     Department, Role, User, EventType, Event, SubEvent,
     TransactionNature, PaymentMode, TransactionCategory, AccountCategory,
-    Transaction, TransactionItem, Budget
+    Transaction, TransactionItem, Budget, EventFinancialSummary, ReportJob
 )
 
 def create_tables_if_not_exist():
     """Create all tables if they don't exist"""
     print("Checking if tables exist...")
     try:
-        from sqlalchemy import inspect
-        inspector = inspect(db.engine)
-        existing_tables = inspector.get_table_names()
-        
-        if not existing_tables:
-            print("⚠ No tables found. Creating tables...")
-            db.create_all()
+        from app.modules.migrations import init_database, get_pending_migrations
+        if init_database() == 'created':
             print("✓ Tables created successfully")
         else:
-            print(f"✓ Found {len(existing_tables)} existing tables")
+            print("✓ Found existing tables")
+            if get_pending_migrations():
+                print("⚠ Pending schema migrations. Run 'flask db upgrade'.")
         return True
     except Exception as e:
         print(f"✗ Error checking/creating tables: {e}")
@@ -51,6 +48,10 @@ def clear_all_data():
             return
         
         # Delete in proper order (respecting foreign key constraints)
+        if 'report_job' in existing_tables:
+            ReportJob.query.delete()
+        if 'event_financial_summary' in existing_tables:
+            EventFinancialSummary.query.delete()
         if 'transactionitem' in existing_tables:
             TransactionItem.query.delete()
         if 'transactions_table' in existing_tables:
@@ -461,6 +462,14 @@ def main():
             populate_budgets()
             populate_transactions()
             
+            # Build the running event totals from the inserted transactions
+            from app.modules.financial_summary import rebuild_financial_summary
+            rebuild_financial_summary()
+            
+            # Set the budgets' running expense totals (sample data sends no alerts)
+            from app.modules.budget_monitor import reconcile_budgets
+            reconcile_budgets(notify=False)
+            
             # Print summary
             print_summary()
             
@@ -78,11 +78,19 @@ def setup_database_with_sqlalchemy():
                 print("✓ Tables dropped")
             
             # Create all tables
+            from sqlalchemy import inspect
+            from app.modules.migrations import stamp
+            was_empty = not inspect(db.engine).get_table_names()
             print("Creating tables...")
             db.create_all()
             
+            # A schema built from the models already includes every migration
+            if was_empty:
+                stamp()
+            else:
+                print("⚠ Existing tables kept; run 'flask db upgrade' to apply pending migrations")
+            
             # Verify tables
-            from sqlalchemy import inspect
             inspector = inspect(db.engine)
             table_names = inspector.get_table_names()
             
@@ -0,0 +1,112 @@
+"""
+Script to benchmark application startup
+Imports the app and calls create_app('testing') under 'python -X importtime',
+reports the slowest imports and fails when a heavy library is imported at
+startup or when startup is slower than the budget / saved baseline
+
+Usage: python scripts/startup_benchmark.py [--runs N] [--budget-ms MS] [--top N]
+                                           [--baseline FILE] [--save-baseline FILE]
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Libraries that must only be imported by the routes that use them
+LAZY_MODULES = ['matplotlib', 'plotly', 'pandas', 'openpyxl', 'xhtml2pdf', 'pypdf', 'reportlab', 'mysql.connector']
+
+DEFAULT_BUDGET_MS = 2000
+BASELINE_TOLERANCE = 0.25
+
+STARTUP_CODE = (
+    "import time; start = time.perf_counter(); "
+    "from app import create_app; imported = time.perf_counter(); "
+    "create_app('testing'); done = time.perf_counter(); "
+    "print(f'{(imported - start) * 1000:.1f} {(done - imported) * 1000:.1f}')"
+)
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+
+def run_once():
+    """
+    Start the app in a fresh interpreter
+
+    Returns:
+        dict: import_ms, create_app_ms and modules (name -> cumulative microseconds)
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', STARTUP_CODE],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            modules[match.group(4)] = int(match.group(2))
+    import_ms, create_app_ms = (float(value) for value in result.stdout.split()[-2:])
+    return {'import_ms': import_ms, 'create_app_ms': create_app_ms, 'modules': modules}
+
+
+def lazy_violations(modules):
+    """Heavy libraries (or their submodules) imported at startup"""
+    return sorted({
+        lazy for lazy in LAZY_MODULES for name in modules
+        if name == lazy or name.startswith(lazy + '.')
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=3, help='Interpreter starts to take the median of')
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS, help='Maximum median startup time')
+    parser.add_argument('--top', type=int, default=15, help='Number of slowest imports to list')
+    parser.add_argument('--baseline', help='Fail if startup is more than 25%% slower than this saved result')
+    parser.add_argument('--save-baseline', help='Write the median result to this file')
+    args = parser.parse_args()
+
+    runs = [run_once() for _ in range(args.runs)]
+    import_ms = statistics.median(run['import_ms'] for run in runs)
+    create_app_ms = statistics.median(run['create_app_ms'] for run in runs)
+    total_ms = import_ms + create_app_ms
+    modules = runs[-1]['modules']
+
+    print("Slowest imports (cumulative, last run):")
+    for name, micros in sorted(modules.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"  {micros / 1000:8.1f} ms  {name}")
+    print(f"\nimport app:   {import_ms:8.1f} ms")
+    print(f"create_app(): {create_app_ms:8.1f} ms")
+    print(f"total:        {total_ms:8.1f} ms (median of {args.runs} runs)\n")
+
+    failures = []
+    violations = lazy_violations(set().union(*(run['modules'] for run in runs)))
+    if violations:
+        failures.append(f"heavy modules imported at startup: {', '.join(violations)}")
+    if total_ms > args.budget_ms:
+        failures.append(f"startup took {total_ms:.0f} ms, budget is {args.budget_ms:.0f} ms")
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as file:
+            baseline = json.load(file)
+        limit = baseline['total_ms'] * (1 + BASELINE_TOLERANCE)
+        if total_ms > limit:
+            failures.append(f"startup took {total_ms:.0f} ms, baseline is {baseline['total_ms']:.0f} ms (limit {limit:.0f} ms)")
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as file:
+            json.dump({'import_ms': import_ms, 'create_app_ms': create_app_ms, 'total_ms': total_ms}, file, indent=2)
+        print(f"✓ Saved baseline to {args.save_baseline}")
+
+    for failure in failures:
+        print(f"✗ {failure}")
+    if failures:
+        sys.exit(1)
+    print("✓ Startup within budget, no heavy imports")
+
+
+if __name__ == '__main__':
+    main()